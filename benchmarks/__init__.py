@@ -0,0 +1 @@
+"""解析のスループットのベンチマーク（合成actログの生成と計測）"""
@@ -0,0 +1,95 @@
+"""エスケープシーケンスと \\r の正規化のスループット（ログ全体の解析との比較）
+
+色付けしたツールの出力と進捗表示の書き直しを含む合成actログ（最後のステップが失敗）で、
+strip_ansi（全体を1回）・AnsiStripper（断片ごと）・LogParser.parse_text の MB/s を
+表示する。解析は走査する区間だけを正規化するため、最後の行に色付けしたログと
+していないログの解析時間の差を表示する。
+
+使い方:
+    uv run python -m benchmarks.ansi [--mb 100] [--chunk-kb 64]
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+
+from act_lens.ansi import AnsiStripper, strip_ansi
+from act_lens.parser import LogParser
+
+# 1ステップの出力行数
+STEP_LINES = 500
+
+# AnsiStripper が改行のない出力を溜める最大文字数
+MAX_PENDING = 64 * 1024
+
+
+def make_log(size_mb: int, colored: bool) -> str:
+    """size_mb MB程度の合成actログ（colored ならSGRと \\r による進捗表示の書き直しを含む）"""
+    red, bold, reset = ("\x1b[31m", "\x1b[1m", "\x1b[0m") if colored else ("", "", "")
+    lines: list[str] = []
+    size = 0
+    step = 0
+    while size < size_mb * 1024 * 1024:
+        block = [f"[CI/test] ⭐ Run Main step{step}"]
+        for i in range(STEP_LINES):
+            text = f"{bold}collected{reset} module_{i}.py {red}ok{reset} lorem ipsum dolor sit amet"
+            if colored and i % 50 == 0:
+                text = "\r".join(f"Downloading {p:3d}%" for p in range(0, 101, 25))
+            block.append(f"[CI/test]   | {text}")
+        block.append(f"[CI/test]   ✅  Success - Main step{step} [0.1s]")
+        size += sum(len(line) + 1 for line in block)
+        lines.extend(block)
+        step += 1
+    lines += [
+        "[CI/test] ⭐ Run Main pytest",
+        f"[CI/test]   | {red}AssertionError{reset}: boom",
+        "[CI/test]   ❌  Failure - Main pytest [1s]",
+    ]
+    return "\n".join(lines)
+
+
+def _timed(fn: Callable[[], object], repeat: int = 3) -> float:
+    """repeat 回のうち最短の秒数"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _chunked(text: str, chunk: int) -> None:
+    """chunk 文字ずつ AnsiStripper に渡す"""
+    stripper = AnsiStripper(MAX_PENDING)
+    for pos in range(0, len(text), chunk):
+        stripper.feed(text[pos : pos + chunk])
+    stripper.flush()
+
+
+def main() -> int:
+    args = argparse.ArgumentParser(description="エスケープシーケンスと \\r の正規化のスループット")
+    args.add_argument("--mb", type=int, default=100, help="生成するログのMB数")
+    args.add_argument("--chunk-kb", type=int, default=64, help="AnsiStripper に渡す断片のKB数")
+    opts = args.parse_args()
+
+    parser = LogParser()
+    print(f"{'input':<8} {'stage':<24} {'seconds':>8} {'MB/s':>8}")
+    parse: dict[bool, float] = {}
+    for colored in (False, True):
+        text = make_log(opts.mb, colored)
+        mb = len(text.encode()) / 1024 / 1024
+        label = "colored" if colored else "plain"
+        results = {
+            "strip_ansi (whole)": _timed(lambda: strip_ansi(text)),  # noqa: B023
+            "AnsiStripper (chunks)": _timed(lambda: _chunked(text, opts.chunk_kb * 1024)),  # noqa: B023
+            "LogParser.parse_text": _timed(lambda: parser.parse_text(text)),  # noqa: B023
+        }
+        for stage, seconds in results.items():
+            print(f"{label:<8} {stage:<24} {seconds:>8.3f} {mb / seconds:>8.0f}")
+        parse[colored] = results["LogParser.parse_text"]
+    print(f"色付けしたログの解析時間の差: {parse[True] / parse[False] - 1:+.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
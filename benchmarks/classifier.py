@@ -0,0 +1,94 @@
+"""トリガーを含む行が大量にあるログでの、エラータイプの判定時間
+
+`gcc -Werror` のようにトリガー（"error"）を含むがエラーではない行を大量に並べ、
+最後に AssertionError を置いたログで、LogParser の分類器の rank() と、全パターンを
+優先度順にログ全体へ re.search する判定（分類器を導入する前の方法）の秒数を比べる。
+--patterns で `.act-lens.toml` から追加するパターンの数を指定すると、追加した
+パターンの数で判定時間が増えないかを確認できる。
+
+使い方:
+    uv run python -m benchmarks.classifier [--lines 200000] [--patterns 80]
+"""
+
+import argparse
+import re
+import time
+from collections.abc import Callable
+
+from act_lens.classifier import Classifier
+from act_lens.config import PatternConfig, parse_config
+from act_lens.parser import LogParser
+
+# トリガーを含むが、どのパターンにもマッチしない行
+TRIGGER_LINE = "[CI/test]   | gcc -Werror -Wall -c src/mod.c"
+
+
+def trigger_log(lines: int) -> str:
+    """TRIGGER_LINE を lines 行並べ、最後のステップが AssertionError で失敗するログ"""
+    return "\n".join(
+        [
+            "[CI/test] ⭐ Run Main build",
+            *[TRIGGER_LINE] * lines,
+            "[CI/test]   | AssertionError: boom",
+            "[CI/test]   ❌  Failure - Main build [1s]",
+        ]
+    )
+
+
+def config_patterns(count: int) -> PatternConfig:
+    """.act-lens.toml で追加する count 個のエラータイプのパターン"""
+    patterns = [{"pattern": f"Custom{i}Failure: .+", "type": f"CUSTOM_{i}"} for i in range(count)]
+    return parse_config({"errors": {"patterns": patterns}})
+
+
+def sequential_rank(classifier: Classifier, text: str) -> int | None:
+    """全パターンを優先度順にテキスト全体へ re.search し、最初にマッチした優先度"""
+    for rank, pattern in enumerate(classifier.rules):
+        if re.search(pattern, text, classifier.flags):
+            return rank
+    return None
+
+
+def measure(lines: int, patterns: int = 0, repeat: int = 3) -> tuple[float, float]:
+    """
+    分類器の rank() と sequential_rank() の最短の秒数
+
+    Raises:
+        RuntimeError: 2つの判定の結果が異なる場合
+    """
+    classifier = LogParser(patterns=config_patterns(patterns)).classifier
+    text = trigger_log(lines)
+    if classifier.rank(text) != sequential_rank(classifier, text):
+        raise RuntimeError("分類器と優先度順の re.search の判定が異なります")
+    return _timed(lambda: classifier.rank(text), repeat), _timed(
+        lambda: sequential_rank(classifier, text), repeat
+    )
+
+
+def _timed(fn: Callable[[], object], repeat: int) -> float:
+    """repeat 回のうち最短の秒数"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    args = argparse.ArgumentParser(description="トリガーを含む行が大量にあるログでの判定時間")
+    args.add_argument("--lines", type=int, default=200_000, help="トリガーを含む行の数")
+    args.add_argument("--patterns", type=int, default=0, help="設定ファイルで追加するパターンの数")
+    args.add_argument("--repeat", type=int, default=3, help="計測回数（最短を表示）")
+    opts = args.parse_args()
+
+    classifier, sequential = measure(opts.lines, opts.patterns, opts.repeat)
+    print(f"{'case':<24} {'seconds':>9}")
+    print(f"{'Classifier.rank':<24} {classifier:>9.4f}")
+    print(f"{'sequential re.search':<24} {sequential:>9.4f}")
+    print(f"ratio: {classifier / sequential:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
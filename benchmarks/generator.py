@@ -0,0 +1,146 @@
+"""ベンチマーク用の合成actログの生成"""
+
+import random
+from collections.abc import Iterator
+from pathlib import Path
+from typing import NamedTuple
+
+# 名前付きのログサイズ（目安のバイト数）
+SIZES = {"1MB": 1 << 20, "10MB": 10 << 20, "100MB": 100 << 20, "1GB": 1 << 30}
+
+# 1ステップの出力行数
+STEP_LINES = 400
+
+# 失敗したステップのトレースバックが指すコンテナ内のソースファイル
+WORKSPACE = "/github/workspace"
+SOURCE_DIR = "src/app"
+
+_PACKAGES = ("requests", "pydantic", "numpy", "rich", "typer", "urllib3", "idna", "certifi")
+
+
+class LogSpec(NamedTuple):
+    """生成するログの条件"""
+
+    size: int  # 目安のバイト数（失敗したステップの出力は含まない）
+    jobs: int = 4
+    failures: int = 1  # 失敗させるジョブ数（連続したジョブが失敗する）
+    failure_position: float = 1.0  # 最初に失敗するジョブの位置（0.0=先頭、1.0=末尾）
+    traceback_depth: int = 10
+    noise_ratio: float = 0.5  # ツールの出力のうち、進捗表示等の繰り返し行の割合
+    seed: int = 0
+
+
+def job_names(spec: LogSpec) -> list[str]:
+    """ログに現れるジョブ（"ワークフロー/ジョブ"）"""
+    return [f"CI/job-{index}" for index in range(spec.jobs)]
+
+
+def failing_jobs(spec: LogSpec) -> list[str]:
+    """
+    失敗させるジョブ
+
+    Raises:
+        ValueError: ジョブ数・失敗数・位置の指定が不正な場合
+    """
+    if not 0 < spec.failures <= spec.jobs:
+        raise ValueError(f"failures は 1〜{spec.jobs} で指定してください: {spec.failures}")
+    if not 0.0 <= spec.failure_position <= 1.0:
+        raise ValueError(
+            f"failure_position は 0.0〜1.0 で指定してください: {spec.failure_position}"
+        )
+    first = round(spec.failure_position * (spec.jobs - spec.failures))
+    return job_names(spec)[first : first + spec.failures]
+
+
+def generate(spec: LogSpec) -> Iterator[str]:
+    """
+    actの出力を模したログを1行ずつ生成する（同じ spec からは同じログ）
+
+    ジョブは順に実行され、各ジョブは spec.size / spec.jobs バイトに達するまで
+    成功するステップを出力する。失敗させるジョブは最後に pytest のステップが
+    トレースバックと AssertionError を出して失敗する。
+
+    Raises:
+        ValueError: spec の指定が不正な場合
+    """
+    if not 0.0 <= spec.noise_ratio <= 1.0:
+        raise ValueError(f"noise_ratio は 0.0〜1.0 で指定してください: {spec.noise_ratio}")
+    failing = set(failing_jobs(spec))
+    rng = random.Random(spec.seed)
+    budget = spec.size // spec.jobs
+
+    for job in job_names(spec):
+        prefix = f"[{job}]"
+        yield f"{prefix} 🚀  Start image=catthehacker/ubuntu:act-latest"
+        yield f"{prefix}   🐳  docker pull image=catthehacker/ubuntu:act-latest forcePull=false"
+        written = 0
+        step = 0
+        while written < budget:
+            name = f"Main step-{step}"
+            yield f"{prefix} ⭐ Run {name}"
+            for line in _tool_output(rng, spec.noise_ratio):
+                line = f"{prefix}   | {line}"
+                written += len(line) + 1
+                yield line
+            yield f"{prefix}   ✅  Success - {name} [{rng.uniform(0.1, 30):.1f}s]"
+            step += 1
+        if job in failing:
+            yield f"{prefix} ⭐ Run Main pytest"
+            for line in _failure_output(rng, spec.traceback_depth):
+                yield f"{prefix}   | {line}"
+            yield f"{prefix}   ❌  Failure - Main pytest [{rng.uniform(1, 120):.1f}s]"
+            yield f"{prefix} 🏁  Job failed"
+        else:
+            yield f"{prefix} 🏁  Job succeeded"
+
+
+def write_log(spec: LogSpec, path: Path) -> int:
+    """
+    生成したログをファイルに書き出す（ログ全体をメモリに持たない）
+
+    Returns:
+        書き出したバイト数
+    """
+    with path.open("w", encoding="utf-8", newline="\n") as f:
+        for line in generate(spec):
+            f.write(line + "\n")
+    return path.stat().st_size
+
+
+def source_text(lines: int = 2000) -> str:
+    """トレースバックの指すソースファイルの内容（エラー箇所の前後の行の読み込み用）"""
+    return "".join(f"    value_{n} = compute({n})  # line {n}\n" for n in range(1, lines + 1))
+
+
+def _tool_output(rng: random.Random, noise_ratio: float) -> Iterator[str]:
+    """成功するステップの出力（通常の行と、まとまって現れる進捗表示の行）"""
+    remaining = STEP_LINES
+    while remaining > 0:
+        burst = min(remaining, rng.randint(5, 40))
+        remaining -= burst
+        if rng.random() < noise_ratio:
+            package = rng.choice(_PACKAGES)
+            total = rng.randint(1, 90)
+            for n in range(burst):
+                done = total * (n + 1) / burst
+                bar = "=" * int(20 * (n + 1) / burst)
+                yield f"Downloading {package} [{bar:<20}] {done:.1f}MB/{total}.0MB"
+        else:
+            module = rng.randint(0, 999)
+            for n in range(burst):
+                yield f"tests/test_module_{module}.py::test_case_{n} PASSED"
+
+
+def _failure_output(rng: random.Random, depth: int) -> Iterator[str]:
+    """失敗するpytestのステップの出力（depth 段のトレースバックとAssertionError）"""
+    yield "=================================== FAILURES ==================================="
+    yield "_________________________________ test_compute _________________________________"
+    yield "Traceback (most recent call last):"
+    for frame in range(depth):
+        line = rng.randint(10, 1990)
+        yield f'  File "{WORKSPACE}/{SOURCE_DIR}/module_{frame}.py", line {line}, in func_{frame}'
+        yield f"    return func_{frame + 1}(value_{line})"
+    expected = rng.randint(0, 99)
+    yield f"AssertionError: expected {expected} but got {expected + 1}"
+    yield "FAILED tests/test_compute.py::test_compute - AssertionError"
+    yield "Error: Process completed with exit code 1"
@@ -0,0 +1,235 @@
+"""解析のスループットの計測（合成ログのサイズごとに秒数・MB/s・ピークメモリをJSONに記録）
+
+使い方:
+    uv run python -m benchmarks.run --sizes 1MB,10MB,100MB -o bench.json
+    uv run python -m benchmarks.run --sizes 1MB,10MB,100MB --compare bench.json
+
+--compare を指定すると、同じサイズ・同じ計測対象の前回の結果と秒数を比べ、
+--threshold を超えて遅くなったものがあれば終了コード1で終わる。
+LogParser.parse はログ全体の文字列を解析するため、1GBでは数GBのメモリを使う。
+"""
+
+import argparse
+import json
+import platform
+import subprocess  # nosec - コミットの記録に git を呼ぶ
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from act_lens.formatter import MarkdownFormatter
+from act_lens.parser import LogParser
+from benchmarks.generator import SIZES, SOURCE_DIR, LogSpec, source_text, write_log
+
+# 計測対象の _extract_* ヘルパー（ログの全行を渡す）
+EXTRACT_HELPERS = (
+    "_extract_workflow_name",
+    "_extract_error_message",
+    "_extract_location",
+    "_extract_stack_trace",
+    "_extract_running_step",
+    "_extract_job_step",
+    "_extract_duration",
+)
+
+# 比較時に、これより短い計測は揺らぎが大きいため遅くなったと判定しない（秒）
+MIN_COMPARE_SECONDS = 0.005
+
+
+def measure(fn: Callable[[], object], repeat: int, memory: bool) -> tuple[float, int | None]:
+    """
+    fn の最短の実行時間と、（memory の場合）1回の実行でのPythonのヒープのピーク増加量
+
+    時間の計測中は tracemalloc を止め、メモリは別の1回の実行で計測する。
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    if not memory:
+        return best, None
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        fn()
+        peak = tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def run_size(
+    label: str, spec: LogSpec, repeat: int, memory: bool, workdir: Path, workers: int = 1
+) -> list[dict[str, Any]]:
+    """1つのサイズのログを生成し、各計測対象の結果を返す"""
+    # トレースバックの指すソースファイルを source_root 以下に用意する
+    # （エラー箇所の前後の行を読むため、レポートにもError Detailsが入る。
+    # parse_file はログより後に更新されたソースを読まないため、ログより先に書く）
+    source = workdir / SOURCE_DIR / "module_0.py"
+    source.parent.mkdir(parents=True, exist_ok=True)
+    source.write_text(source_text(), encoding="utf-8")
+
+    log_path = workdir / f"{label}.log"
+    size = write_log(spec, log_path)
+    text = log_path.read_text(encoding="utf-8")
+    lines = text.split("\n")
+    parser = LogParser(source_root=workdir)
+    failure = parser.parse(text)
+    if failure is None or not failure.context_lines:
+        raise RuntimeError(f"{label}: 生成したログから失敗を抽出できませんでした")
+    file_path, line_number = failure.file_path, failure.line_number
+    formatter = MarkdownFormatter()
+
+    cases: list[tuple[str, Callable[[], object], int | None]] = [
+        ("parse", lambda: parser.parse(text), size),
+        ("parse_file", lambda: parser.parse_file(log_path), size),
+    ]
+    if workers > 1:
+        cases.append(
+            (
+                f"parse_file_workers{workers}",
+                lambda: parser.parse_file(log_path, None, workers),
+                size,
+            )
+        )
+    cases += [
+        (name, lambda name=name: getattr(parser, name)(lines), size) for name in EXTRACT_HELPERS
+    ]
+    cases += [
+        ("_extract_context", lambda: parser._extract_context(lines, file_path, line_number), None),  # pyright: ignore[reportPrivateUsage]
+        ("format", lambda: formatter.format(failure), None),
+    ]
+
+    results: list[dict[str, Any]] = []
+    for case, fn, processed in cases:
+        seconds, peak = measure(fn, repeat, memory)
+        results.append(
+            {
+                "size": label,
+                "case": case,
+                "bytes": processed,
+                "seconds": seconds,
+                "mb_per_s": processed / seconds / 2**20 if processed else None,
+                "peak_bytes": peak,
+            }
+        )
+        print(_row(results[-1]), flush=True)
+    log_path.unlink()
+    return results
+
+
+def compare(
+    results: list[dict[str, Any]], previous: list[dict[str, Any]], threshold: float
+) -> list[str]:
+    """前回の結果と比べて threshold を超えて遅くなった計測（"サイズ/対象"）を返す"""
+    before = {(r["size"], r["case"]): r["seconds"] for r in previous}
+    regressions: list[str] = []
+    print(f"\n{'size':<6} {'case':<24} {'before':>9} {'after':>9} {'ratio':>7}")
+    for result in results:
+        key = (result["size"], result["case"])
+        if key not in before:
+            continue
+        ratio = result["seconds"] / before[key]
+        slower = ratio > 1 + threshold and result["seconds"] >= MIN_COMPARE_SECONDS
+        mark = "  ← regression" if slower else ""
+        print(
+            f"{key[0]:<6} {key[1]:<24} {before[key]:>9.4f} {result['seconds']:>9.4f}"
+            f" {ratio:>6.2f}x{mark}"
+        )
+        if slower:
+            regressions.append("/".join(key))
+    return regressions
+
+
+def _row(result: dict[str, Any]) -> str:
+    mb_per_s = f"{result['mb_per_s']:.1f}" if result["mb_per_s"] else "-"
+    peak = f"{result['peak_bytes'] / 2**20:.1f}" if result["peak_bytes"] is not None else "-"
+    return (
+        f"{result['size']:<6} {result['case']:<24} {result['seconds']:>9.4f}"
+        f" {mb_per_s:>9} {peak:>10}"
+    )
+
+
+def _commit() -> str | None:
+    try:
+        out = subprocess.run(  # nosec - 固定の引数で git を呼ぶ
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def main() -> int:
+    args = argparse.ArgumentParser(description="act-lensの解析のスループットを計測する")
+    args.add_argument("--sizes", default="1MB,10MB,100MB", help=f"{'/'.join(SIZES)} のカンマ区切り")
+    args.add_argument("--jobs", type=int, default=4, help="ジョブ数")
+    args.add_argument("--failures", type=int, default=1, help="失敗させるジョブ数")
+    args.add_argument(
+        "--failure-position", type=float, default=1.0, help="最初に失敗するジョブの位置（0.0〜1.0）"
+    )
+    args.add_argument("--traceback-depth", type=int, default=10, help="トレースバックの段数")
+    args.add_argument("--noise-ratio", type=float, default=0.5, help="進捗表示等の行の割合")
+    args.add_argument("--seed", type=int, default=0)
+    args.add_argument(
+        "--workers", type=int, default=1, help="2以上なら parse_file の複数プロセスでの解析も計測"
+    )
+    args.add_argument("--repeat", type=int, default=3, help="計測回数（最短を記録）")
+    args.add_argument("--no-memory", action="store_true", help="ピークメモリを計測しない")
+    args.add_argument("-o", "--output", type=Path, help="結果を書き出すJSONファイル")
+    args.add_argument("--compare", type=Path, help="比べる前回の結果のJSONファイル")
+    args.add_argument("--threshold", type=float, default=0.1, help="遅くなったと判定する割合")
+    opts = args.parse_args()
+
+    labels = [label.strip() for label in opts.sizes.split(",") if label.strip()]
+    if unknown := [label for label in labels if label not in SIZES]:
+        args.error(f"不明なサイズ: {', '.join(unknown)}（{'/'.join(SIZES)} から指定）")
+
+    spec = LogSpec(
+        size=0,
+        jobs=opts.jobs,
+        failures=opts.failures,
+        failure_position=opts.failure_position,
+        traceback_depth=opts.traceback_depth,
+        noise_ratio=opts.noise_ratio,
+        seed=opts.seed,
+    )
+    print(f"{'size':<6} {'case':<24} {'seconds':>9} {'MB/s':>9} {'peak MB':>10}")
+    results: list[dict[str, Any]] = []
+    try:
+        with tempfile.TemporaryDirectory(prefix="act-lens-bench-") as workdir:
+            for label in labels:
+                size_spec = spec._replace(size=SIZES[label])
+                results += run_size(
+                    label, size_spec, opts.repeat, not opts.no_memory, Path(workdir), opts.workers
+                )
+    except ValueError as e:
+        args.error(str(e))
+
+    report = {
+        "commit": _commit(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "spec": {key: value for key, value in spec._asdict().items() if key != "size"},
+        "results": results,
+    }
+    if opts.output:
+        opts.output.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", "utf-8")
+        print(f"\n保存: {opts.output}")
+    if opts.compare:
+        previous = json.loads(opts.compare.read_text(encoding="utf-8"))["results"]
+        if regressions := compare(results, previous, opts.threshold):
+            print(f"\n遅くなった計測: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,217 @@
+"""ゴールデンコーパスでの抽出精度と解析レイテンシのスコアカード
+
+tests/corpus/ の各ログ（NAME.log）を解析し、期待値（NAME.json の failures）と
+フィールドごとに比べて適合率・再現率を、ログごとに解析時間を表示する。
+
+使い方:
+    uv run python -m benchmarks.scorecard
+    uv run python -m benchmarks.scorecard --update-baseline  # 精度の下限を更新
+
+期待値との比較:
+    失敗はジョブで対応付ける。file_path はコンテナ内のワークスペースを除いて比べ、
+    message は期待値を含む行なら一致とする（actの接頭辞やツールの記号を許容）。
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from act_lens.models import FailureInfo
+from act_lens.parser import LogParser
+from act_lens.sources import CONTAINER_WORKSPACES
+
+CORPUS_DIR = Path(__file__).resolve().parent.parent / "tests" / "corpus"
+
+# コーパスに置く精度の下限のファイル
+# （--update-baseline で更新し、tests/test_corpus.py がこれを下回らないことを確認する）
+BASELINE_NAME = "baseline.json"
+
+# 期待値と比べる FailureInfo のフィールド
+FIELDS = (
+    "workflow",
+    "job",
+    "step",
+    "error_type",
+    "message",
+    "file_path",
+    "line_number",
+    "duration",
+)
+
+
+class CorpusLog(NamedTuple):
+    """コーパスの1つのログと、期待する失敗"""
+
+    name: str
+    path: Path
+    expected: list[dict[str, Any]]
+
+
+class FieldScore(NamedTuple):
+    """1つのフィールドの一致数（tp）・誤り数（fp: 抽出したが違う）・見逃し数（fn）"""
+
+    tp: int = 0
+    fp: int = 0
+    fn: int = 0
+
+    @property
+    def precision(self) -> float:
+        return self.tp / (self.tp + self.fp) if self.tp + self.fp else 1.0
+
+    @property
+    def recall(self) -> float:
+        return self.tp / (self.tp + self.fn) if self.tp + self.fn else 1.0
+
+    def merge(self, other: "FieldScore") -> "FieldScore":
+        return FieldScore(self.tp + other.tp, self.fp + other.fp, self.fn + other.fn)
+
+
+def load_corpus(directory: Path = CORPUS_DIR) -> list[CorpusLog]:
+    """コーパスのログと期待値を名前順に読み込む"""
+    logs: list[CorpusLog] = []
+    for path in sorted(directory.glob("*.log")):
+        expected = json.loads(path.with_suffix(".json").read_text(encoding="utf-8"))
+        logs.append(CorpusLog(path.stem, path, expected["failures"]))
+    return logs
+
+
+def score(
+    expected: Sequence[dict[str, Any]], failures: Sequence[FailureInfo]
+) -> dict[str, FieldScore]:
+    """
+    1つのログの解析結果を期待値と比べる
+
+    "failures" は失敗したジョブの検出（期待しないジョブの失敗は誤り、期待したジョブの
+    欠落は見逃し）、それ以外は対応付けたジョブのフィールドごとの一致を数える。
+    """
+    predicted = {failure.job: failure.model_dump() for failure in failures}
+    wanted = {fields["job"]: fields for fields in expected}
+    scores = {
+        "failures": FieldScore(
+            tp=len(predicted.keys() & wanted.keys()),
+            fp=len(predicted.keys() - wanted.keys()),
+            fn=len(wanted.keys() - predicted.keys()),
+        ),
+        **{field: FieldScore() for field in FIELDS},
+    }
+    for job in predicted.keys() | wanted.keys():
+        got, want = predicted.get(job, {}), wanted.get(job, {})
+        for field in FIELDS:
+            value, truth = got.get(field), want.get(field)
+            hit = value is not None and truth is not None and _matches(field, value, truth)
+            scores[field] = scores[field].merge(
+                FieldScore(
+                    tp=int(hit),
+                    fp=int(value is not None and not hit),
+                    fn=int(truth is not None and not hit),
+                )
+            )
+    return scores
+
+
+def run(
+    parser: LogParser, corpus: Sequence[CorpusLog], repeat: int = 5
+) -> tuple[dict[str, FieldScore], dict[str, dict[str, float]]]:
+    """
+    コーパス全体のスコアと、ログごとの解析時間（parse_text / parse_file の最短のミリ秒）
+    """
+    totals: dict[str, FieldScore] = {}
+    latency: dict[str, dict[str, float]] = {}
+    for log in corpus:
+        text = log.path.read_text(encoding="utf-8")
+        for field, field_score in score(log.expected, parser.parse_text(text)).items():
+            totals[field] = totals.get(field, FieldScore()).merge(field_score)
+        latency[log.name] = {
+            "parse_text": _best_ms(lambda: parser.parse_text(text), repeat),  # noqa: B023
+            "parse_file": _best_ms(lambda: parser.parse_file(log.path), repeat),  # noqa: B023
+        }
+    return totals, latency
+
+
+def summary(totals: dict[str, FieldScore]) -> dict[str, dict[str, float]]:
+    """フィールドごとの適合率・再現率（JSONに書き出す形）"""
+    return {
+        field: {"precision": round(s.precision, 4), "recall": round(s.recall, 4)}
+        for field, s in totals.items()
+    }
+
+
+def regressions(
+    current: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]]
+) -> list[str]:
+    """下限を下回ったフィールドと指標（"フィールド.指標"）"""
+    return [
+        f"{field}.{metric}"
+        for field, metrics in baseline.items()
+        for metric, floor in metrics.items()
+        if current.get(field, {}).get(metric, 0.0) < floor
+    ]
+
+
+def _matches(field: str, value: Any, truth: Any) -> bool:
+    if field == "file_path":
+        return _strip_workspace(value) == _strip_workspace(truth)
+    if field == "message":
+        return truth in value
+    if field == "duration":
+        return abs(value - truth) < 1e-6
+    return value == truth
+
+
+def _strip_workspace(path: str) -> str:
+    for workspace in CONTAINER_WORKSPACES:
+        path = path.removeprefix(workspace + "/")
+    return path.removeprefix("./")
+
+
+def _best_ms(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return round(best * 1000, 3)
+
+
+def main() -> int:
+    args = argparse.ArgumentParser(description="ゴールデンコーパスでの抽出精度と解析レイテンシ")
+    args.add_argument("--corpus", type=Path, default=CORPUS_DIR, help="コーパスのディレクトリ")
+    args.add_argument("--repeat", type=int, default=5, help="解析時間の計測回数（最短を表示）")
+    args.add_argument("-o", "--output", type=Path, help="結果を書き出すJSONファイル")
+    args.add_argument(
+        "--update-baseline", action="store_true", help="現在の精度を下限として書き出す"
+    )
+    opts = args.parse_args()
+
+    corpus = load_corpus(opts.corpus)
+    totals, latency = run(LogParser(), corpus, opts.repeat)
+    scores = summary(totals)
+
+    print(f"{'log':<24} {'parse_text ms':>14} {'parse_file ms':>14}")
+    for name, times in latency.items():
+        print(f"{name:<24} {times['parse_text']:>14.3f} {times['parse_file']:>14.3f}")
+    print(f"\n{'field':<12} {'precision':>9} {'recall':>7} {'tp':>4} {'fp':>4} {'fn':>4}")
+    for field, s in totals.items():
+        print(f"{field:<12} {s.precision:>9.2f} {s.recall:>7.2f} {s.tp:>4} {s.fp:>4} {s.fn:>4}")
+
+    if opts.output:
+        report = {"scores": scores, "latency_ms": latency}
+        opts.output.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", "utf-8")
+    baseline_path = opts.corpus / BASELINE_NAME
+    if opts.update_baseline:
+        baseline_path.write_text(json.dumps(scores, indent=2) + "\n", encoding="utf-8")
+        print(f"\n下限を更新: {baseline_path}")
+    elif baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+        if lowered := regressions(scores, baseline):
+            print(f"\n下限を下回った指標: {', '.join(lowered)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,96 @@
+"""色付けのエスケープシーケンスと、行頭への復帰（\\r）による上書きの除去"""
+
+import re
+
+# CSI（SGR等）・OSC・文字集合の指定・その他の2文字のエスケープシーケンス
+# （終端のないOSCは行末まで、単独のESCはESCだけを除く）
+_ESCAPE = re.compile(
+    r"\x1b(?:\[[0-?]*[ -/]*[@-~]|\][^\x07\x1b\n]*(?:\x07|\x1b\\)?|[()*+][0-~]|[0-~])?"
+)
+
+# actが出力の行頭に付ける "[ワークフロー/ジョブ]   | "（\r で上書きするのはその後ろのツールの出力）
+_ACT_PREFIX = re.compile(r"\[[^\]\n/]*/[^\]\n]*\]\s+\|\s?")
+
+
+def strip_ansi(text: str) -> str:
+    """
+    エスケープシーケンスを除き、\\r で上書きされた行は最後に書かれた内容だけを残す
+
+    ESCと \\r を含まないテキストは文字列検索だけでそのまま返す。含む場合も
+    エスケープシーケンスは1回の置換、\\r は \\r を含む行だけを処理するため、
+    テキストの長さに対して線形の時間で済む。
+
+    Args:
+        text: 改行区切りの1行以上のテキスト
+
+    Returns:
+        正規化したテキスト（行の数と改行の位置は変わらない）
+    """
+    if "\x1b" in text:
+        text = _ESCAPE.sub("", text)
+    if "\r" not in text:
+        return text
+    if "\r\n" in text:
+        text = text.replace("\r\n", "\n")
+        if "\r" not in text:
+            return text
+
+    parts: list[str] = []
+    prev = 0
+    pos = text.find("\r")
+    while pos != -1:
+        start = text.rfind("\n", 0, pos) + 1
+        end = text.find("\n", pos)
+        end = len(text) if end == -1 else end
+        parts.append(text[prev:start])
+        if match := _ACT_PREFIX.match(text, start, pos):
+            parts.append(match.group(0))
+            start = match.end()
+        # 進捗表示の書き直し等で上書きされた内容は捨てる
+        parts.append(next((s for s in reversed(text[start:end].split("\r")) if s), ""))
+        prev = end
+        pos = text.find("\r", end)
+    parts.append(text[prev:])
+    return "".join(parts)
+
+
+class AnsiStripper:
+    """到着順の断片を正規化する（行の途中で区切れた断片は次の断片まで持ち越す）
+
+    feed() の戻り値を順に連結し flush() の戻り値を加えたものは、全体を strip_ansi()
+    したものと同じになる。ただし max_pending 文字を超えて改行のない出力は、
+    溜め続けずにその位置で行を区切る。
+    """
+
+    def __init__(self, max_pending: int) -> None:
+        self.max_pending = max_pending
+        self._pending: list[str] = []
+        self._pending_chars = 0
+
+    def feed(self, chunk: str) -> str:
+        """
+        断片を取り込み、完成した行を正規化して返す
+
+        Returns:
+            完成した行（末尾は改行）。完成した行がなければ空文字列
+        """
+        end = chunk.rfind("\n")
+        if end == -1:
+            self._pending.append(chunk)
+            self._pending_chars += len(chunk)
+            if self._pending_chars < self.max_pending:
+                return ""
+            return self.flush() + "\n"
+
+        text = "".join(self._pending) + chunk[: end + 1]
+        rest = chunk[end + 1 :]
+        self._pending[:] = [rest] if rest else []
+        self._pending_chars = len(rest)
+        return strip_ansi(text)
+
+    def flush(self) -> str:
+        """持ち越している未完の行を正規化して返す（なければ空文字列）"""
+        text = "".join(self._pending)
+        self._pending.clear()
+        self._pending_chars = 0
+        return strip_ansi(text)
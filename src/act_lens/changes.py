@@ -0,0 +1,154 @@
+"""gitの変更ファイルから影響を受けるワークフローを判定"""
+
+import hashlib
+import re
+import subprocess  # nosec B404  # gitコマンド実行に必要
+from collections.abc import Sequence
+from functools import lru_cache
+from pathlib import Path
+
+from act_lens.models import PathFilter, WorkflowInfo
+
+# actがデフォルトで発火させるイベント
+DEFAULT_EVENT = "push"
+
+
+def changed_files(ref: str) -> list[str]:
+    """
+    指定したrefから作業ツリーまでに変更されたファイル（未追跡ファイルを含む）を取得
+
+    Args:
+        ref: 比較対象のgit ref（例: origin/main, HEAD~1）
+
+    Returns:
+        リポジトリルートからの相対パス（"/"区切り）
+
+    Raises:
+        ValueError: gitが使えない、またはrefが不正な場合
+    """
+    if ref.startswith("-"):
+        raise ValueError(f"不正なrefです: {ref}")
+
+    files = _git("diff", "--name-only", ref, "--").splitlines()
+    files += _git("ls-files", "--others", "--exclude-standard", "--full-name").splitlines()
+    return sorted({f for f in files if f})
+
+
+def tracked_content() -> dict[str, str]:
+    """
+    追跡中のファイルごとの内容ハッシュを取得
+
+    インデックスのblobハッシュを基本とし、作業ツリーで変更されたファイルは
+    実際の内容のハッシュで置き換える（削除されたファイルは除外）。
+
+    Returns:
+        リポジトリルートからの相対パス -> 内容ハッシュ
+
+    Raises:
+        ValueError: gitが使えない場合
+    """
+    content: dict[str, str] = {}
+    for entry in filter(None, _git("ls-files", "-s", "-z", "--full-name").split("\0")):
+        meta, _, path = entry.partition("\t")
+        content[path] = meta.split()[1]
+
+    root = Path(_git("rev-parse", "--show-toplevel").strip())
+    for path in filter(None, _git("ls-files", "-m", "-z", "--full-name").split("\0")):
+        try:
+            content[path] = hashlib.sha256((root / path).read_bytes()).hexdigest()
+        except OSError:
+            content.pop(path, None)  # 作業ツリーで削除済み
+    return content
+
+
+def _git(*args: str) -> str:
+    """gitコマンドを実行して標準出力を返す（失敗時はValueError）"""
+    try:
+        result = subprocess.run(  # nosec B603 B607  # 固定のgitコマンド
+            ["git", *args], capture_output=True, text=True, encoding="utf-8", check=False
+        )
+    except FileNotFoundError as e:
+        raise ValueError("gitコマンドが見つかりません") from e
+    if result.returncode != 0:
+        raise ValueError(f"gitコマンドに失敗しました: {result.stderr.strip() or args[0]}")
+    return result.stdout
+
+
+@lru_cache(maxsize=256)
+def _compile_glob(pattern: str) -> re.Pattern[str]:
+    """GitHub Actionsのパスフィルタ（*, **, ?）を正規表現に変換"""
+    parts: list[str] = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(parts) + r"\Z")
+
+
+def _matches(patterns: Sequence[str], path: str) -> bool:
+    """パターン列にマッチするか（"!" 付きは除外、後のパターンが優先）"""
+    matched = False
+    for pattern in patterns:
+        negated = pattern.startswith("!")
+        if _compile_glob(pattern[1:] if negated else pattern).match(path):
+            matched = not negated
+    return matched
+
+
+def covers(path_filter: PathFilter | None, path: str) -> bool:
+    """ファイルがパスフィルタの対象範囲に含まれるか（フィルタなしは全ファイルが対象）"""
+    if path_filter is None:
+        return True
+    if path_filter.paths is not None:
+        return _matches(path_filter.paths, path)
+    if path_filter.paths_ignore is not None:
+        return not _matches(path_filter.paths_ignore, path)
+    return True
+
+
+def is_triggered(path_filter: PathFilter | None, files: Sequence[str]) -> bool:
+    """
+    変更ファイルがパスフィルタの条件を満たすか
+
+    paths は1つでもマッチすれば発火、paths-ignore は全ファイルが無視対象なら発火しない。
+    """
+    return any(covers(path_filter, f) for f in files)
+
+
+def affected_workflows(
+    workflows: dict[str, WorkflowInfo],
+    files: Sequence[str],
+    workflow_dir: str = ".github/workflows",
+    event: str = DEFAULT_EVENT,
+) -> list[str]:
+    """
+    変更ファイルで発火するワークフローを抽出
+
+    ワークフローファイル自体が変更された場合は、フィルタに関係なく対象にする。
+
+    Args:
+        workflows: WorkflowIndex.load() の結果
+        files: 変更ファイル（リポジトリルートからの相対パス）
+        workflow_dir: ワークフローディレクトリ（リポジトリルートからの相対パス）
+        event: 判定するイベント
+    """
+    changed = set(files)
+    return [
+        name
+        for name, info in workflows.items()
+        if f"{workflow_dir}/{name}" in changed
+        or (event in info.events and is_triggered(info.path_filters.get(event), files))
+    ]
@@ -0,0 +1,178 @@
+"""優先度順の正規表現パターンでテキストを分類する分類器"""
+
+import re
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import Protocol, TypeVar, cast
+
+from act_lens.guard import PatternGuard, check_pattern, clamp, required_texts
+
+_S = TypeVar("_S", str, bytes)
+_S_contra = TypeVar("_S_contra", str, bytes, contravariant=True)
+
+
+class Searchable(Protocol[_S_contra]):
+    """find/rfindで検索できるテキスト（str / bytes / mmap）"""
+
+    def __len__(self) -> int: ...
+    def find(self, sub: _S_contra, start: int = ..., end: int = ..., /) -> int: ...
+    def rfind(self, sub: _S_contra, start: int = ..., end: int = ..., /) -> int: ...
+
+
+def find_lines(text: Searchable[_S], needles: Sequence[_S]) -> list[tuple[int, int]]:
+    """
+    いずれかの文字列を含む行の範囲を、出現順に重複なく取得
+
+    Args:
+        text: 改行区切りのテキスト（bytesやmmapの場合はneedlesもbytesで指定）
+        needles: 探す文字列
+
+    Returns:
+        (行頭の位置, 行末の位置) のリスト（行末の改行は含まない）
+    """
+    if not needles:
+        return []
+    newline = cast(_S, "\n" if isinstance(needles[0], str) else b"\n")
+    line_starts: set[int] = set()
+    for needle in needles:
+        pos = text.find(needle)
+        while pos != -1:
+            line_starts.add(text.rfind(newline, 0, pos) + 1)
+            eol = text.find(newline, pos)
+            pos = -1 if eol == -1 else text.find(needle, eol)  # 同じ行の残りは読み飛ばす
+
+    regions: list[tuple[int, int]] = []
+    for start in sorted(line_starts):
+        end = text.find(newline, start)
+        regions.append((start, len(text) if end == -1 else end))
+    return regions
+
+
+class Classifier:
+    """優先度順の (パターン, ラベル) を、パターンごとにコンパイルして優先度順に照合する
+
+    優先度の高いパターンから順に照合し、最初にマッチしたパターンの優先度を結果とする
+    （それより優先度の低いパターンは照合しない）。各パターンは、マッチに必ず含まれる
+    固定の文字列（guard.required_texts()、求められなければ triggers）を小文字化した
+    テキストから文字列検索で探し、それを含む行だけをつないで1回 search する。
+    文字列がテキストになければ正規表現は動かさないため、トリガーを含む行が大量に
+    あっても、その行にマッチしえないパターンのコストは文字列検索1回で済む。
+
+    triggers には、固定の文字列を求められないパターンのマッチに必ず含まれる文字列を
+    指定する（指定しなければ全行を照合する）。パターンは1行の中で照合し、1行のうち
+    照合するのは先頭から guard.MAX_MATCH_CHARS 文字までとする。guard を渡した場合、
+    照合する行をつないだテキストへのパターンごとの1回の検索で予算を計り（マッチごとには
+    計らない）、予算を超えたら、そのパターンだけを無効にする。
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[tuple[str, str]],
+        triggers: Sequence[str] = (),
+        flags: re.RegexFlag = re.IGNORECASE,
+    ) -> None:
+        for pattern, _ in rules:
+            check_pattern(pattern, flags)
+        self.labels = [label for _, label in rules]
+        self.rules = [pattern for pattern, _ in rules]
+        self.flags = flags
+        self.patterns = [re.compile(pattern, flags) for pattern in self.rules]
+        # 他のトリガーを含むトリガーは、含まれる側を探せば同じ行が見つかるため除く
+        lowered = tuple(dict.fromkeys(trigger.lower() for trigger in triggers))
+        self.triggers = tuple(t for t in lowered if not any(u != t and u in t for u in lowered))
+        # パターンごとに照合する行を探す文字列（空なら全行を照合する）
+        self.needles = [required_texts(pattern, flags) or self.triggers for pattern in self.rules]
+
+    def classify(self, text: str) -> str | None:
+        """
+        テキスト中でマッチした中で最も優先度の高いラベルを返す
+
+        Returns:
+            ラベル（いずれのパターンにもマッチしない場合はNone）
+        """
+        rank = self.rank(text)
+        return None if rank is None else self.labels[rank]
+
+    def rank(
+        self,
+        text: str,
+        lowered: str | None = None,
+        guard: PatternGuard | None = None,
+        limit: int | None = None,
+    ) -> int | None:
+        """
+        テキスト中でマッチした最も高い優先度（0が最優先）を返す
+
+        Args:
+            text: 改行区切りのテキスト
+            lowered: text.lower() の結果（呼び出し側で計算済みなら渡す）
+            guard: 照合時間を計るガード（無効にしたパターンはマッチしないものとする）
+            limit: この優先度より高いパターンだけを照合する（既に見つけた優先度）
+        """
+        if lowered is None:
+            lowered = text.lower()
+        all_lines: list[tuple[int, int]] | None = None
+        for rank in range(len(self.patterns) if limit is None else limit):
+            needles = self.needles[rank]
+            if needles and len(lowered) == len(text):
+                regions = find_lines(lowered, needles)
+            else:
+                # 小文字化で長さが変わる文字を含む場合は位置を対応付けられないため全行を照合
+                all_lines = _all_lines(text) if all_lines is None else all_lines
+                regions = all_lines
+            if regions and self._matches(self.patterns[rank], text, regions, guard):
+                return rank
+        return None
+
+    def search(
+        self, text: str, lowered: str | None = None, guard: PatternGuard | None = None
+    ) -> bool:
+        """いずれかのパターンにマッチするか"""
+        return self.rank(text, lowered, guard) is not None
+
+    def _matches(
+        self,
+        pattern: re.Pattern[str],
+        text: str,
+        regions: list[tuple[int, int]],
+        guard: PatternGuard | None,
+    ) -> bool:
+        """行（の先頭 MAX_MATCH_CHARS 文字）をつないだテキストに pattern が1行の中でマッチするか"""
+        target = "\n".join(text[start : clamp(start, end)] for start, end in regions)
+        guard = guard or _UNGUARDED
+        pos = 0
+        while match := guard.search(pattern, target, pos, len(target)):
+            if "\n" not in match.group():
+                return True
+            # 行をまたいだマッチ（\s 等が改行にマッチ）は、その行の中だけで照合し直す
+            start = target.rfind("\n", 0, match.start()) + 1
+            end = target.find("\n", match.start())
+            if guard.search(pattern, target, start, end):
+                return True
+            pos = end + 1
+        return False
+
+
+# guard を渡さない照合に使う、予算のないガード
+_UNGUARDED = PatternGuard(budget=float("inf"))
+
+
+def _all_lines(text: str) -> list[tuple[int, int]]:
+    """全行の範囲（行末の改行は含まない）"""
+    regions: list[tuple[int, int]] = []
+    start = 0
+    while (end := text.find("\n", start)) != -1:
+        regions.append((start, end))
+        start = end + 1
+    regions.append((start, len(text)))
+    return regions
+
+
+@lru_cache(maxsize=32)
+def build_classifier(
+    rules: tuple[tuple[str, str], ...],
+    triggers: tuple[str, ...] = (),
+    flags: re.RegexFlag = re.IGNORECASE,
+) -> Classifier:
+    """同じパターン表の分類器を使い回す（コンパイルは初回のみ）"""
+    return Classifier(rules, triggers, flags)
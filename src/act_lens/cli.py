@@ -1,27 +1,405 @@
 """CLIエントリーポイント"""
 
+import math
+import sys
+import threading
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, NamedTuple
 
 import typer
 from rich.console import Console
+from rich.markup import escape
 from rich.panel import Panel
 
+from act_lens.changes import affected_workflows, changed_files, tracked_content
+from act_lens.config import CONFIG_PATH, PatternConfig, load_patterns
 from act_lens.formatter import MarkdownFormatter
+from act_lens.models import CachedResult, FailureInfo
+from act_lens.noise import collapse_lines
 from act_lens.parser import LogParser
-from act_lens.runner import ActRunner
+from act_lens.results import ResultCache, result_key
+from act_lens.runner import DEFAULT_TIMEOUT, ActRunner, ActStream
+from act_lens.spool import DEFAULT_WINDOW, LogSpool, prune_spools
 from act_lens.utils import copy_to_clipboard, save_report
+from act_lens.workflows import WorkflowIndex
 
 app = typer.Typer(help="actの出力をレンズで覗いて整形するCLIツール")
 console = Console()
 
 
+class _RunResult(NamedTuple):
+    """1回分のact実行結果"""
+
+    exit_code: int
+    failures: list[FailureInfo]  # 失敗したジョブごとの解析結果
+    spool: LogSpool | None  # キャッシュを再利用した場合はNone
+    stopped: bool = False  # fail-fastで途中で停止した
+
+
+def _print_log(lines: Iterable[str]) -> None:
+    """ログをコンソールに表示（進捗表示やリトライの繰り返し行は折り畳む）"""
+    console.print("\n[dim]--- ログ ---[/dim]")
+    for line in collapse_lines(lines):
+        console.print(line, markup=False)  # マークアップを無効化
+    console.print("[dim]--- ログ終了 ---[/dim]\n")
+
+
+def _warn_disabled(label: str, parser: LogParser) -> None:
+    """照合に時間がかかりすぎて無効にしたパターンを警告（そのパターンのエラーは見落としうる）"""
+    for pattern, seconds in parser.guard.disabled.items():
+        console.print(
+            f"[yellow]警告:[/yellow] {escape(label)}: 1回の照合に{seconds:.1f}秒かかったため、"
+            f"以降照合しないパターン: {escape(pattern)}"
+        )
+
+
+def _warn_stale(label: str, parser: LogParser) -> None:
+    """ログより後に更新されたため、エラー発生箇所の前後の行を付けなかったソースファイルを警告"""
+    for file_path in parser.stale_sources:
+        console.print(
+            f"[yellow]警告:[/yellow] {escape(label)}: {escape(file_path)} はログより後に"
+            "更新されているため、エラー発生箇所の前後の行を表示しません"
+        )
+
+
+class _FailFast:
+    """最初の確定的な失敗を検出した時点で、実行中の全actを停止する
+
+    enabled でない場合も実行中のactを登録しておき、Ctrl-C で stop() する
+    （actは新しいセッションで起動するため、端末からのSIGINTが届かない）。
+    """
+
+    def __init__(self, patterns: PatternConfig | None = None, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.triggered = threading.Event()
+        self._parser = LogParser(patterns=patterns)
+        self._streams: set[ActStream] = set()
+        self._lock = threading.Lock()
+
+    def register(self, stream: ActStream) -> None:
+        """停止の対象に加える（既に失敗を検出していればすぐに停止する）"""
+        with self._lock:
+            self._streams.add(stream)
+            triggered = self.triggered.is_set()
+        if triggered:
+            stream.terminate()
+
+    def unregister(self, stream: ActStream) -> None:
+        """停止の対象から外す"""
+        with self._lock:
+            self._streams.discard(stream)
+
+    def watch(self, lines: Iterable[str]) -> Iterator[str]:
+        """ログ行を監視しながら後段へ流す"""
+        if not self.enabled:
+            yield from lines
+            return
+        for line in lines:
+            yield line
+            if not self.triggered.is_set() and (error_type := self._parser.detect_fatal(line)):
+                if self.stop():
+                    console.print(
+                        f"[yellow]fail-fast:[/yellow] {error_type} を検出したためactを停止します"
+                    )
+
+    def stop(self) -> bool:
+        """実行中の全actを停止し、以降の対象は開始しない（既に停止済みならFalse）"""
+        with self._lock:
+            if self.triggered.is_set():
+                return False
+            self.triggered.set()
+            streams = list(self._streams)
+
+        for stream in streams:
+            stream.terminate()
+        return True
+
+
+def _run_target(
+    runner: ActRunner,
+    workflow: str | None,
+    job: str | None,
+    fail_fast: _FailFast | None = None,
+    timeout: float | None = DEFAULT_TIMEOUT,
+    log_window: int = DEFAULT_WINDOW,
+    cache: ResultCache | None = None,
+    key: str | None = None,
+    patterns: PatternConfig | None = None,
+) -> _RunResult:
+    """1回分のactを実行し、生ログをスプールしながら解析する（キャッシュがあれば再利用）"""
+    if cache and key and (cached := cache.get(key)):
+        console.print(
+            f"[dim]{_target_label(workflow, job)}: 入力に変更がないため前回の結果を再利用"
+            f"（{cached.created:%Y-%m-%d %H:%M:%S}）[/dim]"
+        )
+        return _RunResult(cached.exit_code, cached.failures, None)
+
+    stream = runner.stream_act(workflow, job, timeout=timeout)
+    # 起動中に他の対象で失敗を検出した場合も、登録時に停止する
+    if fail_fast:
+        fail_fast.register(stream)
+    try:
+        with stream, LogSpool.create(_target_label(workflow, job), window=log_window) as spool:
+            lines = spool.tee(stream)
+            if fail_fast:
+                lines = fail_fast.watch(lines)
+
+            # ログは実行ごとに独立して解析し、失敗したジョブ（matrixの各レグ）ごとに結果を得る
+            parser = LogParser(patterns=patterns)
+            failures = parser.parse_all(lines, workflow)
+    finally:
+        if fail_fast:
+            fail_fast.unregister(stream)
+    _warn_disabled(_target_label(workflow, job), parser)
+
+    if stream.timed_out:
+        # 途中までのログから、打ち切られたステップを示すTIMEOUTレポートを作る
+        running_job = parser.running_step[0] if parser.running_step else None
+        partial = next((f for f in failures if f.job == running_job), None)
+        timeout_failure = parser.timeout_failure(partial, workflow, timeout)
+        failures = [f for f in failures if f is not partial] + [timeout_failure]
+
+    for i, failure in enumerate(failures):
+        update: dict[str, object] = {"log_path": str(spool.path)}
+        # actの "[1.2s]" 表記ではなく、マーカーの到着時刻から計測した実時間を優先する
+        if (
+            failure.error_type != "TIMEOUT"
+            and (seconds := stream.step_seconds(failure.job, failure.step)) is not None
+        ):
+            update["duration"] = seconds
+        failures[i] = failure.model_copy(update=update)
+
+    exit_code = stream.returncode or 0
+    # 失敗（不安定なテスト等で再実行すれば通りうる）、途中で停止した実行、
+    # actを起動できなかった実行は、結果として再利用しない
+    if cache and key and exit_code == 0 and not stream.terminated and stream.process is not None:
+        cache.put(
+            CachedResult(
+                key=key, exit_code=exit_code, log_sha256=spool.sha256.hexdigest(), failures=failures
+            )
+        )
+    # fail-fastで停止した実行（タイムアウトは除く）は、終了コードではなく停止として表示する
+    return _RunResult(exit_code, failures, spool, stream.terminated and not stream.timed_out)
+
+
+def _replay_log(
+    source: str,
+    workflow: str | None,
+    log_window: int = DEFAULT_WINDOW,
+    patterns: PatternConfig | None = None,
+    workers: int = 1,
+) -> _RunResult:
+    """保存済みのactログ（"-" は標準入力）をactを実行せずに解析する"""
+    parser = LogParser(patterns=patterns)
+    if source == "-":
+        # 標準入力は読み直せないため、詳細表示用にスプールへ退避しながら解析する
+        with LogSpool.create("stdin", window=log_window) as spool:
+            failures = parser.parse_all(
+                spool.tee(line.rstrip("\r\n") for line in sys.stdin), workflow
+            )
+        log_path, result_spool = str(spool.path), spool
+    else:
+        # ファイル全体は読み込まず、mmapして失敗区間だけをデコードする
+        failures = parser.parse_file(Path(source), workflow, workers)
+        log_path, result_spool = str(Path(source).resolve()), None
+
+    _warn_disabled("標準入力" if source == "-" else source, parser)
+    _warn_stale(source, parser)
+    failures = [failure.model_copy(update={"log_path": log_path}) for failure in failures]
+    # 終了コードはログに残らないため、失敗を抽出できたかどうかで判定する
+    return _RunResult(1 if failures else 0, failures, result_spool)
+
+
+def _replay_logs(
+    sources: list[str],
+    workflow: str | None,
+    parallel: int,
+    log_window: int,
+    patterns: PatternConfig | None = None,
+) -> list[_RunResult]:
+    """
+    --from-log で指定された各ログを（--parallel の数まで並列に）解析する
+
+    ログが --parallel より少なければ、余ったプロセス数で各ログのジョブを並列に解析する。
+    """
+    for source in sources:
+        if source != "-" and not Path(source).is_file():
+            raise typer.BadParameter(
+                f"ログファイルが存在しません: {source}", param_hint="--from-log"
+            )
+    if sources.count("-") > 1:
+        raise typer.BadParameter("標準入力 '-' は1回だけ指定できます", param_hint="--from-log")
+
+    workers = max(1, parallel // len(sources))
+
+    def replay(source: str) -> _RunResult:
+        return _replay_log(source, workflow, log_window, patterns, workers)
+
+    with ThreadPoolExecutor(max_workers=min(parallel, len(sources))) as pool:
+        return list(pool.map(replay, sources))
+
+
+def _parse_job_timeouts(values: list[str] | None) -> dict[str, float]:
+    """--job-timeout の "ジョブ名=秒" 指定を辞書に変換"""
+    timeouts: dict[str, float] = {}
+    for value in values or []:
+        name, _, seconds = value.rpartition("=")
+        try:
+            parsed = float(seconds)
+        except ValueError:
+            parsed = -1.0
+        if not name or not math.isfinite(parsed) or parsed < 0:
+            raise typer.BadParameter(
+                f"'{value}' は 'ジョブ名=秒' の形式で指定してください", param_hint="--job-timeout"
+            )
+        timeouts[name] = parsed
+    return timeouts
+
+
+def _build_targets(
+    runner: ActRunner,
+    index: WorkflowIndex,
+    workflow: str | None,
+    jobs: list[str] | None,
+    parallel: int,
+) -> list[tuple[str | None, str | None]]:
+    """
+    実行対象の (ワークフロー, ジョブ) の組を列挙（インデックスで存在を検証する）
+
+    最後まで解釈できなかったワークフローのジョブ一覧は欠けている可能性があるため、
+    そこにありうるジョブは検証せず、ワークフローの絞り込みもせずにactに任せる。
+    """
+    workflows = index.load()
+    if workflows and workflow and workflow not in workflows:
+        raise typer.BadParameter(
+            f"'{workflow}' は存在しません（候補: {', '.join(workflows)}）", param_hint="--workflow"
+        )
+    partial = [
+        name
+        for name, info in workflows.items()
+        if not info.complete and (not workflow or name == workflow)
+    ]
+
+    if jobs:
+        targets: list[tuple[str | None, str | None]] = []
+        for job in jobs:
+            candidates = index.workflows_for_job(job)
+            if (
+                workflows
+                and not partial
+                and (not candidates or (workflow and workflow not in candidates))
+            ):
+                raise typer.BadParameter(f"ジョブ '{job}' が見つかりません", param_hint="--job")
+            # ジョブを含むワークフローが1つだけなら、actに読ませるファイルを絞り込む
+            only = candidates[0] if len(candidates) == 1 and not partial else None
+            targets.append((workflow or only, job))
+        return targets
+    if parallel > 1 and not workflow:
+        return [(name, None) for name in sorted(runner.list_workflows())] or [(None, None)]
+    return [(workflow, None)]
+
+
+def _affected_targets(
+    index: WorkflowIndex, ref: str, workflow: str | None, jobs: list[str] | None
+) -> list[tuple[str | None, str | None]]:
+    """refからの変更で発火するワークフロー（とジョブ）だけを実行対象にする（--workflow で絞り込む）"""
+    workflows = index.load()
+    if workflow and workflow not in workflows:
+        raise typer.BadParameter(
+            f"'{workflow}' は存在しません（候補: {', '.join(workflows)}）", param_hint="--workflow"
+        )
+    try:
+        files = changed_files(ref)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--changed-since") from e
+
+    affected = affected_workflows(workflows, files, index.workflow_dir.as_posix())
+    if workflow:
+        affected = [name for name in affected if name == workflow]
+    if not jobs:
+        return [(name, None) for name in affected]
+    return [
+        (name, job)
+        for name in affected
+        for job in jobs
+        if any(info.id == job for info in workflows[name].jobs)
+    ]
+
+
+def _print_jobs(index: WorkflowIndex, workflow: str | None) -> None:
+    """インデックスからジョブ一覧を表示（act -l を起動しない）"""
+    for name, job in index.jobs(workflow):
+        details: list[str] = []
+        if job.needs:
+            details.append(f"needs: {', '.join(job.needs)}")
+        for axis, values in job.matrix.items():
+            details.append(f"{axis}: {', '.join(values)}")
+        suffix = f" [dim]({'; '.join(details)})[/dim]" if details else ""
+        console.print(f"[bold]{name}[/bold]  [cyan]{job.id}[/cyan]{suffix}", highlight=False)
+    for name, info in index.load().items():
+        if not info.complete and (workflow is None or name == workflow):
+            console.print(
+                f"[yellow]警告:[/yellow] {name}: 解釈できない箇所があるため、"
+                "ジョブ一覧が欠けている可能性があります"
+            )
+
+
+def _complete_workflow(incomplete: str) -> list[str]:
+    """--workflow のシェル補完"""
+    return [name for name in WorkflowIndex().load() if name.startswith(incomplete)]
+
+
+def _complete_job(incomplete: str) -> list[str]:
+    """--job のシェル補完"""
+    return sorted({job.id for _, job in WorkflowIndex().jobs() if job.id.startswith(incomplete)})
+
+
+def _target_label(workflow: str | None, job: str | None) -> str:
+    """実行対象の表示名"""
+    return " / ".join(filter(None, [workflow, job])) or "全ワークフロー"
+
+
 @app.command()
 def main(
     workflow: Annotated[
-        str | None, typer.Option("--workflow", "-w", help="ワークフローファイル名")
+        str | None,
+        typer.Option(
+            "--workflow", "-w", help="ワークフローファイル名", autocompletion=_complete_workflow
+        ),
+    ] = None,
+    job: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--job", "-j", help="実行するジョブ名（複数指定可）", autocompletion=_complete_job
+        ),
     ] = None,
-    job: Annotated[str | None, typer.Option("--job", "-j", help="実行するジョブ名")] = None,
+    from_log: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--from-log",
+            help="actを実行せず保存済みのログを解析（'-'で標準入力、複数指定可）",
+        ),
+    ] = None,
+    changed_since: Annotated[
+        str | None,
+        typer.Option(
+            "--changed-since", help="指定したgit refからの変更で発火するワークフローのみ実行"
+        ),
+    ] = None,
+    list_jobs: Annotated[
+        bool, typer.Option("--list", "-l", help="ワークフローとジョブの一覧を表示して終了")
+    ] = False,
+    parallel: Annotated[
+        int,
+        typer.Option(
+            "--parallel",
+            "-P",
+            min=1,
+            help="同時に実行するactの最大数（--from-log ではログを解析するプロセス数）",
+        ),
+    ] = 1,
     preview: Annotated[bool, typer.Option("--preview", "-p", help="プレビュー表示")] = False,
     compact: Annotated[
         bool, typer.Option("--compact", help="簡潔モード（エラーサマリーのみ）")
@@ -31,34 +409,163 @@ def main(
     ] = False,
     output: Annotated[Path | None, typer.Option("--output", "-o", help="出力ファイルパス")] = None,
     verbose: Annotated[bool, typer.Option("--verbose", "-v", help="詳細ログ表示")] = False,
+    fail_fast: Annotated[
+        bool, typer.Option("--fail-fast", help="最初の失敗を検出した時点でactを停止")
+    ] = False,
+    timeout: Annotated[
+        float, typer.Option("--timeout", min=0, help="act 1回あたりのタイムアウト秒数（0で無制限）")
+    ] = DEFAULT_TIMEOUT,
+    job_timeout: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--job-timeout",
+            help="ジョブ別のタイムアウト（例: integration=900、複数指定可。--jobで実行するジョブのみ）",
+        ),
+    ] = None,
+    log_window: Annotated[
+        int,
+        typer.Option(
+            "--log-window",
+            min=1,
+            help="メモリに保持する直近のログ行数（全体は.act-lens/に圧縮保存）",
+        ),
+    ] = DEFAULT_WINDOW,
+    reuse_results: Annotated[
+        bool,
+        typer.Option(
+            "--reuse-results",
+            help="入力（ワークフロー・.actrc・対象ファイル）が前回と同じならactを実行せず成功した結果を再利用",
+        ),
+    ] = False,
 ) -> None:
     """act実行してエラーログを整形"""
     console.print(Panel.fit("🔍 [bold cyan]Act-Lens[/bold cyan]", border_style="cyan"))
 
-    # act実行
     runner = ActRunner()
-    log, exit_code = runner.run_act(workflow, job)
-
-    if exit_code == 0:
-        console.print("[green]✓[/green] 成功 - エラーなし")
+    index = WorkflowIndex(runner.workflow_dir)
+    if list_jobs:
+        _print_jobs(index, workflow)
         return
 
-    if verbose:
-        console.print("\n[dim]--- ログ ---[/dim]")
-        console.print(log, markup=False)  # マークアップを無効化
-        console.print("[dim]--- ログ終了 ---[/dim]\n")
+    try:
+        patterns = load_patterns()
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint=str(CONFIG_PATH)) from e
+
+    results: list[_RunResult | None]
+    if from_log:
+        # 保存済みのログを解析（actは実行しない）
+        labels = ["標準入力" if source == "-" else source for source in from_log]
+        prune_spools(reserve=from_log.count("-"))
+        results = list(_replay_logs(from_log, workflow, parallel, log_window, patterns))
+    else:
+        # act実行（出力は行単位でストリーミングし、到着順にそのまま解析する）
+        if not math.isfinite(timeout):
+            raise typer.BadParameter("秒数を指定してください（0で無制限）", param_hint="--timeout")
+        job_timeouts = _parse_job_timeouts(job_timeout)
+        if changed_since:
+            targets = _affected_targets(index, changed_since, workflow, job)
+            if not targets:
+                console.print(
+                    f"[green]✓[/green] {changed_since} からの変更で発火するワークフローはありません"
+                )
+                return
+            console.print(
+                f"[cyan]変更の影響を受ける対象:[/cyan] "
+                f"{', '.join(_target_label(*target) for target in targets)}"
+            )
+        else:
+            targets = _build_targets(runner, index, workflow, job, parallel)
+        if unused := [name for name in job_timeouts if name not in {job for _, job in targets}]:
+            # ジョブを指定しない実行は1つのactでワークフローの全ジョブを動かすため、
+            # ジョブ単位では停止できず、全体に --timeout を使う
+            console.print(
+                f"[yellow]警告:[/yellow] --job-timeout の {', '.join(unused)} は"
+                "実行対象のジョブ（--job）にないため使いません"
+                "（ワークフロー全体の実行には --timeout を使います）"
+            )
+
+        # 古いスプールは開始前に1回だけ削除する（この実行で作成するものは削除しない）
+        prune_spools(reserve=len(targets))
 
-    # ログ解析
-    parser = LogParser()
-    failure = parser.parse(log, workflow)
+        # 各actは独立したワーカーで実行し、同時実行数は --parallel で制限する
+        # （fail-fastでなくても実行中のactを登録し、Ctrl-Cで停止する）
+        watcher = _FailFast(patterns, enabled=fail_fast)
+
+        cache = ResultCache() if reuse_results else None
+        keys: dict[tuple[str | None, str | None], str] = {}
+        if cache:
+            try:
+                tracked = tracked_content()
+            except ValueError as e:
+                console.print(f"[yellow]警告:[/yellow] 結果を再利用できません: {e}")
+            else:
+                workflows = index.load()
+                keys = {target: result_key(workflows, *target, tracked) for target in targets}
+
+        def run(target: tuple[str | None, str | None]) -> _RunResult | None:
+            if watcher.triggered.is_set():
+                return None  # fail-fast（またはCtrl-C）で停止済みのため開始しない
+            target_timeout = job_timeouts.get(target[1] or "", timeout)
+            return _run_target(
+                runner,
+                *target,
+                watcher,
+                target_timeout,
+                log_window,
+                cache,
+                keys.get(target),
+                patterns,
+            )
+
+        with ThreadPoolExecutor(max_workers=min(parallel, len(targets))) as pool:
+            try:
+                results = list(pool.map(run, targets))
+            except KeyboardInterrupt:
+                # 実行中のactを停止し、ワーカーが残りの出力を読み切ってから終わる
+                console.print("\n[yellow]中断:[/yellow] 実行中のactを停止します")
+                watcher.stop()
+                raise
+        labels = [_target_label(*target) for target in targets]
+
+    failures: list[FailureInfo] = []
+    for label, result in zip(labels, results, strict=True):
+        if result is None:
+            console.print(f"[dim]- {label}: スキップ（fail-fast）[/dim]")
+            continue
+        if result.exit_code == 0:
+            if len(results) > 1:
+                console.print(f"[green]✓[/green] {label}: 成功")
+            continue
+
+        if verbose and result.spool:
+            # 生ログはメモリに残していないため、スプールから読み戻して表示する
+            _print_log(result.spool.read_lines())
+        if result.failures:
+            failures.extend(result.failures)
+            if len(results) > 1:
+                status = "fail-fastで停止" if result.stopped else f"exit code {result.exit_code}"
+                console.print(f"[red]✗[/red] {label}: 失敗（{status}）")
+        elif result.stopped:
+            console.print(f"[dim]- {label}: 停止（fail-fast）[/dim]")
+        else:
+            console.print(f"[yellow]警告:[/yellow] {label}: エラー情報を抽出できませんでした")
+            if result.spool:
+                if not verbose:
+                    # 手掛かりとしてメモリ上の直近の行だけを表示
+                    _print_log(list(result.spool.tail)[-20:])
+                console.print(f"[dim]生ログ: {result.spool.path}[/dim]")
+
+    if all(result is not None and result.exit_code == 0 for result in results):
+        console.print("[green]✓[/green] 成功 - エラーなし")
+        return
 
-    if not failure:
-        console.print("[yellow]警告:[/yellow] エラー情報を抽出できませんでした")
+    if not failures:
         return
 
-    # Markdown生成
+    # Markdown生成（複数ジョブの失敗は1つのレポートにまとめる）
     formatter = MarkdownFormatter()
-    report = formatter.format(failure, compact=compact)
+    report = formatter.format_all(failures, compact=compact)
 
     # プレビュー表示
     if preview:
@@ -0,0 +1,319 @@
+"""`.act-lens.toml` で追加・上書きするエラー/成功パターンと抽出器
+
+例:
+    [errors]
+    triggers = ["quota"]
+    patterns = [
+        { pattern = "QuotaExceeded", type = "QUOTA" },
+        { pattern = "Error: Process completed with exit code [1-9]", type = "BUILD_FAILURE" },
+    ]
+
+    [success]
+    triggers = ["build ok"]
+    patterns = ["BUILD OK"]
+
+    [[extractors]]
+    name = "ilint"
+    errors = [{ pattern = "ilint: .+ error", type = "LINT" }]
+    error_triggers = ["ilint:"]
+    locations = ['(?P<file>[^\\s:]+\\.foo):(?P<line>\\d+)']
+    extensions = ["foo"]
+
+組み込みと同じエラータイプのパターンは組み込みのものを同じ優先度で置き換え、新しい
+エラータイプのパターンは組み込みのものより優先する。抽出器も同じ名前のものを置き換え、
+新しいものは組み込みのものより前に置く。分類器はトリガーを含む行にだけパターンを
+照合するため、triggers のどれも必ずは含まないパターンは、マッチに必ず含まれる固定の
+文字列（"QuotaExceeded" なら "quotaexceeded"）をトリガーに加える。固定の文字列を
+求められないパターン（"\\d+" 等）は拒否する。
+
+検証済みの内容は設定ファイルの内容のハッシュをキーに `.act-lens/patterns.json` に保存し、
+次回からはTOMLの解釈とパターンの検査を省く。
+"""
+
+import hashlib
+import json
+import re
+import tomllib
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from act_lens.extractors import Extractor
+from act_lens.guard import CHECK_VERSION, assume_checked, check_pattern, required_texts
+from act_lens.utils import ACT_LENS_DIR
+
+CONFIG_PATH = Path(".act-lens.toml")
+
+# キャッシュの形式を変えたら上げる（古いキャッシュは一致しなくなる）
+CACHE_VERSION = 2
+
+DEFAULT_CACHE_PATH = ACT_LENS_DIR / "patterns.json"
+
+# 分類器が照合するときのフラグ（エラーは大文字小文字を区別しない）
+ERROR_FLAGS = re.IGNORECASE
+SUCCESS_FLAGS = re.NOFLAG
+
+
+class PatternConfig(NamedTuple):
+    """組み込みのパターンに追加・上書きするパターン"""
+
+    errors: tuple[tuple[str, str], ...] = ()  # (パターン, エラータイプ)
+    error_triggers: tuple[str, ...] = ()
+    success: tuple[str, ...] = ()
+    success_triggers: tuple[str, ...] = ()
+    extractors: tuple[Extractor, ...] = ()
+
+    def checked_patterns(self) -> list[tuple[str, int]]:
+        """check_pattern() で検査する (パターン, フラグ)"""
+        errors = [*self.errors, *(rule for ex in self.extractors for rule in ex.errors)]
+        return [
+            *((pattern, ERROR_FLAGS) for pattern, _ in errors),
+            *((pattern, SUCCESS_FLAGS) for pattern in self.success),
+            *((pattern, re.NOFLAG) for ex in self.extractors for pattern in ex.locations),
+        ]
+
+
+def load_patterns(
+    path: Path = CONFIG_PATH, cache_path: Path | None = DEFAULT_CACHE_PATH
+) -> PatternConfig:
+    """
+    設定ファイルのパターンを読み込む（ファイルがなければ空）
+
+    Args:
+        path: 設定ファイル
+        cache_path: 検証済みの内容を保存するファイル（Noneは保存しない）
+
+    Raises:
+        ValueError: 設定ファイルを解釈できない、またはパターンが不正な場合
+    """
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return PatternConfig()
+    except OSError as e:
+        raise ValueError(f"{path} を読み込めません: {e}") from e
+
+    key = hashlib.sha256(f"v{CACHE_VERSION}\0{CHECK_VERSION}\0".encode() + data).hexdigest()
+    if cache_path and (config := _read_cache(cache_path, key)):
+        assume_checked(config.checked_patterns())
+        return config
+
+    try:
+        config = parse_config(tomllib.loads(data.decode("utf-8")))
+    except (UnicodeDecodeError, tomllib.TOMLDecodeError) as e:
+        raise ValueError(f"{path} を解釈できません: {e}") from e
+    except ValueError as e:
+        raise ValueError(f"{path}: {e}") from e
+    if cache_path:
+        _write_cache(cache_path, key, config)
+    return config
+
+
+def parse_config(table: dict[str, Any]) -> PatternConfig:
+    """
+    TOMLの内容を検証してPatternConfigにする
+
+    Raises:
+        ValueError: 未知のキー・型の誤り・不正なパターン・トリガーを求められない
+            パターンがある場合
+    """
+    _known_keys(table, "", ("errors", "success", "extractors"))
+    errors = _table(table, "errors")
+    _known_keys(errors, "errors.", ("patterns", "triggers"))
+    success = _table(table, "success")
+    _known_keys(success, "success.", ("patterns", "triggers"))
+
+    config = PatternConfig(
+        errors=_rules(errors.get("patterns", []), "errors.patterns"),
+        error_triggers=_strings(errors.get("triggers", []), "errors.triggers"),
+        success=_strings(success.get("patterns", []), "success.patterns"),
+        success_triggers=_strings(success.get("triggers", []), "success.triggers"),
+        extractors=tuple(
+            _extractor(item, f"extractors[{i}]")
+            for i, item in enumerate(_list(table.get("extractors", []), "extractors"))
+        ),
+    )
+    for pattern, flags in config.checked_patterns():
+        check_pattern(pattern, flags)
+    return config._replace(
+        error_triggers=_triggers(
+            [pattern for pattern, _ in config.errors],
+            config.error_triggers,
+            ERROR_FLAGS,
+            "errors.patterns",
+        ),
+        success_triggers=_triggers(
+            config.success, config.success_triggers, SUCCESS_FLAGS, "success.patterns"
+        ),
+        extractors=tuple(
+            ex._replace(
+                error_triggers=_triggers(
+                    [pattern for pattern, _ in ex.errors],
+                    ex.error_triggers,
+                    ERROR_FLAGS,
+                    f"extractors[{i}].errors",
+                )
+            )
+            for i, ex in enumerate(config.extractors)
+        ),
+    )
+
+
+def merge_rules(
+    base: Sequence[tuple[str, str]], overrides: Sequence[tuple[str, str]]
+) -> tuple[tuple[str, str], ...]:
+    """
+    組み込みの (パターン, エラータイプ) の表にパターンを追加・上書きする
+
+    組み込みと同じエラータイプのものは組み込みのパターンと同じ位置で置き換え、
+    新しいエラータイプのものは表の先頭に置く。
+    """
+    labels = {label for _, label in base}
+    added = [rule for rule in overrides if rule[1] not in labels]
+    merged: list[tuple[str, str]] = []
+    for pattern, label in base:
+        replaced = [rule for rule in overrides if rule[1] == label]
+        merged += replaced or [(pattern, label)]
+    return (*added, *merged)
+
+
+def merge_extractors(
+    base: Sequence[Extractor], overrides: Sequence[Extractor]
+) -> tuple[Extractor, ...]:
+    """同じ名前の抽出器を置き換え、新しい抽出器は組み込みのものより前に置く"""
+    by_name = {extractor.name: extractor for extractor in overrides}
+    names = {extractor.name for extractor in base}
+    added = tuple(extractor for extractor in overrides if extractor.name not in names)
+    return (*added, *(by_name.get(extractor.name, extractor) for extractor in base))
+
+
+def _extractor(item: Any, where: str) -> Extractor:
+    if not isinstance(item, dict):
+        raise ValueError(f"{where}: テーブルで指定してください")
+    table: dict[str, Any] = item  # pyright: ignore[reportUnknownVariableType]
+    _known_keys(table, f"{where}.", Extractor._fields)
+    name = table.get("name")
+    if not isinstance(name, str) or not name:
+        raise ValueError(f"{where}.name: 抽出器の名前を指定してください")
+    extractor = Extractor(
+        name,
+        errors=_rules(table.get("errors", []), f"{where}.errors"),
+        error_triggers=_strings(table.get("error_triggers", []), f"{where}.error_triggers"),
+        locations=_strings(table.get("locations", []), f"{where}.locations"),
+        extensions=_strings(table.get("extensions", []), f"{where}.extensions"),
+    )
+    if extractor.locations and not extractor.extensions:
+        raise ValueError(f"{where}.extensions: locations のファイルの拡張子を指定してください")
+    for i, pattern in enumerate(extractor.locations):
+        if not {"file", "line"} <= _groups(pattern, f"{where}.locations[{i}]"):
+            raise ValueError(
+                f"{where}.locations[{i}]: 名前付きグループ file / line を含めてください"
+            )
+    return extractor
+
+
+def _triggers(
+    patterns: Sequence[str], triggers: tuple[str, ...], flags: int, where: str
+) -> tuple[str, ...]:
+    """triggers のどれも必ずは含まないパターンの、マッチに必ず含まれる文字列を加えたトリガー"""
+    lowered = [trigger.lower() for trigger in triggers]
+    added: list[str] = []
+    for i, pattern in enumerate(patterns):
+        texts = required_texts(pattern, flags)
+        if texts is None:
+            raise ValueError(
+                f"{where}[{i}]: マッチに必ず含まれる固定の文字列がなく、照合する行を"
+                "トリガーで選べないパターンです"
+            )
+        if not all(any(t in text for t in lowered) for text in texts):
+            added += texts
+    return tuple(dict.fromkeys([*triggers, *added]))
+
+
+def _rules(value: Any, where: str) -> tuple[tuple[str, str], ...]:
+    rules: list[tuple[str, str]] = []
+    for i, item in enumerate(_list(value, where)):
+        if not isinstance(item, dict):
+            raise ValueError(
+                f"{where}[{i}]: {{ pattern = ..., type = ... }} の形式で指定してください"
+            )
+        rule: dict[str, Any] = item  # pyright: ignore[reportUnknownVariableType]
+        _known_keys(rule, f"{where}[{i}].", ("pattern", "type"))
+        pattern, label = rule.get("pattern"), rule.get("type")
+        if not isinstance(pattern, str) or not pattern or not isinstance(label, str) or not label:
+            raise ValueError(f"{where}[{i}]: pattern と type を文字列で指定してください")
+        rules.append((pattern, label))
+    return tuple(rules)
+
+
+def _groups(pattern: str, where: str) -> set[str]:
+    """パターンの名前付きグループ"""
+    try:
+        return set(re.compile(pattern).groupindex)
+    except re.error as e:
+        raise ValueError(f"{where}: 正規表現として不正です（{e}）") from e
+
+
+def _strings(value: Any, where: str) -> tuple[str, ...]:
+    items = _list(value, where)
+    if not all(isinstance(item, str) and item for item in items):
+        raise ValueError(f"{where}: 空でない文字列のリストで指定してください")
+    return tuple(items)
+
+
+def _list(value: Any, where: str) -> list[Any]:
+    if not isinstance(value, list):
+        raise ValueError(f"{where}: リストで指定してください")
+    return value  # pyright: ignore[reportUnknownVariableType]
+
+
+def _table(table: dict[str, Any], key: str) -> dict[str, Any]:
+    value = table.get(key, {})
+    if not isinstance(value, dict):
+        raise ValueError(f"{key}: テーブルで指定してください")
+    return value  # pyright: ignore[reportUnknownVariableType]
+
+
+def _known_keys(table: dict[str, Any], prefix: str, keys: Sequence[str]) -> None:
+    if unknown := sorted(table.keys() - set(keys)):
+        raise ValueError(f"不明なキー: {', '.join(prefix + key for key in unknown)}")
+
+
+def _read_cache(path: Path, key: str) -> PatternConfig | None:
+    """キーが一致する検証済みの内容（なければNone）"""
+    try:
+        cached = json.loads(path.read_text(encoding="utf-8"))
+        if cached["key"] != key:
+            return None
+        patterns = cached["patterns"]
+        return PatternConfig(
+            errors=tuple((pattern, label) for pattern, label in patterns["errors"]),
+            error_triggers=tuple(patterns["error_triggers"]),
+            success=tuple(patterns["success"]),
+            success_triggers=tuple(patterns["success_triggers"]),
+            extractors=tuple(
+                Extractor(
+                    ex["name"],
+                    errors=tuple((pattern, label) for pattern, label in ex["errors"]),
+                    error_triggers=tuple(ex["error_triggers"]),
+                    locations=tuple(ex["locations"]),
+                    extensions=tuple(ex["extensions"]),
+                )
+                for ex in patterns["extractors"]
+            ),
+        )
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _write_cache(path: Path, key: str, config: PatternConfig) -> None:
+    """検証済みの内容を保存（書き込めない環境では何もしない）"""
+    patterns = config._asdict()
+    patterns["extractors"] = [extractor._asdict() for extractor in config.extractors]
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"key": key, "patterns": patterns}), encoding="utf-8")
+        tmp_path.replace(path)
+    except OSError:
+        return
@@ -0,0 +1,207 @@
+"""ツール（テストランナー・型チェッカー・リンター・コンパイラ）ごとの出力の抽出器"""
+
+import re
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import NamedTuple
+
+from act_lens.guard import PatternGuard, clamp, compile_pattern
+
+# パスとして拾う文字（空白・区切りに使われる記号を含まない）
+_PATH = r"[^\s:\"'()\[\],]+"
+
+# 発生箇所の候補: 拡張子の直後に行番号が続く位置（".py:12" / ".ts(10,5)" / '.py", line 12'）
+# 先頭が "." の文字列なので、正規表現エンジンの文字列検索で候補位置を絞れる
+_CANDIDATE = re.compile(r'\.([A-Za-z]\w*)(?:[:(]\d|", line \d)')
+
+
+class Extractor(NamedTuple):
+    """ツールの出力からエラータイプと発生箇所を拾う抽出器
+
+    errors のパターンは、error_triggers のいずれか（大文字小文字は区別しない）を含む行に
+    しかマッチしないこと。locations のパターンは、extensions の拡張子を持つファイルの
+    直後に行番号が続く行（例: "app.py:12" / "app.ts(10,5)"）にだけ照合する。
+    """
+
+    name: str
+    errors: tuple[tuple[str, str], ...] = ()  # (パターン, エラータイプ)
+    error_triggers: tuple[str, ...] = ()
+    locations: tuple[str, ...] = ()  # 名前付きグループ file / line を持つパターン
+    extensions: tuple[str, ...] = ()
+
+
+_JS_EXTENSIONS = ("js", "jsx", "mjs", "cjs", "ts", "tsx", "mts", "cts")
+
+# 登録済みの抽出器（同じ行で複数の発生箇所がマッチした場合は先のものを採用）
+EXTRACTORS: tuple[Extractor, ...] = (
+    Extractor(
+        "python",
+        locations=(r'File "(?P<file>[^"]+)", line (?P<line>\d+)',),
+        extensions=("py",),
+    ),
+    Extractor(
+        "pytest",
+        # 例: "FAILED tests/test_app.py::test_add - assert 5 == 6"
+        errors=((rf"FAILED {_PATH}\.py::", "ASSERTION"),),
+        error_triggers=("FAILED",),
+        # 例: "tests/test_app.py:42: AssertionError"
+        locations=(rf"(?P<file>{_PATH}\.py):(?P<line>\d+): (?:\w+(?:Error|Exception)|Failed)\b",),
+        extensions=("py",),
+    ),
+    Extractor(
+        "mypy",
+        # 例: "src/app.py:12: error: Incompatible types in assignment"
+        errors=((r"\.pyi?:\d+:(?:\d+:)? error:", "TYPE_CHECK"),),
+        error_triggers=("error",),
+        locations=(rf"(?P<file>{_PATH}\.pyi?):(?P<line>\d+):(?:\d+:)? error:",),
+        extensions=("py", "pyi"),
+    ),
+    Extractor(
+        "ruff",
+        # 例: "Found 2 errors." / "Found 3 errors (1 fixed, 2 remaining)."
+        # （mypyの "Found 2 errors in 1 file" とは区別する）
+        errors=((r"Found \d+ errors?(?: \([^)]*\))?\.", "LINT"),),
+        error_triggers=("error",),
+        # 例: "src/app.py:1:8: F401 [*] `os` imported but unused" / " --> src/app.py:1:8"
+        locations=(
+            rf"(?P<file>{_PATH}\.pyi?):(?P<line>\d+):\d+: [A-Z]{{1,4}}\d{{3,4}}\b",
+            rf"--> (?P<file>{_PATH}\.pyi?):(?P<line>\d+):\d+",
+        ),
+        extensions=("py", "pyi"),
+    ),
+    Extractor(
+        "go",
+        # 例: "FAIL	example.com/calc [build failed]" / "--- FAIL: TestAdd (0.00s)"
+        errors=(
+            (r"FAIL\s+\S+\s+\[build failed\]", "COMPILE"),
+            (r"--- FAIL: ", "ASSERTION"),
+        ),
+        error_triggers=("FAIL",),
+        # 例: "    calc_test.go:12: expected 3, got 4" / "./main.go:10:5: undefined: foo"
+        locations=(rf"(?P<file>{_PATH}\.go):(?P<line>\d+)(?::\d+)?: ",),
+        extensions=("go",),
+    ),
+    Extractor(
+        "cargo",
+        # 例: "error[E0308]: mismatched types" / "test result: FAILED. 1 passed; 1 failed"
+        #     "assertion `left == right` failed"
+        errors=(
+            (r"error\[E\d{4}\]", "COMPILE"),
+            (r"assertion `[^`]*` failed|assertion failed|test result: FAILED", "ASSERTION"),
+        ),
+        error_triggers=("error", "fail"),
+        # 例: "  --> src/main.rs:4:18" / "thread 'main' panicked at src/main.rs:2:5:"
+        locations=(
+            rf"--> (?P<file>{_PATH}\.rs):(?P<line>\d+):\d+",
+            rf"panicked at (?:'.*', )?(?P<file>{_PATH}\.rs):(?P<line>\d+):\d+",
+        ),
+        extensions=("rs",),
+    ),
+    Extractor(
+        "jest",
+        # 例: "Tests:       1 failed, 3 passed, 4 total"
+        errors=((r"Tests:\s+\d+ failed", "ASSERTION"),),
+        error_triggers=("failed",),
+        # 例: "      at Object.<anonymous> (src/sum.test.js:10:15)"
+        locations=(rf"(?P<file>{_PATH}\.[cm]?[jt]sx?):(?P<line>\d+):\d+\)?$",),
+        extensions=_JS_EXTENSIONS,
+    ),
+    Extractor(
+        "tsc",
+        # 例: "src/app.ts(10,5): error TS2322: ..." / "src/app.ts:10:5 - error TS2322: ..."
+        errors=((r"error TS\d+", "TYPE_CHECK"),),
+        error_triggers=("error",),
+        locations=(
+            rf"(?P<file>{_PATH}\.[cm]?[jt]sx?)\((?P<line>\d+),\d+\): error TS",
+            rf"(?P<file>{_PATH}\.[cm]?[jt]sx?):(?P<line>\d+):\d+ - error TS",
+        ),
+        extensions=_JS_EXTENSIONS,
+    ),
+)
+
+
+def error_rules(
+    base: Sequence[tuple[str, str]],
+    extractors: Sequence[Extractor],
+    generic: Sequence[str],
+) -> tuple[tuple[str, str], ...]:
+    """
+    抽出器のエラータイプのパターンを、汎用パターンの直前に挿入した優先度順の表
+
+    Args:
+        base: 優先度順の (パターン, エラータイプ)
+        extractors: 抽出器
+        generic: ツール固有のパターンより優先度を下げるエラータイプ
+    """
+    split = next((i for i, (_, label) in enumerate(base) if label in generic), len(base))
+    tools = [rule for extractor in extractors for rule in extractor.errors]
+    return (*base[:split], *tools, *base[split:])
+
+
+def error_triggers(extractors: Sequence[Extractor]) -> tuple[str, ...]:
+    """抽出器のエラータイプのパターンのトリガー（重複を除く）"""
+    return tuple(dict.fromkeys(t for extractor in extractors for t in extractor.error_triggers))
+
+
+class Locator:
+    """抽出器の発生箇所のパターンを、候補の行にだけ適用する
+
+    拡張子の直後に行番号が続く位置を1つの正規表現でまとめて探し、見つかった拡張子を
+    宣言した抽出器のパターンだけをその行に照合する。抽出器が増えても走査は1回で済み、
+    最初に見つかった発生箇所で打ち切る。同じ行の抽出器のパターンは1回だけ照合し、
+    行の先頭から guard.MAX_MATCH_CHARS 文字より後ろの候補は見ない。
+    """
+
+    def __init__(self, extractors: Sequence[Extractor]) -> None:
+        self.extractors = tuple(ex for ex in extractors if ex.locations)
+        self.patterns = [[compile_pattern(p) for p in ex.locations] for ex in self.extractors]
+        owners: dict[str, list[int]] = {}
+        for i, extractor in enumerate(self.extractors):
+            for extension in extractor.extensions:
+                owners.setdefault(extension, []).append(i)
+        self._owners = owners
+
+    def locate(self, text: str, guard: PatternGuard | None = None) -> tuple[str, int] | None:
+        """
+        テキスト中で最初に見つかった発生箇所
+
+        Args:
+            text: 改行区切りの行
+            guard: 照合時間を計るガード（無効にしたパターンは照合しない）
+
+        Returns:
+            (ファイルパス, 行番号)（見つからなければNone）
+        """
+        pos = 0
+        start = end = -1
+        searched: set[int] = set()  # 今の行で照合済みの抽出器
+        while candidate := _CANDIDATE.search(text, pos):
+            pos = candidate.start()
+            if pos > end:
+                start = text.rfind("\n", 0, pos) + 1
+                end = text.find("\n", pos)
+                end = len(text) if end == -1 else end
+                searched.clear()
+            if pos >= clamp(start, end):
+                pos = end + 1  # 照合する範囲より後ろの候補は読み飛ばして次の行へ
+                continue
+            for i in self._owners.get(candidate.group(1), ()):
+                if i in searched:
+                    continue
+                searched.add(i)
+                for pattern in self.patterns[i]:
+                    match = (
+                        guard.search(pattern, text, start, clamp(start, end))
+                        if guard
+                        else pattern.search(text, start, clamp(start, end))
+                    )
+                    if match:
+                        return match.group("file"), int(match.group("line"))
+            pos = candidate.end()
+        return None
+
+
+@lru_cache(maxsize=32)
+def build_locator(extractors: tuple[Extractor, ...]) -> Locator:
+    """同じ抽出器の組み合わせのLocatorを使い回す（コンパイルは初回のみ）"""
+    return Locator(extractors)
@@ -1,6 +1,9 @@
 """Markdown形式でレポート生成"""
 
+from collections.abc import Sequence
+
 from act_lens.models import FailureInfo
+from act_lens.noise import collapse_text
 
 
 class MarkdownFormatter:
@@ -30,14 +33,43 @@ class MarkdownFormatter:
 
         return "\n\n".join(filter(None, sections))
 
+    def format_all(self, failures: Sequence[FailureInfo], compact: bool = False) -> str:
+        """
+        複数ジョブの失敗を1つのMarkdownレポートにまとめる
+
+        Args:
+            failures: 失敗情報のリスト
+            compact: Trueの場合は簡潔モード
+
+        Returns:
+            Markdownテキスト（1件のみの場合はformat()と同じ）
+        """
+        if len(failures) == 1:
+            return self.format(failures[0], compact=compact)
+
+        header = f"# 🔍 Act-Lens Failure Report ({len(failures)} failures)"
+        reports = [self.format(failure, compact=compact) for failure in failures]
+        return "\n\n---\n\n".join([f"{header}\n\n{self._failure_list(failures)}", *reports])
+
+    def _failure_list(self, failures: Sequence[FailureInfo]) -> str:
+        """失敗したジョブの一覧（matrixの各レグを1行ずつ）"""
+        return "\n".join(
+            f"- `{failure.error_type}` {failure.workflow} → {failure.job}: {failure.message}"
+            for failure in failures
+        )
+
     def _header(self, failure: FailureInfo) -> str:
         """ヘッダーセクション"""
-        return f"""## 🔍 Act-Lens Failure Report
+        header = f"""## 🔍 Act-Lens Failure Report
 
 **Workflow**: {failure.workflow} → {failure.job} → {failure.step}
 **Failed at**: {failure.timestamp.strftime("%Y-%m-%d %H:%M:%S")}
 **Duration**: {failure.format_duration()}"""
 
+        if failure.log_path:
+            header += f"\n**Raw log**: `{failure.log_path}`"
+        return header
+
     def _error_summary(self, failure: FailureInfo) -> str:
         """エラーサマリーセクション"""
         lines: list[str] = ["### Error Summary", f"- Type: `{failure.error_type}`"]
@@ -61,13 +93,13 @@ class MarkdownFormatter:
         return "\n".join(lines)
 
     def _stack_trace(self, failure: FailureInfo) -> str | None:
-        """スタックトレースセクション"""
+        """スタックトレースセクション（進捗表示やリトライの繰り返し行は折り畳む）"""
         if not failure.stack_trace:
             return None
 
         return f"""### Stack Trace
 ```
-{failure.stack_trace}
+{collapse_text(failure.stack_trace)}
 ```"""
 
     def _format_compact(self, failure: FailureInfo) -> str:
@@ -0,0 +1,334 @@
+"""正規表現の照合の防御（照合する長さの上限・バックトラックが爆発するパターンの拒否・時間の予算）"""
+
+import importlib
+import re
+import time
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+# 1行のうち正規表現を照合する先頭からの文字数
+# （actのマーカーやツールのエラー行は行頭にあるため、bundler の minify された1行等の残りは見ない）
+MAX_MATCH_CHARS = 8 * 1024
+
+# 1回の照合に使える秒数（超えたパターンは以降照合しない）
+# 照合する長さを MAX_MATCH_CHARS に抑えているため、通常のパターンは1回数ミリ秒で終わる
+PATTERN_BUDGET_SECONDS = 0.5
+
+# 正規表現の構文木（標準ライブラリの非公開モジュールのため型を持たない）
+_parser: Any = importlib.import_module("re._parser")
+_UNBOUNDED: int = _parser.MAXREPEAT
+_REPEATS = ("MAX_REPEAT", "MIN_REPEAT")
+
+# check_pattern() の判定を変えたら上げる（判定結果を保存したキャッシュを無効にする）
+CHECK_VERSION = 2
+
+# check_pattern() を通った (パターン, フラグ)（同じパターンを繰り返し検査しない）
+_checked: set[tuple[str, int]] = set()
+
+
+def check_pattern(pattern: str, flags: int = 0) -> None:
+    """
+    バックトラックが指数的に増えうるパターンを拒否する
+
+    上限のない繰り返しの中に上限のない繰り返しがあるパターン（例: "(a+)+" / "(\\w+\\s?)*"）は、
+    マッチしない入力で照合の時間が入力長に対して指数的に増えうる。ただし外側の繰り返しが
+    内側の繰り返しにマッチしない文字で始まる場合（例: "(?:\\n[^\\n]*)*"）は区切りが一意に
+    決まるため許可する。上限のない繰り返しの中で、同じ文字から始まりうる（または空に
+    マッチしうる）選択肢がある場合（例: "(x|x)*" / "(a|aa)*"）も、同じ入力の分け方が
+    指数的に増えうるため拒否する。
+
+    Raises:
+        ValueError: 正規表現として不正、またはバックトラックが爆発しうる場合
+    """
+    if (pattern, flags) in _checked:
+        return
+    try:
+        tree = _parser.parse(pattern, flags)
+    except re.error as e:
+        raise ValueError(f"正規表現として不正なパターンです: {pattern!r}（{e}）") from e
+    # パターン中の (?i) 等を含めたフラグ
+    flags |= tree.state.flags
+    if _nested_repeat(list(tree), flags):
+        raise ValueError(
+            "上限のない繰り返しが入れ子になっていて、照合の時間が入力長に対して"
+            f"指数的に増えうるパターンです: {pattern!r}"
+        )
+    if _overlapping_branch(list(tree), flags):
+        raise ValueError(
+            "上限のない繰り返しの中の選択肢が重なっていて、照合の時間が入力長に対して"
+            f"指数的に増えうるパターンです: {pattern!r}"
+        )
+    _checked.add((pattern, flags))
+
+
+def assume_checked(patterns: Iterable[tuple[str, int]]) -> None:
+    """以前の実行で check_pattern() を通った (パターン, フラグ) を検査済みとして扱う"""
+    _checked.update(patterns)
+
+
+def compile_pattern(pattern: str, flags: int = 0) -> re.Pattern[str]:
+    """check_pattern() で検査してからコンパイルする"""
+    check_pattern(pattern, flags)
+    return re.compile(pattern, flags)
+
+
+def clamp(start: int, end: int) -> int:
+    """行の範囲 [start, end) のうち照合する範囲の終端"""
+    return min(end, start + MAX_MATCH_CHARS)
+
+
+def required_texts(pattern: str, flags: int = 0) -> tuple[str, ...] | None:
+    """
+    マッチに必ずいずれかが含まれる文字列（小文字化したもの）
+
+    固定の文字の並び・必ず1回以上繰り返すグループ・全ての選択肢から求め、候補が
+    複数あれば最も短い文字列が長いものを選ぶ。求められない場合はNone。
+
+    例: "QuotaExceeded" → ("quotaexceeded",)、"E(?:rror|RR)\\d+" → ("rror", "rr")
+    """
+    return _required(list(_parser.parse(pattern, flags)))
+
+
+class PatternGuard:
+    """1回の照合に予算を超える時間がかかったパターンを、以降照合しない
+
+    Pythonの正規表現の照合は途中で止められないため、1回の照合は照合する長さの上限
+    （clamp()）で抑え、それでも1回で予算を超えたパターンは無効にして以降マッチしない
+    ものとして扱う。予算は照合1回ごとで積算しないため、短い照合をいくら繰り返しても
+    無効にはならない。
+    """
+
+    def __init__(self, budget: float = PATTERN_BUDGET_SECONDS) -> None:
+        self.budget = budget
+        # 無効にしたパターンと、予算を超えた照合にかかった秒数
+        self.disabled: dict[str, float] = {}
+
+    def search(
+        self, pattern: re.Pattern[str], text: str, pos: int, endpos: int
+    ) -> re.Match[str] | None:
+        """pattern.search(text, pos, endpos)（無効にしたパターンはNone）"""
+        if pattern.pattern in self.disabled:
+            return None
+        start = time.perf_counter()
+        match = pattern.search(text, pos, endpos)
+        self.charge(pattern.pattern, time.perf_counter() - start)
+        return match
+
+    def finditer(
+        self, pattern: re.Pattern[str], text: str, pos: int, endpos: int
+    ) -> Iterator[re.Match[str]]:
+        """pattern.finditer(text, pos, endpos)（無効にしたら打ち切る）"""
+        while pos <= endpos and (match := self.search(pattern, text, pos, endpos)):
+            yield match
+            pos = match.end() if match.end() > match.start() else match.start() + 1
+
+    def charge(self, pattern: str, seconds: float) -> bool:
+        """1回の照合の秒数が予算を超えていればパターンを無効にする（無効にしたらTrue）"""
+        if seconds <= self.budget:
+            return False
+        self.disabled[pattern] = seconds
+        return True
+
+
+def _nested_repeat(items: list[Any], flags: int) -> bool:
+    """区切りの文字で始まらない、上限のない繰り返しの入れ子があるか"""
+    for body in _unbounded_bodies(items):
+        separator = _leading_literal(body)
+        for inner in _unbounded_bodies(body):
+            if separator is None or _can_match(inner, separator, flags):
+                return True
+        if _nested_repeat(body, flags):
+            return True
+    return False
+
+
+def _overlapping_branch(items: list[Any], flags: int) -> bool:
+    """上限のない繰り返しの中に、重なりうる選択肢があるか"""
+    return any(
+        _branches_overlap(body, flags) or _overlapping_branch(body, flags)
+        for body in _unbounded_bodies(items)
+    )
+
+
+def _branches_overlap(items: list[Any], flags: int) -> bool:
+    """選択肢のうち2つが、空にマッチしうるか同じ文字から始まりうるか（中の要素も辿る）"""
+    for op, av in items:
+        name = str(op)
+        if name == "BRANCH":
+            alternatives = [list(branch) for branch in av[1]]
+            if len(alternatives) > 1 and any(_nullable(branch) for branch in alternatives):
+                return True
+            for i, first in enumerate(alternatives):
+                for second in alternatives[i + 1 :]:
+                    heads = _head(first), _head(second)
+                    if any(
+                        _can_match(heads[0], char, flags) and _can_match(heads[1], char, flags)
+                        for char in _probe_chars(first, second)
+                    ):
+                        return True
+        if any(_branches_overlap(child, flags) for child in _children(name, av)):
+            return True
+    return False
+
+
+def _required(items: list[Any]) -> tuple[str, ...] | None:
+    """required_texts() の本体（先読み等の中は、マッチの外を見るため候補にしない）"""
+    candidates: list[tuple[str, ...]] = []
+    run: list[str] = []
+    for op, av in items:
+        name = str(op)
+        if name == "LITERAL":
+            run.append(chr(av).lower())
+            continue
+        if run:
+            candidates.append(("".join(run),))
+            run = []
+        if name == "SUBPATTERN":
+            texts = _required(list(av[3]))
+        elif name == "ATOMIC_GROUP":
+            texts = _required(list(av))
+        elif name in _REPEATS or name == "POSSESSIVE_REPEAT":
+            texts = _required(list(av[2])) if av[0] > 0 else None
+        elif name == "BRANCH":
+            alternatives = [_required(list(branch)) for branch in av[1]]
+            texts = None
+            if all(alternatives):
+                texts = tuple(dict.fromkeys(t for alt in alternatives if alt for t in alt))
+        else:
+            texts = None
+        if texts:
+            candidates.append(texts)
+    if run:
+        candidates.append(("".join(run),))
+    return max(candidates, key=lambda texts: min(map(len, texts)), default=None)
+
+
+def _head(items: list[Any]) -> list[Any]:
+    """先頭の文字にマッチしうる要素（空にマッチしうる要素の次の要素までを含める）"""
+    for i, item in enumerate(items):
+        if not _nullable([item]):
+            return items[: i + 1]
+    return items
+
+
+def _probe_chars(*alternatives: list[Any]) -> list[str]:
+    """選択肢の先頭が重なるかを調べる文字（ASCIIと各選択肢の先頭の固定の文字）"""
+    chars = [chr(code) for code in range(128)]
+    chars += [char for alt in alternatives if (char := _leading_literal(alt)) is not None]
+    return chars
+
+
+def _nullable(items: list[Any]) -> bool:
+    """空文字列にマッチしうるか（判定できない要素はマッチしうるとみなす）"""
+    for op, av in items:
+        name = str(op)
+        if name in ("LITERAL", "NOT_LITERAL", "ANY", "IN"):
+            return False
+        if name in _REPEATS or name == "POSSESSIVE_REPEAT":
+            if av[0] > 0 and not _nullable(list(av[2])):
+                return False
+        elif name == "SUBPATTERN":
+            if not _nullable(list(av[3])):
+                return False
+        elif name == "BRANCH":
+            if not any(_nullable(list(branch)) for branch in av[1]):
+                return False
+        elif name not in ("AT", "ASSERT", "ASSERT_NOT"):
+            return True
+    return True
+
+
+def _unbounded_bodies(items: list[Any]) -> Iterator[list[Any]]:
+    """上限のない繰り返しの中身（入れ子の内側は外側の中身として辿るため返さない）"""
+    for op, av in items:
+        name = str(op)
+        if name in _REPEATS and av[1] == _UNBOUNDED:
+            yield list(av[2])
+        else:
+            for child in _children(name, av):
+                yield from _unbounded_bodies(child)
+
+
+def _children(name: str, av: Any) -> list[list[Any]]:
+    """グループ・選択肢・先読み等の中のパターン"""
+    if name in _REPEATS or name == "POSSESSIVE_REPEAT":
+        return [list(av[2])]
+    if name == "SUBPATTERN":
+        return [list(av[3])]
+    if name == "BRANCH":
+        return [list(branch) for branch in av[1]]
+    if name in ("ASSERT", "ASSERT_NOT"):
+        return [list(av[1])]
+    if name == "ATOMIC_GROUP":
+        return [list(av)]
+    return []
+
+
+def _leading_literal(body: list[Any]) -> str | None:
+    """中身が必ず1文字の固定の文字で始まる場合はその文字"""
+    for op, av in body:
+        name = str(op)
+        if name == "LITERAL":
+            return chr(av)
+        if name == "SUBPATTERN":
+            return _leading_literal(list(av[3]))
+        return None
+    return None
+
+
+def _can_match(items: list[Any], char: str, flags: int) -> bool:
+    """繰り返しの中身のどこかが char にマッチしうるか（判定できない要素はマッチしうるとみなす）"""
+    for op, av in items:
+        name = str(op)
+        if name == "LITERAL":
+            if _same(chr(av), char, flags):
+                return True
+        elif name == "NOT_LITERAL":
+            if not _same(chr(av), char, flags):
+                return True
+        elif name == "ANY":
+            if char != "\n" or flags & re.DOTALL:
+                return True
+        elif name == "IN":
+            if _in_set(list(av), char, flags):
+                return True
+        elif name in ("AT", "ASSERT", "ASSERT_NOT"):
+            continue  # 文字を消費しない
+        elif not (children := _children(name, av)) or any(
+            _can_match(child, char, flags) for child in children
+        ):
+            return True
+    return False
+
+
+def _in_set(members: list[Any], char: str, flags: int) -> bool:
+    """文字集合 [...] が char にマッチするか"""
+    negate = False
+    hit = False
+    for op, av in members:
+        name = str(op)
+        if name == "NEGATE":
+            negate = True
+        elif name == "LITERAL":
+            hit = hit or _same(chr(av), char, flags)
+        elif name == "RANGE":
+            hit = hit or av[0] <= ord(char) <= av[1]
+        elif name == "CATEGORY":
+            hit = hit or bool(re.fullmatch(_CATEGORIES.get(str(av), "[^\\s\\S]"), char))
+        else:
+            return True  # 判定できない要素はマッチしうるとみなす
+    return hit != negate
+
+
+def _same(a: str, b: str, flags: int) -> bool:
+    return a.lower() == b.lower() if flags & re.IGNORECASE else a == b
+
+
+_CATEGORIES = {
+    "CATEGORY_DIGIT": r"\d",
+    "CATEGORY_NOT_DIGIT": r"\D",
+    "CATEGORY_SPACE": r"\s",
+    "CATEGORY_NOT_SPACE": r"\S",
+    "CATEGORY_WORD": r"\w",
+    "CATEGORY_NOT_WORD": r"\W",
+}
@@ -19,6 +19,7 @@ class FailureInfo(BaseModel):
     line_number: int | None = Field(None, ge=1, description="エラー発生行番号")
     context_lines: list[str] = Field(default_factory=list, description="コード前後の行")
     stack_trace: str | None = Field(None, description="スタックトレース全体")
+    log_path: str | None = Field(default=None, description="生ログのスプールファイルパス")
 
     @field_validator("error_type")
     @classmethod
@@ -42,3 +43,51 @@ class FailureInfo(BaseModel):
         if self.file_path:
             return self.file_path
         return "場所不明"
+
+
+class PathFilter(BaseModel):
+    """イベントごとのpaths / paths-ignoreフィルタ"""
+
+    paths: list[str] | None = Field(default=None, description="pathsフィルタ（未指定はNone）")
+    paths_ignore: list[str] | None = Field(
+        default=None, description="paths-ignoreフィルタ（未指定はNone）"
+    )
+
+
+class JobInfo(BaseModel):
+    """ワークフロー内のジョブ情報"""
+
+    id: str = Field(..., description="ジョブID（例: test）")
+    name: str | None = Field(default=None, description="表示名")
+    needs: list[str] = Field(default_factory=list, description="依存ジョブID")
+    matrix: dict[str, list[str]] = Field(default_factory=dict, description="matrixの軸と値")
+
+
+class WorkflowInfo(BaseModel):
+    """ワークフローファイルの解析結果（インデックスのエントリ）"""
+
+    file: str = Field(..., description="ワークフローファイル名（例: ci.yml）")
+    name: str | None = Field(default=None, description="ワークフロー名")
+    mtime_ns: int = Field(..., description="解析時のファイル更新時刻")
+    size: int = Field(..., ge=0, description="解析時のファイルサイズ")
+    sha256: str = Field(..., description="ファイル内容のハッシュ")
+    events: list[str] = Field(default_factory=list, description="トリガーイベント")
+    path_filters: dict[str, PathFilter] = Field(
+        default_factory=dict, description="イベントごとのパスフィルタ"
+    )
+    jobs: list[JobInfo] = Field(default_factory=list, description="ジョブ一覧")
+    complete: bool = Field(
+        default=True, description="最後まで解釈できたか（Falseならジョブ一覧が欠けうる）"
+    )
+
+
+class CachedResult(BaseModel):
+    """キャッシュ済みのact実行結果"""
+
+    key: str = Field(..., description="入力内容から計算したキャッシュキー")
+    created: datetime = Field(default_factory=datetime.now, description="実行時刻")
+    exit_code: int = Field(..., description="actの終了コード")
+    log_sha256: str = Field(..., description="生ログのハッシュ")
+    failures: list[FailureInfo] = Field(
+        default_factory=list, description="失敗したジョブごとの解析結果"
+    )
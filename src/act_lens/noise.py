@@ -0,0 +1,54 @@
+"""繰り返し行・進捗表示の行の折り畳み"""
+
+from collections.abc import Iterable, Iterator
+
+# これ以上連続した同じ形の行を1行に折り畳む
+MIN_RUN = 3
+
+# 行の形を比べるときに無視する文字（数値・進捗バー・空白）
+_VARIABLE = b"0123456789.=#>- \t"
+
+
+def collapse_lines(lines: Iterable[str], min_run: int = MIN_RUN) -> Iterator[str]:
+    """
+    数値や進捗バーだけが異なる連続した行を、最後の行と行数の1行に折り畳む
+
+    各行は可変な文字を bytes.translate() で除いた形を1回求めて直前の行の形と
+    比べるだけなので、行数に対して線形の時間で、保持するのは折り畳み中の行だけで済む。
+    形が空になる行（空行・区切り線等）は折り畳まない。
+
+    Args:
+        lines: 行のイテラブル（逐次読み込みでもよい）
+        min_run: 折り畳む連続行の最小数
+
+    Yields:
+        折り畳んだ行（min_run 未満の連続はそのまま）
+    """
+    run: list[str] = []
+    shape = b""
+    count = 0
+    for line in lines:
+        current = line.encode(errors="replace").translate(None, _VARIABLE)
+        if count and current and current == shape:
+            count += 1
+            if len(run) < min_run:
+                run.append(line)
+            else:
+                run[-1] = line  # 折り畳む場合に残すのは最後の行だけ
+            continue
+        yield from _fold(run, count, min_run)
+        run, shape, count = [line], current, 1
+    yield from _fold(run, count, min_run)
+
+
+def collapse_text(text: str, min_run: int = MIN_RUN) -> str:
+    """改行区切りのテキストに collapse_lines() を適用する"""
+    return "\n".join(collapse_lines(text.split("\n"), min_run))
+
+
+def _fold(run: list[str], count: int, min_run: int) -> Iterator[str]:
+    """連続した同じ形の行を、min_run 以上なら1行にまとめて返す"""
+    if count >= min_run:
+        yield f"{run[-1]}  (×{count})"
+    else:
+        yield from run
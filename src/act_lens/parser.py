@@ -1,10 +1,34 @@
 """ログ解析とエラー抽出"""
 
+import mmap
+import multiprocessing
+import os
 import re
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
 
+from act_lens.ansi import AnsiStripper, strip_ansi
+from act_lens.classifier import build_classifier
+from act_lens.config import PatternConfig, merge_extractors, merge_rules
+from act_lens.extractors import EXTRACTORS, build_locator, error_rules, error_triggers
+from act_lens.guard import PatternGuard
 from act_lens.models import FailureInfo
+from act_lens.runner import MAX_LINE_CHARS
+from act_lens.scanner import LogScanner
+from act_lens.segments import (
+    STEP_FAILURE,
+    JobRouter,
+    JobSegments,
+    LogIndex,
+    Segment,
+    step_marker,
+)
+from act_lens.sources import modified_since, read_lines, resolve_source
 
 
 class LogParser:
@@ -30,12 +54,79 @@ class LogParser:
         (r"Error:", "UNKNOWN"),
     ]
 
+    # ERROR_PATTERNS のいずれかのマッチに必ず含まれる文字列（大文字小文字は区別しない）
+    # これらを含む行だけに正規表現を適用する
+    ERROR_TRIGGERS = ("error", "timed out", "❌")
+
+    # ツール固有の抽出器（pytest / mypy / ruff / go / cargo / jest / tsc 等）
+    # エラータイプのパターンは、ERROR_PATTERNS の汎用のもの（GENERIC_ERROR_TYPES）の直前に入る
+    EXTRACTORS = EXTRACTORS
+    GENERIC_ERROR_TYPES = ("BUILD_FAILURE", "UNKNOWN")
+
     # 成功パターン（これらがあればエラーなしと判定）
     SUCCESS_PATTERNS = [
         r"✅.*Success",
         r"All checks passed",
         r"Success: no issues found",
     ]
+    SUCCESS_TRIGGERS = ("✅", "All checks passed", "Success: no issues found")
+
+    # 成功マークがあってもUNKNOWNを無視しない、実際の失敗を示すパターン
+    EXIT_FAILURE_PATTERN = r"exit code [1-9]|❌.*failed"
+
+    # LogScannerにまとめて渡す行数と、1回に渡す最大文字数の目安
+    SCAN_BATCH_LINES = 4096
+    SCAN_CHUNK_CHARS = 4 * 1024 * 1024
+
+    # parse_file() を複数プロセスで行うとき、別プロセスに渡すジョブの失敗区間の候補の最小バイト数
+    # （これより小さいジョブは、プロセス間の受け渡しより解析の方が速いため元のプロセスで解析する）
+    PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+
+    # fail-fast時に即座にactを停止する、失敗したテストの行（pytestの要約の "FAILED path::"）
+    # ステップの❌の終了マーカーとこの行だけを確定的な失敗とし、テスト名や出力に
+    # AssertionError 等を含むだけの行（成功したテストを含む）では停止しない
+    FATAL_TEST_PATTERN = r"(?:^|\|\s*)FAILED [^\s:]+\.py::"
+
+    # エラー発生箇所の前後に表示するソースコードの行数
+    CONTEXT_LINES = 3
+
+    def __init__(
+        self, source_root: Path | None = None, patterns: PatternConfig | None = None
+    ) -> None:
+        # ログ中のファイルパスを探すリポジトリのルート（コンテナ内のワークスペースに対応）
+        self.source_root = source_root or Path.cwd()
+        # .act-lens.toml で追加・上書きするパターン（config.load_patterns()）
+        self.patterns = patterns = patterns or PatternConfig()
+        extractors = merge_extractors(self.EXTRACTORS, patterns.extractors)
+        self.classifier = build_classifier(
+            error_rules(
+                merge_rules(self.ERROR_PATTERNS, patterns.errors),
+                extractors,
+                self.GENERIC_ERROR_TYPES,
+            ),
+            self.ERROR_TRIGGERS + patterns.error_triggers + error_triggers(extractors),
+        )
+        self.locator = build_locator(extractors)
+        self.success_classifier = build_classifier(
+            tuple((pattern, "SUCCESS") for pattern in (*self.SUCCESS_PATTERNS, *patterns.success)),
+            self.SUCCESS_TRIGGERS + patterns.success_triggers,
+            re.NOFLAG,
+        )
+        self.exit_failure_classifier = build_classifier(
+            ((self.EXIT_FAILURE_PATTERN, "FAILURE"),), ("exit code", "❌"), re.NOFLAG
+        )
+        # 照合の時間の予算を超えて無効にしたパターン（このパーサーの全ての解析で共有する）
+        self.guard = PatternGuard()
+        # 直近のparse_lines()/parse_all()で、終了マーカーが出る前に打ち切られた (ジョブ, ステップ)
+        self.running_step: tuple[str, str] | None = None
+        # そのステップの区間の途中までの走査結果（timeout_failure() で使う）
+        self._running_scanner: LogScanner | None = None
+        # 直近のparse_file()で、ログより後に更新されていたため前後の行を付けなかったソースファイル
+        self.stale_sources: list[str] = []
+        # feed() で取り込み中の状態（未完の行と、ジョブごとの走査）
+        # 改行のない長大な出力は、ActStreamと同じ長さで区切って1行として扱う
+        self._stripper = AnsiStripper(MAX_LINE_CHARS)
+        self._router = JobRouter(self._new_scanner)
 
     def parse(self, log: str, workflow: str | None = None) -> FailureInfo | None:
         """
@@ -45,143 +136,456 @@ class LogParser:
             log: actの出力ログ
             workflow: ワークフローファイル名（省略時はログから抽出）
 
+        Returns:
+            最初に失敗したジョブのFailureInfo（エラーが見つからない場合はNone）
+        """
+        failures = self.parse_text(log, workflow)
+        return failures[0] if failures else None
+
+    def parse_lines(self, lines: Iterable[str], workflow: str | None = None) -> FailureInfo | None:
+        """
+        行のイテレータ（ActStream等）からFailureInfo抽出
+
+        Args:
+            lines: actの出力ログ（1要素1行）
+            workflow: ワークフローファイル名（省略時はログから抽出）
+
+        Returns:
+            最初に失敗したジョブのFailureInfo（エラーが見つからない場合はNone）
+        """
+        failures = self.parse_all(lines, workflow)
+        return failures[0] if failures else None
+
+    def parse_all(self, lines: Iterable[str], workflow: str | None = None) -> list[FailureInfo]:
+        """
+        ジョブごとに解析し、失敗したジョブ（matrixの各レグを含む）ごとのFailureInfoを返す
+
+        行は "[ワークフロー/ジョブ]" の接頭辞でジョブに振り分け、接頭辞のない行は
+        直前のジョブに含める。各ジョブのフィールドはそのジョブの失敗したステップの行
+        だけから抽出するため、別のジョブや成功したステップの出力が混ざらない。
+
+        Args:
+            lines: actの出力ログ（1要素1行）
+            workflow: ワークフローファイル名（省略時はログから抽出）
+
+        Returns:
+            失敗したジョブのFailureInfo（ログに最初に現れた順）
+        """
+        router = JobRouter(self._new_scanner)
+        router.extend(lines)
+        return self._collect(router, workflow)
+
+    def parse_text(self, text: str, workflow: str | None = None) -> list[FailureInfo]:
+        """
+        ログ全体の文字列をジョブごとに解析する（結果はparse_all()と同じ）
+
+        先にLogIndexでジョブの範囲とステップマーカーの位置を求め、
+        各ジョブの失敗区間の切り出しだけを解析する。
+
+        Args:
+            text: actの出力ログ
+            workflow: ワークフローファイル名（省略時はログから抽出）
+
+        Returns:
+            失敗したジョブのFailureInfo（ログに最初に現れた順）
+        """
+        return self._parse_index(LogIndex.build(text), workflow)
+
+    def parse_file(
+        self, path: Path, workflow: str | None = None, workers: int = 1
+    ) -> list[FailureInfo]:
+        """
+        保存済みのログファイルを、全体を読み込まずにジョブごとに解析する（結果はparse_all()と同じ）
+
+        ファイルをmmapし、bytesの正規表現でジョブの範囲とステップマーカーの位置だけを
+        求める。デコードするのはマーカー行と、失敗区間の候補として解析する範囲だけ。
+        ログより後に更新されたソースファイルは、ログの時点と内容が異なりうるため
+        エラー発生箇所の前後の行を付けず、stale_sources に記録する。
+
+        Args:
+            path: actの出力ログ（UTF-8、不正なバイトは置換）
+            workflow: ワークフローファイル名（省略時はログから抽出）
+            workers: ジョブを解析するプロセス数（2以上なら、失敗区間の候補が
+                PARALLEL_MIN_BYTES 以上のジョブを別プロセスで解析する）
+
+        Returns:
+            失敗したジョブのFailureInfo（ログに最初に現れた順）
+        """
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return self.parse_text("", workflow)  # 空のファイルはmmapできない
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                return self._parse_index(LogIndex.build(buf), workflow, path, workers)
+
+    def _parse_index(
+        self, index: LogIndex, workflow: str | None, path: Path | None = None, workers: int = 1
+    ) -> list[FailureInfo]:
+        """
+        インデックスの区間から、ジョブごとに失敗区間を選んで解析する
+
+        選び方はJobSegmentsと同じ（❌で終わった最初のステップ、なければ✅で終わって
+        いない区間のうち最初にエラーを検出したもの）。成功したステップは切り出さない。
+        """
+        jobs = range(len(index.jobs))
+        remote = (
+            [job for job in jobs if _span(index.candidates(job)) >= self.PARALLEL_MIN_BYTES]
+            if path is not None and workers > 1
+            else []
+        )
+        results: list[FailureInfo | None] | None = None
+        if path is not None and len(remote) > 1:
+            results = self._parse_jobs_in_pool(index, workflow, path, workers, remote)
+        if results is None:
+            results = [self._parse_job(index, job, index.candidates(job), workflow) for job in jobs]
+        failures = [failure for failure in results if failure]
+        self.stale_sources = []
+        if path is not None:
+            failures = self._drop_stale_context(failures, os.stat(path).st_mtime_ns)
+
+        # 実行中のステップは、最後に出力のあったジョブのものを優先する
+        running = [
+            (index.last_activity(job), index.jobs[job], step, job)
+            for job in jobs
+            if (step := index.running_step(job))
+        ]
+        self.running_step, self._running_scanner = None, None
+        if running:
+            _, key, step, job = max(running)
+            self.running_step = key, step
+            last = index.segments[job][-1]
+            self._running_scanner = self.scan(index.pieces(last, self.SCAN_CHUNK_CHARS))
+        return failures
+
+    def _drop_stale_context(self, failures: list[FailureInfo], logged_at: int) -> list[FailureInfo]:
+        """ログの更新時刻（logged_at）より後に更新されたソースファイルの前後の行を除く"""
+        kept: list[FailureInfo] = []
+        for failure in failures:
+            if failure.context_lines and failure.file_path:
+                source = resolve_source(failure.file_path, self.source_root)
+                if source is None or modified_since(source, logged_at):
+                    self.stale_sources.append(failure.file_path)
+                    failure = failure.model_copy(update={"context_lines": []})
+            kept.append(failure)
+        return kept
+
+    def _parse_job(
+        self, index: LogIndex, job: int, segments: Sequence[Segment], workflow: str | None
+    ) -> FailureInfo | None:
+        """ジョブの失敗区間の候補を順に解析する（❌で終わった区間か、最初にエラーを検出した区間）"""
+        for segment in segments:
+            scanner = self.scan(index.pieces(segment, self.SCAN_CHUNK_CHARS))
+            if segment.status == STEP_FAILURE or scanner.error_type:
+                return self._failure(scanner, workflow, index.jobs[job] or None, segment.step)
+        return None
+
+    def _parse_jobs_in_pool(
+        self, index: LogIndex, workflow: str | None, path: Path, workers: int, remote: list[int]
+    ) -> list[FailureInfo | None] | None:
+        """
+        remote のジョブを別プロセスで、残りをこのプロセスで解析する（ジョブID順の結果）
+
+        各プロセスは同じファイルをmmapし（ページはOSのページキャッシュで共有される）、
+        受け取るのは区間のオフセットだけ。プロセスを起動できない環境ではNone。
+        --from-log の複数ファイルではスレッドから呼ばれるため、スレッドを持つプロセスを
+        forkしない起動方法（forkserver、なければspawn）を使う。
+        """
+        task = _JobTask(type(self), self.source_root, self.patterns, path, index.jobs, workflow)
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        try:
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(remote)), mp_context=context
+            ) as pool:
+                # 大きいジョブから渡し、別プロセスの解析中に残りのジョブを解析する
+                futures = {
+                    job: pool.submit(_parse_job_in_worker, task, job, index.candidates(job))
+                    for job in sorted(
+                        remote, key=lambda j: _span(index.candidates(j)), reverse=True
+                    )
+                }
+                local = {
+                    job: self._parse_job(index, job, index.candidates(job), workflow)
+                    for job in range(len(index.jobs))
+                    if job not in futures
+                }
+                for future in futures.values():
+                    self.guard.disabled.update(future.result()[1])
+                return [
+                    futures[job].result()[0] if job in futures else local[job]
+                    for job in range(len(index.jobs))
+                ]
+        except (OSError, NotImplementedError, BrokenProcessPool):
+            return None
+
+    def feed(self, chunk: str) -> None:
+        """
+        到着したログの断片を取り込む（finalize() / finalize_all() で結果を取り出す）
+
+        断片は行の途中で区切れていてもよい。未完の行だけを持ち越し、完成した行は
+        ジョブごとの走査に渡してすぐに手放すため、ログの長さによらずメモリは一定に収まる。
+
+        Args:
+            chunk: actの出力の一部
+        """
+        if text := self._stripper.feed(chunk):
+            self._router.extend(text[:-1].split("\n"))
+
+    def finalize(self, workflow: str | None = None) -> FailureInfo | None:
+        """
+        feed() で取り込んだログの解析を終え、最初に失敗したジョブのFailureInfoを返す
+
+        Args:
+            workflow: ワークフローファイル名（省略時はログから抽出）
+
         Returns:
             FailureInfo（エラーが見つからない場合はNone）
         """
-        lines = log.split("\n")
+        failures = self.finalize_all(workflow)
+        return failures[0] if failures else None
+
+    def finalize_all(self, workflow: str | None = None) -> list[FailureInfo]:
+        """
+        feed() で取り込んだログの解析を終え、失敗したジョブごとのFailureInfoを返す
+
+        取り込んだ状態は破棄するため、続けて次のログを feed() できる。
+        """
+        if rest := self._stripper.flush():
+            self._router.extend((rest,))
+        router, self._router = self._router, JobRouter(self._new_scanner)
+        return self._collect(router, workflow)
 
+    def _collect(self, router: JobRouter, workflow: str | None) -> list[FailureInfo]:
+        """振り分け終えたジョブごとの失敗区間からFailureInfoを組み立てる"""
+        # 実行中のステップは、最後に出力のあったジョブのものを優先する
+        self.running_step = router.running_step()
+        self._running_scanner = (
+            router.jobs[self.running_step[0]].running() if self.running_step else None
+        )
+        return self._failures(router.jobs.items(), workflow)
+
+    def _failures(
+        self, jobs: Iterable[tuple[str, JobSegments]], workflow: str | None
+    ) -> list[FailureInfo]:
+        """ジョブごとの失敗区間からFailureInfoを組み立てる"""
+        failures: list[FailureInfo] = []
+        for key, state in jobs:
+            if (found := state.result()) is None:
+                continue
+            scanner, step = found
+            if failure := self._failure(scanner, workflow, key or None, step):
+                failures.append(failure)
+        return failures
+
+    def _failure(
+        self,
+        scanner: LogScanner,
+        workflow: str | None,
+        job: str | None = None,
+        step: str | None = None,
+    ) -> FailureInfo | None:
+        """走査結果からFailureInfoを組み立てる（エラーがなければNone）"""
         # エラータイプ判定
-        error_type = self._detect_error_type(log)
+        error_type = scanner.error_type
         if not error_type:
             return None
 
-        # ワークフロー名抽出（指定されていない場合）
-        if not workflow:
-            workflow = self._extract_workflow_name(lines)
+        return FailureInfo(
+            workflow=workflow or scanner.workflow or "unknown",
+            job=job or scanner.job,
+            step=step or scanner.step,
+            timestamp=datetime.now(),
+            duration=scanner.duration,
+            error_type=error_type,
+            message=scanner.message or "エラーメッセージが見つかりません",
+            file_path=scanner.file_path,
+            line_number=scanner.line_number,
+            context_lines=self._extract_context((), scanner.file_path, scanner.line_number),
+            stack_trace=scanner.stack_trace,
+        )
 
-        # エラーメッセージ抽出
-        message = self._extract_error_message(lines)
+    def _new_scanner(self) -> LogScanner:
+        return LogScanner(
+            self.classifier,
+            self.success_classifier,
+            self.exit_failure_classifier,
+            self.locator,
+            self.guard,
+        )
+
+    def scan(self, lines: Iterable[str]) -> LogScanner:
+        """行を1パスで走査し、抽出結果を保持したLogScannerを返す"""
+        scanner = self._new_scanner()
+        # 行をまとめて渡し、文字列検索と正規表現をC実装の中で一括処理させる
+        batch: list[str] = []
+        chars = 0
+        for line in lines:
+            batch.append(line)
+            chars += len(line)
+            if len(batch) >= self.SCAN_BATCH_LINES or chars >= self.SCAN_CHUNK_CHARS:
+                scanner.feed("\n".join(batch))
+                batch.clear()
+                chars = 0
+        if batch:
+            scanner.feed("\n".join(batch))
+        return scanner
+
+    def scan_failing(self, lines: Sequence[str]) -> LogScanner:
+        """最初に失敗したジョブの失敗区間の走査結果（失敗区間がなければログ全体）"""
+        router = JobRouter(self._new_scanner)
+        router.extend(lines)
+        found = next((found for state in router.jobs.values() if (found := state.result())), None)
+        return found[0] if found else self.scan(lines)
 
-        # ファイルパスと行番号抽出
-        file_path, line_number = self._extract_location(lines)
+    def detect_fatal(self, line: str) -> str | None:
+        """
+        1行分のログが確定的な失敗（ステップの❌の終了マーカー / FATAL_TEST_PATTERN）かを判定
+
+        Returns:
+            該当するエラータイプ（❌はBUILD_FAILURE、失敗したテストはASSERTION、
+            該当しない場合はNone）
+        """
+        line = strip_ansi(line)
+        if (marker := step_marker(line)) is not None and marker[0] == STEP_FAILURE:
+            return "BUILD_FAILURE"
+        if "FAILED" in line and re.search(self.FATAL_TEST_PATTERN, line):
+            return "ASSERTION"
+        return None
 
-        # スタックトレース抽出
-        stack_trace = self._extract_stack_trace(lines)
+    def timeout_failure(
+        self, partial: FailureInfo | None, workflow: str | None, timeout: float | None
+    ) -> FailureInfo:
+        """
+        タイムアウトで打ち切られたログからTIMEOUTのFailureInfoを生成
 
-        # コンテキスト行抽出
-        context_lines = self._extract_context(lines, file_path, line_number)
+        直前の parse_lines() / parse_all() 等で得た実行中ステップを失敗箇所とし、そのステップの
+        途中までの走査結果（ワークフロー名・場所・スタックトレース・最後のエラー出力）を、
+        エラーを検出したかによらず引き継ぐ。実行中ステップがなければ partial を引き継ぐ。
 
-        # ジョブ・ステップ情報抽出
-        job, step = self._extract_job_step(lines)
+        Args:
+            partial: 途中までのログの解析結果（実行中ステップのジョブの失敗）
+            workflow: ワークフローファイル名
+            timeout: 打ち切ったタイムアウト（秒）
+        """
+        fields = partial.model_dump() if partial else {}
+        job, step = self.running_step or (
+            fields.get("job", "unknown"),
+            fields.get("step", "unknown"),
+        )
+        limit = f"{timeout:g}秒" if timeout else "制限時間"
+        message = f"タイムアウト（{limit}）: ステップ '{step}' の実行中に打ち切られました"
 
-        # 実行時間抽出
-        duration = self._extract_duration(lines)
+        if (scanner := self._running_scanner) is not None:
+            fields.update(
+                workflow=scanner.workflow or fields.get("workflow", "unknown"),
+                file_path=scanner.file_path,
+                line_number=scanner.line_number,
+                context_lines=self._extract_context((), scanner.file_path, scanner.line_number),
+                stack_trace=scanner.stack_trace,
+            )
+            if scanner.message:
+                message += f"（最後のエラー出力: {scanner.message}）"
 
-        return FailureInfo(
-            workflow=workflow,
+        fields.update(
+            workflow=workflow or fields.get("workflow", "unknown"),
             job=job,
             step=step,
             timestamp=datetime.now(),
-            duration=duration,
-            error_type=error_type,
+            duration=timeout,
+            error_type="TIMEOUT",
             message=message,
-            file_path=file_path,
-            line_number=line_number,
-            context_lines=context_lines,
-            stack_trace=stack_trace,
         )
+        return FailureInfo(**fields)
 
     def _extract_workflow_name(self, lines: Sequence[str]) -> str:
         """ワークフロー名をログから抽出"""
-        for line in lines:
-            # actログ: "INFO[0000] Using docker host ..."
-            # ワークフロー: "[Workflow name/job]"
-            if match := re.search(r"\[([^/\]]+)/", line):
-                return match.group(1)
-        return "unknown"
+        return self.scan(lines).workflow or "unknown"
 
     def _detect_error_type(self, log: str) -> str | None:
-        """エラータイプを検出"""
-        # まず実際のエラー（BUILD_FAILUREなど）をチェック
-        for pattern, error_type in self.ERROR_PATTERNS:
-            if re.search(pattern, log, re.IGNORECASE):
-                # UNKNOWNタイプの場合のみ、成功パターンでフィルタリング
-                if error_type == "UNKNOWN":
-                    has_success = any(re.search(p, log) for p in self.SUCCESS_PATTERNS)
-                    # 成功マークがあり、実際のexit codeエラーがない場合は無視
-                    if has_success and not re.search(r"exit code [1-9]|❌.*failed", log):
-                        continue
-                return error_type
-        return None
+        """エラータイプを検出（全パターンを1パスで照合し、優先度の最も高いものを返す）"""
+        error_type = self.classifier.classify(log)
+        # UNKNOWNタイプの場合のみ、成功パターンでフィルタリング
+        if error_type == "UNKNOWN":
+            # 成功マークがあり、実際のexit codeエラーがない場合は無視
+            if self.success_classifier.search(log) and not self.exit_failure_classifier.search(log):
+                return None
+        return error_type
 
     def _extract_error_message(self, lines: Sequence[str]) -> str:
         """エラーメッセージを抽出"""
-        for line in reversed(lines):
-            # Failure/Error/FAILED を含む行を探す
-            if any(keyword in line for keyword in ["Error", "FAILED", "Failure", "❌"]):
-                return line.strip()
-        return "エラーメッセージが見つかりません"
+        return self.scan_failing(lines).message or "エラーメッセージが見つかりません"
 
     def _extract_location(self, lines: Sequence[str]) -> tuple[str | None, int | None]:
         """ファイルパスと行番号を抽出"""
-        # Python形式: "  File "test.py", line 42"
-        for line in lines:
-            match = re.search(r'File "([^"]+)", line (\d+)', line)
-            if match:
-                return match.group(1), int(match.group(2))
-        return None, None
+        scanner = self.scan_failing(lines)
+        return scanner.file_path, scanner.line_number
 
     def _extract_stack_trace(self, lines: Sequence[str]) -> str | None:
         """スタックトレースを抽出"""
-        trace_lines: list[str] = []
-        in_trace = False
-
-        for line in lines:
-            if "Traceback" in line:
-                in_trace = True
-                trace_lines = [line]  # 新しいトレースバック開始
-                continue
-
-            if in_trace:
-                trace_lines.append(line)
-                # エラー行（例: ValueError: ...）で終了
-                if line.strip() and not line.startswith(" ") and ":" in line:
-                    break
-
-        return "\n".join(trace_lines) if len(trace_lines) > 1 else None
+        return self.scan_failing(lines).stack_trace
 
     def _extract_context(
         self, lines: Sequence[str], file_path: str | None, line_number: int | None
     ) -> list[str]:
-        """エラー発生箇所のコンテキスト行を抽出"""
-        # TODO: ファイルを読んで前後3行を取得
-        return []
+        """エラー発生箇所の前後の行を、ソースファイルから行番号付きで抽出"""
+        if not file_path or not line_number:
+            return []
+        if (path := resolve_source(file_path, self.source_root)) is None:
+            return []
+        first = max(1, line_number - self.CONTEXT_LINES)
+        source = read_lines(path, first, line_number + self.CONTEXT_LINES)
+        width = len(str(first + len(source) - 1))
+        return [
+            f"{'>' if number == line_number else ' '} {number:>{width}} | {text}"
+            for number, text in enumerate(source, first)
+        ]
+
+    def _extract_running_step(self, lines: Sequence[str]) -> tuple[str, str] | None:
+        """開始（⭐ Run）後に終了マーカー（✅/❌）が出ていないステップを抽出"""
+        return self.scan(lines).running_step
 
     def _extract_job_step(self, lines: Sequence[str]) -> tuple[str, str]:
         """ジョブ名とステップ名を抽出"""
-        job = "unknown"
-        step = "unknown"
-
-        for line in lines:
-            if match := re.search(r"\[([^\]]+)\]\s+(.+)", line):
-                job = match.group(1)
-                step = match.group(2).strip()
-
-        return job, step
+        scanner = self.scan_failing(lines)
+        return scanner.job, scanner.step
 
     def _extract_duration(self, lines: Sequence[str]) -> float | None:
         """実行時間を抽出（秒単位）"""
-        # actログ: "[106.819485ms]" または "[9.988223336s]"
-        for line in reversed(lines):
-            # ミリ秒形式
-            if match := re.search(r"\[(\d+\.?\d*)(ms|milliseconds?)\]", line):
-                return float(match.group(1)) / 1000.0
-            # 秒形式
-            if match := re.search(r"\[(\d+\.?\d*)(s|seconds?)\]", line):
-                return float(match.group(1))
-            # 分形式
-            if match := re.search(r"\[(\d+)m\s*(\d+)s\]", line):
-                minutes = int(match.group(1))
-                seconds = int(match.group(2))
-                return float(minutes * 60 + seconds)
-        return None
+        return self.scan_failing(lines).duration
+
+
+class _JobTask(NamedTuple):
+    """別プロセスでジョブを解析するための、区間以外の入力"""
+
+    parser: type[LogParser]
+    source_root: Path
+    patterns: PatternConfig
+    path: Path
+    jobs: list[str]
+    workflow: str | None
+
+
+def _parse_job_in_worker(
+    task: _JobTask, job: int, segments: list[Segment]
+) -> tuple[FailureInfo | None, dict[str, float]]:
+    """
+    別プロセスで、同じログファイルをmmapしてジョブの区間を解析する
+
+    Returns:
+        (FailureInfo, そのプロセスで無効にしたパターン)
+    """
+    parser = _worker_parser(task.parser, task.source_root, task.patterns)
+    with open(task.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        index = LogIndex.view(buf, task.jobs)
+        failure = parser._parse_job(index, job, segments, task.workflow)  # pyright: ignore[reportPrivateUsage]
+    return failure, parser.guard.disabled
+
+
+@lru_cache(maxsize=4)
+def _worker_parser(cls: type[LogParser], source_root: Path, patterns: PatternConfig) -> LogParser:
+    """プロセスごとに同じ設定のパーサーを使い回す（パターンのコンパイルは初回のみ）"""
+    return cls(source_root, patterns)
+
+
+def _span(segments: Sequence[Segment]) -> int:
+    """区間の範囲の合計（他のジョブの行を含む、解析で読み飛ばす範囲の目安）"""
+    return sum(segment.end - segment.start for segment in segments)
@@ -0,0 +1,134 @@
+"""入力内容をキーにしたact実行結果のキャッシュ"""
+
+import hashlib
+import json
+import time
+from pathlib import Path
+
+from pydantic import ValidationError
+
+from act_lens.changes import DEFAULT_EVENT, covers
+from act_lens.config import CONFIG_PATH
+from act_lens.models import CachedResult, WorkflowInfo
+from act_lens.utils import ACT_LENS_DIR
+
+# キャッシュキーの形式を変えたら上げる（古いエントリは一致しなくなる）
+KEY_VERSION = 2
+
+# エントリの有効期限（秒）
+DEFAULT_MAX_AGE = 7 * 24 * 60 * 60
+
+# キャッシュ全体の上限サイズ（バイト、超えた分は古いものから削除）
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+# actの挙動に影響する設定ファイル
+ACTRC_PATHS = (Path(".actrc"), Path.home() / ".actrc")
+
+
+def result_key(
+    workflows: dict[str, WorkflowInfo],
+    workflow: str | None,
+    job: str | None,
+    tracked: dict[str, str],
+    actrc_paths: tuple[Path, ...] = ACTRC_PATHS,
+    config_path: Path = CONFIG_PATH,
+) -> str:
+    """
+    実行結果に影響する入力からキャッシュキーを計算
+
+    ワークフローファイルの内容、ジョブ名、.actrc、解析のパターンの設定ファイル、
+    およびワークフローのpushの paths / paths-ignore が対象とする追跡ファイルの内容をハッシュする。
+
+    Args:
+        workflows: WorkflowIndex.load() の結果
+        workflow: ワークフローファイル名（Noneは全ワークフロー）
+        job: ジョブ名
+        tracked: changes.tracked_content() の結果
+        actrc_paths: 内容をキーに含める.actrcのパス
+        config_path: 内容をキーに含める解析のパターンの設定ファイル（.act-lens.toml）
+    """
+    selected = [info for name, info in workflows.items() if workflow in (None, name)]
+    filters = [info.path_filters.get(DEFAULT_EVENT) for info in selected]
+
+    digest = hashlib.sha256(f"v{KEY_VERSION}\0{workflow or ''}\0{job or ''}\0".encode())
+    for info in selected:
+        digest.update(f"workflow\0{info.file}\0{info.sha256}\0".encode())
+    for path in actrc_paths:
+        try:
+            digest.update(b"actrc\0" + path.read_bytes() + b"\0")
+        except OSError:
+            continue
+    try:
+        digest.update(b"config\0" + config_path.read_bytes() + b"\0")
+    except OSError:
+        pass
+    for path in sorted(tracked):
+        if not filters or any(covers(path_filter, path) for path_filter in filters):
+            digest.update(f"file\0{path}\0{tracked[path]}\0".encode())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """キャッシュキーごとに実行結果をJSONで保存する
+
+    エントリは有効期限を過ぎたもの、および合計サイズの上限を超えた古いものから削除する。
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path = ACT_LENS_DIR / "results",
+        max_age: float = DEFAULT_MAX_AGE,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+
+    def get(self, key: str) -> CachedResult | None:
+        """キーに一致する有効なエントリを取得（なければ、または生ログが削除済みならNone）"""
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.max_age:
+                return None
+            result = CachedResult.model_validate(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError, ValidationError):
+            return None
+        if result.key != key:
+            return None
+        # レポートが指す生ログ（スプール）が削除されていれば、実行し直して作り直す
+        if any(f.log_path and not Path(f.log_path).exists() for f in result.failures):
+            return None
+        return result
+
+    def put(self, result: CachedResult) -> None:
+        """エントリを保存して古いエントリを削除（書き込めない環境では何もしない）"""
+        path = self._path(result.key)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(result.model_dump_json(), encoding="utf-8")
+            tmp_path.replace(path)
+        except OSError:
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        """期限切れのエントリと、サイズ上限を超えた古いエントリを削除"""
+        entries: list[tuple[float, int, Path]] = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        now = time.time()
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, path in sorted(entries):
+            if now - mtime <= self.max_age and total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
@@ -1,12 +1,199 @@
 """act実行とログキャプチャ"""
 
+import os
+import queue
+import signal
 import subprocess  # nosec B404  # actコマンド実行に必要
+import threading
+import time
+from collections.abc import Iterator
 from pathlib import Path
+from types import TracebackType
+from typing import IO, NamedTuple
 
 from rich.console import Console
 
+from act_lens.scanner import STEP_END_PATTERN, STEP_START_PATTERN
+
 console = Console()
 
+# 1行あたりの最大文字数（これを超える行は分割して読み出す）
+MAX_LINE_CHARS = 64 * 1024
+
+# デフォルトのタイムアウト（秒）
+DEFAULT_TIMEOUT = 300.0
+
+# タイムアウトで停止を要求してから、残りの出力を読み切るまでの猶予（秒）
+TERMINATE_GRACE = 10.0
+
+# タイムアウト時の終了コード
+TIMEOUT_EXIT_CODE = 124
+
+
+# LogRecord.stream の値
+STDOUT = 1
+STDERR = 2
+
+
+class LogRecord(NamedTuple):
+    """到着時刻とストリーム種別を付けたログ1行"""
+
+    time: float  # time.monotonic() による到着時刻
+    stream: int  # STDOUT / STDERR
+    text: str
+
+
+class StepTiming(NamedTuple):
+    """ステップ開始/終了マーカーの到着時刻から計測した実時間"""
+
+    job: str
+    step: str
+    seconds: float
+    failed: bool
+
+
+class ActStream:
+    """actの出力を1行ずつ逐次取り出すイテレータ
+
+    stdout/stderrそれぞれの読み取りスレッドが、到着時刻付きのLogRecordを
+    共有の上限付きキューに積むため、2つのストリームは到着順に並ぶ。
+    キューが満杯になると読み取りが止まるため、メモリ上に滞留する行数は一定に保たれる。
+    timeoutを超えるとactを停止し、それまでに届いた行は捨てずに最後まで返す。
+    with文で使うと、読み切る前に抜けた場合にactを停止する。
+    """
+
+    def __init__(
+        self,
+        process: subprocess.Popen[str] | None = None,
+        returncode: int | None = None,
+        lines: tuple[str, ...] = (),
+        max_buffered_lines: int = 1024,
+        timeout: float | None = None,
+    ) -> None:
+        self.process = process
+        self.returncode = returncode
+        self.timeout = timeout
+        self.terminated = False
+        self.timed_out = False
+        # (ジョブ, ステップ) ごとの実時間（同じステップが再び実行されたら後のもの）
+        self.step_timings: dict[tuple[str, str], StepTiming] = {}
+        self._step_starts: dict[str, tuple[str, float]] = {}
+        self._deadline = time.monotonic() + timeout if timeout else None
+        self._queue: queue.Queue[LogRecord | None] = queue.Queue(maxsize=max_buffered_lines)
+        self._open_readers = 0
+        self._finished = False  # 最後の行まで返し、actの終了を待った
+
+        if process is None:
+            # プロセスなし（起動前エラー等）: 固定の行だけを返す
+            self._pending = lines
+            return
+
+        self._pending = ()
+        for pipe, stream_id in ((process.stdout, STDOUT), (process.stderr, STDERR)):
+            if pipe is not None:
+                self._open_readers += 1
+                threading.Thread(target=self._read, args=(pipe, stream_id), daemon=True).start()
+
+    def _read(self, pipe: IO[str], stream_id: int) -> None:
+        """パイプから行を読み取ってキューに積む（読み取りスレッド）"""
+        try:
+            for line in iter(lambda: pipe.readline(MAX_LINE_CHARS), ""):
+                self._queue.put(LogRecord(time.monotonic(), stream_id, line.rstrip("\r\n")))
+        finally:
+            self._queue.put(None)
+
+    def terminate(self, force: bool = False) -> None:
+        """actとその子プロセスをまとめて停止（残りの出力はパイプが閉じるまで読み出せる）"""
+        if self.process is None or self.process.poll() is not None:
+            return
+
+        self.terminated = True
+        if os.name == "posix":
+            # stream_actは新しいセッションで起動するため、プロセスグループごと停止できる
+            os.killpg(self.process.pid, signal.SIGKILL if force else signal.SIGTERM)
+        else:
+            subprocess.run(  # nosec B603 B607  # Windowsでプロセスツリーを停止
+                ["taskkill", "/F", "/T", "/PID", str(self.process.pid)],
+                capture_output=True,
+                check=False,
+            )
+
+    def _next_record(self) -> LogRecord | None:
+        """次の行を取得（期限切れ時はactを停止し、猶予を過ぎても終わらなければ強制終了）"""
+        while self._open_readers:
+            remaining = (
+                None if self._deadline is None else max(self._deadline - time.monotonic(), 0)
+            )
+            try:
+                record = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                if self.timed_out:
+                    self.terminate(force=True)
+                    return None
+
+                self.timed_out = True
+                console.print(f"[red]エラー:[/red] タイムアウト（{self.timeout:g}秒）")
+                self.terminate()
+                self._deadline = time.monotonic() + TERMINATE_GRACE
+                continue
+
+            if record is not None:
+                return record
+            self._open_readers -= 1  # 片方のパイプが閉じた
+        return None
+
+    def _observe(self, record: LogRecord) -> None:
+        """ステップの開始/終了マーカーから実時間を計測"""
+        if "⭐" in record.text and (match := STEP_START_PATTERN.search(record.text)):
+            self._step_starts[match.group(1)] = (match.group(2).strip(), record.time)
+        elif ("✅" in record.text or "❌" in record.text) and (
+            match := STEP_END_PATTERN.search(record.text)
+        ):
+            if started := self._step_starts.pop(match.group(1), None):
+                step, start = started
+                failed = match.group(2) == "❌"
+                self.step_timings[(match.group(1), step)] = StepTiming(
+                    match.group(1), step, record.time - start, failed
+                )
+
+    def step_seconds(self, job: str, step: str) -> float | None:
+        """指定ジョブのステップの実時間（秒）（終了マーカーが届いていなければNone）"""
+        timing = self.step_timings.get((job, step))
+        return None if timing is None else timing.seconds
+
+    def records(self) -> Iterator[LogRecord]:
+        """stdout/stderrを到着順に並べたLogRecordを逐次返す"""
+        for line in self._pending:
+            yield LogRecord(time.monotonic(), STDOUT, line)
+        if self.process is None:
+            self._finished = True
+            return
+
+        while (record := self._next_record()) is not None:
+            self._observe(record)
+            yield record
+
+        returncode = self.process.wait()
+        self.returncode = TIMEOUT_EXIT_CODE if self.timed_out else returncode
+        self._finished = True
+
+    def __iter__(self) -> Iterator[str]:
+        for record in self.records():
+            yield record.text
+
+    def __enter__(self) -> "ActStream":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        # 読み切る前に抜けた場合（解析中の例外等）も、actを実行したまま残さない
+        if not self._finished:
+            self.terminate()
+
 
 class ActRunner:
     """actコマンドの実行とログキャプチャ"""
@@ -22,16 +209,12 @@ class ActRunner:
         workflows = list(self.workflow_dir.glob("*.yml")) + list(self.workflow_dir.glob("*.yaml"))
         return [w.name for w in workflows]
 
-    def run_act(self, workflow: str | None = None, job: str | None = None) -> tuple[str, int]:
+    def build_command(self, workflow: str | None = None, job: str | None = None) -> list[str]:
         """
-        actコマンドを実行してログをキャプチャ
+        actコマンドの引数リストを組み立てる
 
-        Args:
-            workflow: ワークフローファイル名（例: ci.yml）
-            job: 実行するジョブ名（省略時は全ジョブ）
-
-        Returns:
-            (出力ログ, 終了コード)
+        Raises:
+            ValueError: ワークフロー名が不正な場合
         """
         cmd = ["act"]
 
@@ -45,34 +228,83 @@ class ActRunner:
                 or "\\" in workflow
                 or workflow_basename in {".", ".."}
             ):
-                error_msg = (
+                raise ValueError(
                     "エラー: ワークフロー名にパス区切り文字や相対パス ('.', '..') は使用できません"
                 )
-                console.print(f"[red]{error_msg}[/red]")
-                return error_msg, 1
             cmd.extend(["-W", str(self.workflow_dir / workflow_basename)])
 
         if job:
             cmd.extend(["-j", job])
 
+        return cmd
+
+    def run_act(
+        self,
+        workflow: str | None = None,
+        job: str | None = None,
+        timeout: float | None = DEFAULT_TIMEOUT,
+    ) -> tuple[str, int]:
+        """
+        actコマンドを実行してログをキャプチャ
+
+        Args:
+            workflow: ワークフローファイル名（例: ci.yml）
+            job: 実行するジョブ名（省略時は全ジョブ）
+            timeout: タイムアウト（秒、Noneまたは0で無制限）
+
+        Returns:
+            (出力ログ, 終了コード)
+        """
+        # stdout/stderrを到着順に並べて連結する（別々に取得して連結すると順序が崩れる）
+        stream = self.stream_act(workflow, job, timeout=timeout)
+        log = "\n".join(stream)
+        return log, stream.returncode if stream.returncode is not None else 1
+
+    def stream_act(
+        self,
+        workflow: str | None = None,
+        job: str | None = None,
+        timeout: float | None = DEFAULT_TIMEOUT,
+    ) -> ActStream:
+        """
+        actコマンドを起動し、出力を行単位で逐次返すストリームを取得
+
+        stdoutとstderrは到着順に1本のストリームにまとめる（records()で到着時刻と種別も取得可能）。
+        終了コードはストリームを最後まで読み切った後に ``returncode`` で参照できる。
+
+        Args:
+            workflow: ワークフローファイル名（例: ci.yml）
+            job: 実行するジョブ名（省略時は全ジョブ）
+            timeout: タイムアウト（秒、Noneまたは0で無制限）
+
+        Returns:
+            出力行のストリーム
+        """
+        try:
+            cmd = self.build_command(workflow, job)
+        except ValueError as e:
+            error_msg = str(e)
+            console.print(f"[red]{error_msg}[/red]")
+            return ActStream(returncode=1, lines=(error_msg,))
+
         console.print(f"[cyan]実行中:[/cyan] {' '.join(cmd)}")
 
         try:
-            result = subprocess.run(  # nosec B603  # ユーザー指定のact実行
+            process = subprocess.Popen(  # nosec B603  # ユーザー指定のact実行
                 cmd,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 text=True,
-                timeout=300,  # 5分タイムアウト
+                encoding="utf-8",
+                errors="replace",
+                # fail-fast時にact配下のプロセスツリーごと停止できるよう独立したグループで起動
+                start_new_session=os.name == "posix",
             )
-            return result.stdout + result.stderr, result.returncode
-
-        except subprocess.TimeoutExpired:
-            console.print("[red]エラー:[/red] タイムアウト（5分）")
-            return "", 124  # タイムアウト終了コード
-
         except FileNotFoundError:
             console.print(
                 "[red]エラー:[/red] actコマンドが見つかりません。"
                 "インストールしてください: https://github.com/nektos/act"
             )
-            return "", 127  # コマンド not found
+            return ActStream(returncode=127)  # コマンド not found
+
+        return ActStream(process, timeout=timeout)
@@ -0,0 +1,263 @@
+"""ログを1パスで走査して失敗情報の各フィールドを集める状態機械"""
+
+import re
+
+from act_lens.ansi import strip_ansi
+from act_lens.classifier import Classifier, find_lines
+from act_lens.extractors import EXTRACTORS, Locator, build_locator
+from act_lens.guard import PatternGuard, clamp, compile_pattern
+from act_lens.sources import workspace_path
+
+# actのステップ開始/終了マーカー（例: "[CI/test] ⭐ Run Main pytest" / "[CI/test]   ✅  Success - ..."）
+STEP_START_PATTERN = compile_pattern(r"\[([^\]]+)\]\s+⭐\s+Run\s+(.+)")
+STEP_END_PATTERN = compile_pattern(r"\[([^\]]+)\]\s+(✅|❌)")
+
+# ワークフロー名（例: "[CI/test] ..." の "CI"）
+WORKFLOW_PATTERN = compile_pattern(r"\[([^/\]]+)/")
+
+# ジョブ名とステップ（例: "[CI/test] ⭐ Run Main pytest"）
+JOB_STEP_PATTERN = compile_pattern(r"\[([^\]]+)\]\s+(.+)")
+
+# 実行時間: "[106.819485ms]" / "[9.988223336s]" / "[1m 30s]"
+DURATION_MS_PATTERN = compile_pattern(r"\[(\d+\.?\d*)(ms|milliseconds?)\]")
+DURATION_S_PATTERN = compile_pattern(r"\[(\d+\.?\d*)(s|seconds?)\]")
+DURATION_M_PATTERN = compile_pattern(r"\[(\d+)m\s*(\d+)s\]")
+
+# 実行時間の表記は必ずこれらで終わる（"...s]" / "...millisecond]" 等）
+DURATION_SUFFIXES = ("s]", "d]")
+
+# エラーメッセージとみなす行のキーワード
+MESSAGE_KEYWORDS = ("Error", "FAILED", "Failure", "❌")
+
+# ステップの開始/終了マーカーに含まれる文字
+STEP_MARKERS = ("⭐", "✅", "❌")
+
+# 保持するスタックトレースの最大行数（超えた分は先頭行を残して古い行から捨てる）
+MAX_TRACE_LINES = 200
+
+# スタックトレースの状態
+_TRACE_NONE, _TRACE_OPEN, _TRACE_DONE = 0, 1, 2
+
+
+class LogScanner:
+    """ログを行単位で受け取り、FailureInfoに必要な情報を1パスで集める
+
+    feed() には改行区切りの1行以上をまとめて渡せる。色付けのエスケープシーケンスと
+    \r による上書きは照合の前に除く（含まなければ文字列検索のコストだけで済む）。
+    まとめて渡された範囲では、
+    文字列検索で候補の行を絞ってから、その行にだけ正規表現を適用する。
+    最初の出現で確定するフィールド（ワークフロー名・発生箇所・スタックトレース）は
+    確定後に照合を省き、最後の出現を採るフィールド（メッセージ・ジョブ/ステップ・実行時間）は
+    範囲の末尾から逆向きに探して最初に見つかった行で上書きする。
+    正規表現は1行の先頭から guard.MAX_MATCH_CHARS 文字までに照合し、1回の照合が
+    予算を超えたパターンは guard で無効にする（以降照合しない）。パターンを無効にして
+    エラーを見落としても、❌で終わったステップはBUILD_FAILUREとして扱う。
+    """
+
+    def __init__(
+        self,
+        classifier: Classifier,
+        success_classifier: Classifier,
+        exit_failure_classifier: Classifier,
+        locator: Locator | None = None,
+        guard: PatternGuard | None = None,
+    ) -> None:
+        self._classifier = classifier
+        self._success_classifier = success_classifier
+        self._exit_failure_classifier = exit_failure_classifier
+        self._locator = locator or build_locator(EXTRACTORS)
+        self.guard = guard or PatternGuard()
+
+        self.error_rank: int | None = None
+        self.has_success = False
+        self.has_exit_failure = False
+        self.step_failed = False  # ❌ の終了マーカーがあった
+        self.workflow: str | None = None
+        self.message: str | None = None
+        self.file_path: str | None = None
+        self.line_number: int | None = None
+        self.trace_lines: list[str] = []
+        self.trace_omitted = 0  # MAX_TRACE_LINESを超えて捨てた行数
+        self.job = "unknown"
+        self.step = "unknown"
+        self.duration: float | None = None
+        self._trace_state = _TRACE_NONE
+        self._running: dict[str, str] = {}
+
+    def feed(self, text: str) -> None:
+        """
+        1行以上のログを取り込む
+
+        Args:
+            text: 改行区切りの行（行の途中で区切らないこと）
+        """
+        text = strip_ansi(text)
+        self._classify(text)
+
+        if self.workflow is None and (
+            match := _first_in_line(WORKFLOW_PATTERN, text, "[", self.guard)
+        ):
+            self.workflow = match.group(1)
+
+        if (message := _last_line_with(text, MESSAGE_KEYWORDS)) is not None:
+            self.message = message.strip()
+
+        if self.file_path is None and (location := self._locator.locate(text, self.guard)):
+            file_path, self.line_number = location
+            self.file_path = workspace_path(file_path)
+
+        if self._trace_state != _TRACE_DONE:
+            self._trace(text)
+
+        if match := _last_in_line(JOB_STEP_PATTERN, text, "[", self.guard):
+            self.job = match.group(1)
+            self.step = match.group(2).strip()
+
+        for start, end in find_lines(text, STEP_MARKERS):
+            self._step_marker(text[start : clamp(start, end)])
+
+        for start, end in reversed(find_lines(text, DURATION_SUFFIXES)):
+            if (duration := _parse_duration(text[start : clamp(start, end)])) is not None:
+                self.duration = duration
+                break
+
+    @property
+    def error_type(self) -> str | None:
+        """検出したエラータイプ（成功マークがありexit codeエラーがないUNKNOWNは除外）"""
+        if self.error_rank is None:
+            # パターンを無効にして見落としても、❌で終わったステップの失敗は落とさない
+            return "BUILD_FAILURE" if self.step_failed else None
+        error_type = self._classifier.labels[self.error_rank]
+        if error_type == "UNKNOWN" and self.has_success and not self.has_exit_failure:
+            return None
+        return error_type
+
+    @property
+    def stack_trace(self) -> str | None:
+        """スタックトレース（Tracebackから最初のエラー行まで）"""
+        if len(self.trace_lines) <= 1:
+            return None
+        if self.trace_omitted:
+            head, *rest = self.trace_lines
+            return "\n".join([head, f"  ...（{self.trace_omitted}行省略）", *rest])
+        return "\n".join(self.trace_lines)
+
+    @property
+    def running_step(self) -> tuple[str, str] | None:
+        """開始（⭐ Run）後に終了マーカー（✅/❌）が出ていない、最後に開始したステップ"""
+        if not self._running:
+            return None
+        job = next(reversed(self._running))
+        return job, self._running[job]
+
+    def _classify(self, text: str) -> None:
+        """エラー/成功パターンを照合（小文字化は1回だけ行う）"""
+        lowered = text.lower()
+        if self.error_rank != 0:
+            # 既に見つけた優先度より高いパターンだけを照合する
+            rank = self._classifier.rank(text, lowered, self.guard, self.error_rank)
+            if rank is not None:
+                self.error_rank = rank
+        if not self.has_success:
+            self.has_success = self._success_classifier.search(text, lowered, self.guard)
+        if not self.has_exit_failure:
+            self.has_exit_failure = self._exit_failure_classifier.search(text, lowered, self.guard)
+
+    def _trace(self, text: str) -> None:
+        """スタックトレースの行を集める（新しいTracebackが始まったら置き換える）"""
+        pos = 0
+        if self._trace_state == _TRACE_NONE:
+            start = text.find("Traceback")
+            if start == -1:
+                return
+            pos = text.rfind("\n", 0, start) + 1
+
+        # トレース中は1行ずつ追う（トレースは短いため、ここが全体のコストを左右しない）
+        for line in text[pos:].split("\n"):
+            if "Traceback" in line:
+                self._trace_state = _TRACE_OPEN
+                self.trace_lines = [line]
+                self.trace_omitted = 0
+            elif self._trace_state == _TRACE_OPEN:
+                self.trace_lines.append(line)
+                if len(self.trace_lines) > MAX_TRACE_LINES:
+                    del self.trace_lines[1]
+                    self.trace_omitted += 1
+                # エラー行（例: ValueError: ...）で終了
+                if line.strip() and not line.startswith(" ") and ":" in line:
+                    self._trace_state = _TRACE_DONE
+                    return
+
+    def _step_marker(self, line: str) -> None:
+        """ステップの開始/終了マーカーを追跡"""
+        if "⭐" in line and (match := self.guard.search(STEP_START_PATTERN, line, 0, len(line))):
+            self._running.pop(match.group(1), None)  # 最後に開始したジョブを末尾に置く
+            self._running[match.group(1)] = match.group(2).strip()
+        elif ("✅" in line or "❌" in line) and (
+            match := self.guard.search(STEP_END_PATTERN, line, 0, len(line))
+        ):
+            self._running.pop(match.group(1), None)
+            self.step_failed = self.step_failed or match.group(2) == "❌"
+
+
+def job_key(line: str) -> str | None:
+    """行頭の "[ワークフロー/ジョブ]" 接頭辞からジョブを特定（接頭辞がなければNone）"""
+    if not line.startswith("["):
+        return None
+    end = line.find("]")
+    key = line[1:end]
+    return key if end > 0 and "/" in key else None
+
+
+def _line_bounds(text: str, pos: int) -> tuple[int, int]:
+    """posを含む行の範囲"""
+    end = text.find("\n", pos)
+    return text.rfind("\n", 0, pos) + 1, len(text) if end == -1 else end
+
+
+def _first_in_line(
+    pattern: re.Pattern[str], text: str, needle: str, guard: PatternGuard
+) -> re.Match[str] | None:
+    """パターンにマッチする最初の行の、行内でのマッチ（needleを含む行だけを前から調べる）"""
+    pos = text.find(needle)
+    while pos != -1:
+        start, end = _line_bounds(text, pos)
+        if pos < clamp(start, end) and (
+            match := guard.search(pattern, text, start, clamp(start, end))
+        ):
+            return match
+        pos = text.find(needle, end)
+    return None
+
+
+def _last_in_line(
+    pattern: re.Pattern[str], text: str, needle: str, guard: PatternGuard
+) -> re.Match[str] | None:
+    """パターンにマッチする最後の行の、行内でのマッチ（needleを含む行だけを後ろから調べる）"""
+    end = len(text)
+    while (pos := text.rfind(needle, 0, end)) != -1:
+        start, line_end = _line_bounds(text, pos)
+        if match := guard.search(pattern, text, start, clamp(start, line_end)):
+            return match
+        end = start
+    return None
+
+
+def _last_line_with(text: str, needles: tuple[str, ...]) -> str | None:
+    """いずれかの文字列を含む最後の行"""
+    pos = max(text.rfind(needle) for needle in needles)
+    if pos == -1:
+        return None
+    start, end = _line_bounds(text, pos)
+    return text[start:end]
+
+
+def _parse_duration(line: str) -> float | None:
+    """1行から実行時間（秒）を抽出"""
+    if match := DURATION_MS_PATTERN.search(line):
+        return float(match.group(1)) / 1000.0
+    if match := DURATION_S_PATTERN.search(line):
+        return float(match.group(1))
+    if match := DURATION_M_PATTERN.search(line):
+        return float(int(match.group(1)) * 60 + int(match.group(2)))
+    return None
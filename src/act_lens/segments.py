@@ -0,0 +1,464 @@
+"""ジョブ/ステップ単位のログの区間分け"""
+
+import mmap
+import re
+from array import array
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from functools import lru_cache
+
+from act_lens.ansi import strip_ansi
+from act_lens.classifier import find_lines
+from act_lens.scanner import (
+    STEP_END_PATTERN,
+    STEP_MARKERS,
+    STEP_START_PATTERN,
+    LogScanner,
+    job_key,
+)
+
+# 行頭の "[ワークフロー/ジョブ]" 接頭辞の中身（scanner.job_key と同じ判定）
+# bytesのログにはエンコードしたパターンを使う（区切り文字はASCIIのため同じ意味になる）
+_JOB_KEY = r"[^\]\n/]*/[^\]\n]*"
+
+# 色付けされたログで接頭辞の前に付くエスケープシーケンス（例: "\x1b[34m[CI/test] \x1b[0m"）
+_PREFIX_ESCAPES = r"(?:\x1b\[[0-?]*[ -/]*[@-~])*"
+
+# STEP_MARKERSのbytes版
+STEP_MARKER_BYTES = tuple(marker.encode() for marker in STEP_MARKERS)
+
+# ステップマーカーの種別
+STEP_START, STEP_SUCCESS, STEP_FAILURE = 0, 1, 2
+
+# JobSegmentsがLogScannerにまとめて渡す行数
+FEED_BATCH_LINES = 4096
+
+
+def step_marker(line: str) -> tuple[int, str] | None:
+    """
+    ステップの開始/終了マーカーを判定
+
+    Returns:
+        (STEP_START / STEP_SUCCESS / STEP_FAILURE, 開始マーカーの場合はステップ名)
+    """
+    if "⭐" in line and (match := STEP_START_PATTERN.search(line)):
+        return STEP_START, match.group(2).strip()
+    if ("✅" in line or "❌" in line) and (match := STEP_END_PATTERN.search(line)):
+        return (STEP_FAILURE if match.group(2) == "❌" else STEP_SUCCESS), ""
+    return None
+
+
+class JobSegments:
+    """1ジョブ分のログをステップ単位の区間に分けて走査し、失敗した区間の結果だけを残す
+
+    区間はステップ（⭐ Run から ✅/❌ まで）と、ステップの間の行。❌で終わった最初の
+    ステップを失敗区間とし、なければ✅で終わっていない区間のうち最初にエラーを
+    検出したものを採る。区間の行はまとまるまで溜めてから走査するため、
+    短いステップが✅で終わった場合は走査そのものを省く。
+    """
+
+    def __init__(self, new_scanner: Callable[[], LogScanner]) -> None:
+        self._new_scanner = new_scanner
+        self._scanner: LogScanner | None = None
+        self._pending: list[str] = []
+        self._failed: tuple[LogScanner, str | None] | None = None
+        self._errored: tuple[LogScanner, str | None] | None = None
+        # 実行中（終了マーカーがまだ出ていない）のステップ名
+        self.running_step: str | None = None
+
+    def feed(self, text: str) -> None:
+        """現在の区間に1行以上を追加"""
+        if self._failed is not None:
+            return  # 失敗区間が確定したら以降の行は解析しない
+        self._pending.append(text)
+        if len(self._pending) >= FEED_BATCH_LINES:
+            self._flush()
+
+    def start_step(self, name: str, line: str) -> None:
+        """ステップ開始マーカー: それまでの区間を閉じ、新しいステップの区間を始める"""
+        self._close(failed=False, succeeded=False)
+        self.running_step = name
+        self.feed(line)
+
+    def end_step(self, failed: bool, line: str) -> None:
+        """ステップ終了マーカー: マーカー行を含めて現在の区間を閉じる"""
+        self.feed(line)
+        self._close(failed=failed, succeeded=not failed)
+        self.running_step = None
+
+    def result(self) -> tuple[LogScanner, str | None] | None:
+        """採用した区間の走査結果と、そのステップ名（ステップ外の区間はNone）"""
+        if self._failed is not None:
+            return self._failed
+        if self._errored is not None:
+            return self._errored
+        scanner = self._flush()
+        if scanner is not None and scanner.error_type:
+            return scanner, self.running_step
+        return None
+
+    def running(self) -> LogScanner | None:
+        """実行中のステップの区間の途中までの走査結果（エラーを検出したかによらない）"""
+        if self._failed is not None or self.running_step is None:
+            return None
+        return self._flush()
+
+    def _flush(self) -> LogScanner | None:
+        """溜めた行を現在の区間の走査に渡す"""
+        if self._pending:
+            if self._scanner is None:
+                self._scanner = self._new_scanner()
+            self._scanner.feed("\n".join(self._pending))
+            self._pending.clear()
+        return self._scanner
+
+    def _close(self, failed: bool, succeeded: bool) -> None:
+        if self._failed is not None:
+            return
+        if failed:
+            if (scanner := self._flush()) is not None:
+                self._failed = (scanner, self.running_step)
+                return
+        elif not succeeded and self._errored is None:
+            scanner = self._flush()
+            if scanner is not None and scanner.error_type:
+                self._errored = (scanner, self.running_step)
+        self._pending.clear()
+        self._scanner = None
+
+
+class JobRouter:
+    """行を "[ワークフロー/ジョブ]" の接頭辞でジョブごとのJobSegmentsに振り分ける
+
+    接頭辞のない行は直前のジョブに含める。extend() は何回に分けて呼んでもよく、
+    保持する状態はジョブごとのJobSegmentsだけなので、ログの長さによらず一定に収まる。
+    エスケープシーケンスで始まる行（色付けされた接頭辞）は正規化してから振り分ける。
+    """
+
+    def __init__(self, new_scanner: Callable[[], LogScanner]) -> None:
+        self._new_scanner = new_scanner
+        self.jobs: dict[str, JobSegments] = {}
+        self._recent: dict[str, None] = {}  # 出力が切り替わったジョブを末尾に置く
+        self._current = ""
+
+    def extend(self, lines: Iterable[str]) -> None:
+        """改行を含まない行を順に取り込む"""
+        jobs = self.jobs
+        current = self._current
+        state = jobs.get(current)
+        for line in lines:
+            if line.startswith("\x1b"):
+                line = strip_ansi(line)  # 色付けされた接頭辞は除いてから振り分ける
+            if line.startswith("[") and (key := job_key(line)):
+                if key != current:
+                    if state is not None:
+                        self._recent.pop(current, None)
+                        self._recent[current] = None
+                    current, state = key, jobs.get(key)
+                if state is None:
+                    state = jobs[key] = JobSegments(self._new_scanner)
+                if (marker := step_marker(line)) is not None:
+                    kind, name = marker
+                    if kind == STEP_START:
+                        state.start_step(name, line)
+                    else:
+                        state.end_step(kind == STEP_FAILURE, line)
+                    continue
+            elif state is None:
+                state = jobs[current] = JobSegments(self._new_scanner)
+            state.feed(line)
+        self._current = current
+
+    def running_step(self) -> tuple[str, str] | None:
+        """最後に出力のあったジョブを優先した、実行中の (ジョブ, ステップ)"""
+        order = [self._current, *(key for key in reversed(self._recent) if key != self._current)]
+        return next(
+            (
+                (key, step)
+                for key in order
+                if key in self.jobs and (step := self.jobs[key].running_step)
+            ),
+            None,
+        )
+
+
+class Segment:
+    """ジョブ内の1区間（ステップ、またはステップの間の行）"""
+
+    __slots__ = ("end", "job", "skip_first", "start", "status", "step")
+
+    def __init__(self, job: int, step: str | None, start: int, skip_first: bool = False) -> None:
+        self.job = job
+        self.step = step  # ⭐ Run で始まった区間のステップ名
+        self.status: int | None = None  # 終了マーカーの種別（STEP_SUCCESS / STEP_FAILURE）
+        self.start = start  # ジョブの行を探し始める位置（行頭）
+        self.end = start  # 探す範囲の終端
+        self.skip_first = skip_first  # 先頭の行（前の区間の終了マーカー）を含めない
+
+
+class LogIndex:
+    """ログ全体の構造インデックス
+
+    ジョブ（"[ワークフロー/ジョブ]" の接頭辞）ごとの最初の出現位置と、ステップの
+    開始/終了マーカー行の位置を、先頭からのオフセットとしてarrayに詰めて保持し、
+    そこからジョブごとの区間（segments）を求める。区間はオフセットの範囲だけを持ち、
+    その範囲にあるジョブの行（接頭辞のない継続行を含む）は pieces() で正規表現により
+    まとめて切り出す。保持する量はジョブとマーカーの数だけで、ログの行数によらない。
+    bytes / mmap から作った場合、オフセットはバイト単位で、デコードするのは
+    マーカー行と切り出した区間だけになる。色付けされたログの接頭辞の前のエスケープ
+    シーケンスは正規表現で読み飛ばし、マーカー行は正規化してから判定する。
+    """
+
+    def __init__(self, source: str | bytes | mmap.mmap) -> None:
+        self.length = len(source)
+        self.jobs: list[str] = []
+        self.job_starts = array("q")  # ジョブID順の最初の出現位置
+        self.marker_starts = array("q")
+        self.marker_ends = array("q")
+        self.marker_jobs = array("i")
+        self.marker_kinds = array("b")
+        self.step_names: list[str] = []  # マーカーごと（終了マーカーは ""）
+        self.segments: list[list[Segment]] = []  # ジョブID順
+        self._source = source
+        # 接頭辞の前のエスケープシーケンスは、ESCを含むログでだけ読み飛ばす（含まなければ速い方）
+        self._escapes = _PREFIX_ESCAPES if _has_escape(source) else ""
+        self._ids: dict[str, int] = {}
+
+    @classmethod
+    def build(cls, source: str | bytes | mmap.mmap) -> "LogIndex":
+        """
+        ログを走査してインデックスを作る
+
+        Args:
+            source: 文字列、またはUTF-8のバイト列（mmap等。bytesの正規表現で走査する）
+        """
+        index = cls(source)
+        index._index_jobs()
+        index._index_markers()
+        index._index_segments()
+        return index
+
+    @classmethod
+    def view(cls, source: str | bytes | mmap.mmap, jobs: Sequence[str]) -> "LogIndex":
+        """
+        build() で求めた区間を pieces() で切り出すための、ジョブ名だけを持つインデックス
+
+        別プロセスで同じファイルをmmapし、受け取った区間（Segment）を解析するのに使う。
+        """
+        index = cls(source)
+        index.jobs = list(jobs)
+        return index
+
+    def candidates(self, job: int) -> list[Segment]:
+        """
+        ジョブの失敗区間の候補（❌で終わった最初のステップ、なければ✅で終わっていない区間）
+        """
+        segments = self.segments[job]
+        failed = next((seg for seg in segments if seg.status == STEP_FAILURE), None)
+        return [failed] if failed else [seg for seg in segments if seg.status is None]
+
+    def running_step(self, job: int) -> str | None:
+        """ジョブで開始（⭐ Run）後に終了マーカーが出ていないステップ"""
+        last = self.segments[job][-1]
+        return last.step if last.status is None else None
+
+    def last_activity(self, job: int) -> int:
+        """ジョブの最後の行の終端（実行中のステップがあるジョブの順位付け用）"""
+        last = self.segments[job][-1]
+        return max((end for _, end in self._runs(last)), default=last.start)
+
+    def pieces(self, segment: Segment, limit: int) -> Iterator[str]:
+        """
+        区間にあるジョブの行を、1つあたり最大limit程度の改行区切りの文字列として切り出す
+
+        limitを超える行（改行のない長大な出力）はlimitごとに区切る。
+        """
+        for start, end in self._runs(segment):
+            while end - start > limit:
+                cut = self._rfind_newline(start, start + limit)
+                if cut <= start:
+                    yield self._text(start, start + limit)
+                    start += limit
+                else:
+                    yield self._text(start, cut)
+                    start = cut + 1
+            yield self._text(start, end)
+
+    def _runs(self, segment: Segment) -> Iterator[tuple[int, int]]:
+        """区間にあるジョブの行が連続する範囲（行末の改行は含まない）"""
+        key = self.jobs[segment.job]
+        if not key:
+            # ジョブ "" は最初の接頭辞付きの行より前の行だけ
+            yield segment.start, segment.end
+            return
+
+        skip_first = segment.skip_first
+        for start, end in self._run_spans(key, segment.start, segment.end):
+            if skip_first:
+                skip_first = False
+                newline = self._find_newline(start, end)
+                if newline == -1:
+                    continue
+                start = newline + 1
+            yield start, end
+
+    def _run_spans(self, key: str, pos: int, end: int) -> Iterator[tuple[int, int]]:
+        """
+        ジョブの行が連続する範囲を探す
+
+        パターンは直前の改行から始めて、正規表現エンジンが改行の文字列検索で
+        候補位置を絞れるようにする（行頭の ^ で探すより数倍速い）。
+        """
+        pattern = _run_pattern(key, self._escapes)
+        if pos == 0:
+            if first := self._match(pattern[2:], 0, end):  # 先頭の行は直前に改行がない
+                yield first
+                pos = first[1]
+        else:
+            pos -= 1
+        for start, stop in self._finditer(pattern, pos, end):
+            yield start + 1, stop
+
+    def _match(self, pattern: str, pos: int, end: int) -> tuple[int, int] | None:
+        if isinstance(self._source, str):
+            match = _compile(pattern).match(self._source, pos, end)
+        else:
+            match = _compile_bytes(pattern).match(self._source, pos, end)
+        return None if match is None else match.span()
+
+    def _finditer(self, pattern: str, pos: int, end: int) -> Iterator[tuple[int, int]]:
+        if isinstance(self._source, str):
+            matches = _compile(pattern).finditer(self._source, pos, end)
+        else:
+            matches = _compile_bytes(pattern).finditer(self._source, pos, end)
+        for match in matches:
+            yield match.span()
+
+    def _text(self, start: int, end: int) -> str:
+        if isinstance(self._source, str):
+            return self._source[start:end]
+        text = self._source[start:end].decode("utf-8", "replace")
+        # ファイル由来のCRLFは行末の "\r" を除く
+        return text.replace("\r\n", "\n").removesuffix("\r") if "\r" in text else text
+
+    def _find_newline(self, start: int, end: int) -> int:
+        if isinstance(self._source, str):
+            return self._source.find("\n", start, end)
+        return self._source.find(b"\n", start, end)
+
+    def _rfind_newline(self, start: int, end: int) -> int:
+        if isinstance(self._source, str):
+            return self._source.rfind("\n", start, end)
+        return self._source.rfind(b"\n", start, end)
+
+    def _search_new_job(self, pos: int) -> tuple[int, str] | None:
+        """pos以降で、まだ見つかっていないジョブの接頭辞を持つ最初の行（先頭の行は除く）"""
+        pattern = _new_job_pattern(tuple(key for key in self.jobs if key), self._escapes)
+        if isinstance(self._source, str):
+            match = _compile(pattern).search(self._source, pos)
+            return None if match is None else (match.start() + 1, match.group(1))
+        match = _compile_bytes(pattern).search(self._source, pos)
+        if match is None:
+            return None
+        return match.start() + 1, match.group(1).decode("utf-8", "replace")
+
+    def _add_job(self, key: str, start: int) -> None:
+        self._ids[key] = len(self.jobs)
+        self.jobs.append(key)
+        self.job_starts.append(start)
+
+    def _index_jobs(self) -> None:
+        """
+        ジョブを出現順に列挙（ログの先頭が接頭辞のない行ならジョブ "" を先頭に置く）
+
+        既知のジョブを否定先読みで除いた正規表現で次の新しいジョブを探すため、
+        ジョブ数回の検索で全体を1回なめるだけで済み、行ごとの処理は発生しない。
+        """
+        pattern = rf"{self._escapes}\[({_JOB_KEY})\]"  # 先頭の行は直前に改行がない
+        if isinstance(self._source, str):
+            first = _compile(pattern).match(self._source)
+            key = None if first is None else first.group(1)
+        else:
+            first = _compile_bytes(pattern).match(self._source)
+            key = None if first is None else first.group(1).decode("utf-8", "replace")
+        self._add_job("" if key is None else key, 0)
+
+        found = self._search_new_job(0)
+        while found is not None:
+            start, key = found
+            self._add_job(key, start)
+            found = self._search_new_job(start)
+
+    def _index_markers(self) -> None:
+        """マーカー文字を含む行のうち、接頭辞付きのステップ開始/終了マーカーを記録"""
+        if isinstance(self._source, str):
+            source = self._source
+            lines = (
+                (start, end, source[start:end]) for start, end in find_lines(source, STEP_MARKERS)
+            )
+        else:
+            buf = self._source
+            lines = (
+                (start, end, buf[start:end].decode("utf-8", "replace"))
+                for start, end in find_lines(buf, STEP_MARKER_BYTES)
+            )
+        for start, end, raw in lines:
+            line = strip_ansi(raw)
+            if (key := job_key(line)) is None or (marker := step_marker(line)) is None:
+                continue
+            self.marker_starts.append(start)
+            self.marker_ends.append(end)
+            self.marker_jobs.append(self._ids[key])
+            self.marker_kinds.append(marker[0])
+            self.step_names.append(marker[1])
+
+    def _index_segments(self) -> None:
+        """マーカーをジョブごとにたどり、区間の範囲を求める"""
+        current = [Segment(job, None, start) for job, start in enumerate(self.job_starts)]
+        self.segments = [[] for _ in self.jobs]
+        for marker, job in enumerate(self.marker_jobs):
+            segment = current[job]
+            start, end = self.marker_starts[marker], self.marker_ends[marker]
+            if self.marker_kinds[marker] == STEP_START:
+                segment.end = max(start - 1, segment.start)  # マーカー行の前の改行は含めない
+                current[job] = Segment(job, self.step_names[marker], start)
+            else:
+                segment.end = end
+                segment.status = self.marker_kinds[marker]
+                current[job] = Segment(job, None, start, skip_first=True)
+            self.segments[job].append(segment)
+
+        for job, segment in enumerate(current):
+            if not self.jobs[job]:
+                # ジョブ "" は最初の接頭辞付きの行の前の改行まで
+                segment.end = self.job_starts[1] - 1 if len(self.jobs) > 1 else self.length
+            else:
+                segment.end = self.length
+            self.segments[job].append(segment)
+
+
+@lru_cache(maxsize=256)
+def _compile(pattern: str) -> re.Pattern[str]:
+    return re.compile(pattern)
+
+
+@lru_cache(maxsize=256)
+def _compile_bytes(pattern: str) -> re.Pattern[bytes]:
+    return re.compile(pattern.encode())
+
+
+def _has_escape(source: str | bytes | mmap.mmap) -> bool:
+    if isinstance(source, str):
+        return "\x1b" in source
+    return source.find(b"\x1b") != -1
+
+
+def _new_job_pattern(known: tuple[str, ...], escapes: str) -> str:
+    """既知のジョブ以外の接頭辞を持つ行（直前の改行から）に一致するパターン"""
+    exclude = "".join(f"(?!{re.escape(key)}\\])" for key in known)
+    return rf"\n{escapes}\[{exclude}({_JOB_KEY})\]"
+
+
+def _run_pattern(key: str, escapes: str) -> str:
+    """ジョブの接頭辞付きの行と、それに続く接頭辞のない行・同じジョブの行（直前の改行から）"""
+    prefix = escapes + re.escape(f"[{key}]")
+    return rf"\n{prefix}[^\n]*(?:\n(?:{prefix}|(?!{escapes}\[{_JOB_KEY}\]))[^\n]*)*"
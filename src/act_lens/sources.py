@@ -0,0 +1,104 @@
+"""エラー発生箇所のソースコードの読み込み"""
+
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from pathlib import Path
+
+# actのコンテナ内のワークスペース（ホストのリポジトリのルートに対応する）
+CONTAINER_WORKSPACES = ("/github/workspace",)
+
+# 行インデックスの粒度（このバイト数のブロックごとに、ブロックより前の改行数を記録する）
+INDEX_BLOCK_BYTES = 64 * 1024
+
+# 行インデックスを保持するファイル数
+SOURCE_CACHE_SIZE = 64
+
+
+def workspace_path(path: str) -> str:
+    """コンテナ内のワークスペース以下のパスを、リポジトリのルートからの相対パスにする（それ以外はそのまま）"""
+    for workspace in CONTAINER_WORKSPACES:
+        if path.startswith(workspace + "/"):
+            return path[len(workspace) + 1 :]
+    return path
+
+
+def resolve_source(path: str, root: Path) -> Path | None:
+    """
+    ログ中のファイルパスをホストのファイルに対応付ける
+
+    コンテナ内のワークスペース以下のパスと相対パスはrootからのパスとして扱う。
+    root の外のファイル（ライブラリ等）は対象にしない。
+
+    Args:
+        path: ログ中のファイルパス
+        root: リポジトリのルート
+
+    Returns:
+        存在するファイルのパス（対応するファイルがなければNone）
+    """
+    try:
+        root = root.resolve()
+        candidate = (root / workspace_path(path)).resolve()
+        if candidate.is_relative_to(root) and candidate.is_file():
+            return candidate
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def read_lines(path: Path, first: int, last: int) -> list[str]:
+    """
+    ファイルのfirst〜last行目（1始まり、両端を含む）を読む
+
+    ファイルごとの行インデックス（パスと更新時刻をキーにLRUで保持）から読み始める
+    ブロックを求め、必要な範囲だけを読み込む。読めない場合は空のリスト。
+    """
+    skip, wanted = max(first, 1) - 1, last - max(first, 1) + 1
+    try:
+        stat = path.stat()
+        counts = _line_index(str(path), stat.st_mtime_ns, stat.st_size)
+        if wanted <= 0 or not counts:
+            return []
+        with path.open("rb") as f:
+            if skip:
+                # skip 個目の改行（読み始める行の直前）を含むブロックから読む
+                block = bisect_left(counts, skip) - 1
+                f.seek(block * INDEX_BLOCK_BYTES)
+                skip -= counts[block]
+            data = b""
+            while chunk := f.read(INDEX_BLOCK_BYTES):
+                data += chunk
+                if data.count(b"\n") >= skip + wanted:
+                    break
+            else:
+                data = data.removesuffix(b"\n")  # 末尾の改行の後ろは行ではない
+    except OSError:
+        return []
+    lines = data.split(b"\n")[skip : skip + wanted]
+    return [line.decode("utf-8", "replace").rstrip("\r") for line in lines]
+
+
+def modified_since(path: Path, mtime_ns: int) -> bool:
+    """
+    ファイルが mtime_ns（保存済みのログの更新時刻等）より後に更新されたか
+
+    更新されていれば、現在の内容はログに記録された時点の内容と異なりうる。
+    更新時刻を取得できない場合も真とする。
+    """
+    try:
+        return path.stat().st_mtime_ns > mtime_ns
+    except OSError:
+        return True
+
+
+@lru_cache(maxsize=SOURCE_CACHE_SIZE)
+def _line_index(path: str, mtime_ns: int, size: int) -> "array[int]":
+    """ブロックごとの、ブロックの先頭より前の改行数（更新時刻とサイズが変われば作り直す）"""
+    counts = array("q")
+    total = 0
+    with open(path, "rb") as f:
+        while block := f.read(INDEX_BLOCK_BYTES):
+            counts.append(total)
+            total += block.count(b"\n")
+    return counts
@@ -0,0 +1,124 @@
+"""actの生ログを圧縮ファイルへ退避するスプール"""
+
+import gzip
+import hashlib
+import re
+from collections import deque
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from pathlib import Path
+from types import TracebackType
+from typing import TextIO
+
+from act_lens.utils import ACT_LENS_DIR
+
+# メモリ上に残す直近の行数（デフォルト）
+DEFAULT_WINDOW = 200
+
+# .act-lens/ に残すスプールファイルの最大数（実行の開始時に古いものから削除）
+MAX_SPOOL_FILES = 20
+
+
+class LogSpool:
+    """actの生ログをgzipで追記保存し、メモリには直近の行だけを残す
+
+    巨大なログ全体をメモリに持たないため、詳細表示などの後段の処理は
+    read_lines() でスプールから必要な時に読み戻す。
+    """
+
+    def __init__(self, path: Path, window: int = DEFAULT_WINDOW) -> None:
+        self.path = path
+        self.tail: deque[str] = deque(maxlen=window)
+        self.line_count = 0
+        self.sha256 = hashlib.sha256()  # 生ログ全体のダイジェスト（結果キャッシュで利用）
+        # 速度優先の圧縮レベル（ログは圧縮率が高いため1でも十分小さくなる）
+        self._file: TextIO | None = gzip.open(path, "xt", encoding="utf-8", compresslevel=1)
+
+    @classmethod
+    def create(
+        cls, label: str, output_dir: Path = ACT_LENS_DIR, window: int = DEFAULT_WINDOW
+    ) -> "LogSpool":
+        """
+        レポートと同じディレクトリに新しいスプールファイルを作成
+
+        Args:
+            label: ファイル名に含める実行対象の名前（例: ci.yml）
+            output_dir: 保存先ディレクトリ
+            window: メモリ上に残す直近の行数
+        """
+        output_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        slug = re.sub(r"[^\w.-]+", "-", label).strip("-") or "act"
+        for n in range(1000):
+            suffix = f"_{n}" if n else ""
+            try:
+                return cls(output_dir / f"log_{timestamp}_{slug}{suffix}.log.gz", window)
+            except FileExistsError:
+                continue  # 並列実行で同名のファイルが作られた場合は連番を付ける
+        raise FileExistsError(f"スプールファイルを作成できません: {output_dir}")
+
+    def write(self, line: str) -> None:
+        """1行追記"""
+        if self._file is None:
+            raise ValueError("スプールは既に閉じられています")
+        self._file.write(line)
+        self._file.write("\n")
+        self.sha256.update(line.encode() + b"\n")
+        self.tail.append(line)
+        self.line_count += 1
+
+    def tee(self, lines: Iterable[str]) -> Iterator[str]:
+        """行をスプールに書き込みつつ、そのまま後段へ流す"""
+        for line in lines:
+            self.write(line)
+            yield line
+
+    def close(self) -> None:
+        """書き込みを完了する（以降は読み戻しのみ可能）"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def read_lines(self) -> Iterator[str]:
+        """スプールから全行を順に読み戻す（書き込み中の場合は先に閉じる）"""
+        self.close()
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                yield line.rstrip("\n")
+
+    def __enter__(self) -> "LogSpool":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+def prune_spools(output_dir: Path = ACT_LENS_DIR, reserve: int = 1) -> None:
+    """
+    古いスプールファイルを削除して、これから作成する分を含めた数を上限以内に保つ
+
+    実行の開始時に1回だけ呼ぶ（実行中に作成したスプールは --verbose の表示や
+    レポートの生ログのパスで後から読むため、同じ実行の中では削除しない）。
+    作成する数が上限を超える場合は、古いものを全て削除して上限を超えて残す。
+
+    Args:
+        output_dir: スプールの保存先ディレクトリ
+        reserve: これから作成するスプールの数
+    """
+    keep = max(MAX_SPOOL_FILES - reserve, 0)
+    spools = sorted(output_dir.glob("log_*.log.gz"), key=_mtime)
+    for path in spools[: max(len(spools) - keep, 0)]:
+        path.unlink(missing_ok=True)
+
+
+def _mtime(path: Path) -> float:
+    """更新時刻（並列実行中に削除された場合は0）"""
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return 0.0
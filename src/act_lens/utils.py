@@ -7,6 +7,9 @@ from rich.console import Console
 
 console = Console()
 
+# act-lensの作業ディレクトリ（レポート・キャッシュの保存先）
+ACT_LENS_DIR = Path(".act-lens")
+
 
 def copy_to_clipboard(text: str) -> bool:
     """
@@ -30,7 +33,7 @@ def copy_to_clipboard(text: str) -> bool:
         return False
 
 
-def save_report(content: str, output_dir: Path = Path(".act-lens")) -> Path:
+def save_report(content: str, output_dir: Path = ACT_LENS_DIR) -> Path:
     """
     レポートをファイルに保存
 
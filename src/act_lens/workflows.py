@@ -0,0 +1,420 @@
+"""`.github/workflows` のジョブ一覧インデックス
+
+`act -l` はDocker周りの初期化で数秒かかるため、ワークフローファイルを直接読んで
+ジョブ・matrix・needs・pathsフィルタを `.act-lens/` にキャッシュする。
+依存関係を増やさないよう、YAMLはワークフローで使われる範囲のサブセットのみ解釈する。
+解釈できない箇所があったファイルは WorkflowInfo.complete を False にし、ジョブ一覧が
+欠けている可能性があるものとして扱う（--job 等の検証には使わない）。
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, cast
+
+from pydantic import ValidationError
+
+from act_lens.models import JobInfo, PathFilter, WorkflowInfo
+from act_lens.utils import ACT_LENS_DIR
+
+INDEX_VERSION = 2
+
+# パスフィルタを持てるイベント
+PATH_FILTER_EVENTS = ("push", "pull_request", "pull_request_target")
+
+
+class _YamlReader:
+    """ブロック形式のマッピング/シーケンス、フロー形式、ブロックスカラー、アンカー/エイリアス
+    （&name / *name / <<: *name）を扱う簡易YAMLリーダー
+
+    解釈できない行を読み飛ばしたり、文書の途中で読み終えたりした場合は complete を False にする。
+    """
+
+    def __init__(self, text: str) -> None:
+        self.lines = text.expandtabs(2).splitlines()
+        self.pos = 0
+        self.anchors: dict[str, Any] = {}
+        self.complete = True
+
+    def read(self) -> Any:
+        """文書全体を読み込む"""
+        if (head := self._peek()) is None:
+            return None
+        value = self._block(head[0])
+        if self._peek() is not None:
+            self.complete = False  # インデントの崩れ等で、残りの行を読めなかった
+        return value
+
+    def _peek(self) -> tuple[int, str] | None:
+        """次の内容行の (インデント, コメントを除いた内容) を返す（位置は進めない）"""
+        while self.pos < len(self.lines):
+            raw = self.lines[self.pos]
+            content = _strip_comment(raw).rstrip()
+            if content.strip() and content.strip() not in {"---", "..."}:
+                return len(content) - len(content.lstrip(" ")), content.strip()
+            self.pos += 1
+        return None
+
+    def _block(self, indent: int) -> Any:
+        head = self._peek()
+        if head is not None and _is_seq_item(head[1]):
+            return self._sequence(indent)
+        return self._mapping(indent)
+
+    def _mapping(self, indent: int) -> dict[str, Any]:
+        result: dict[str, Any] = {}
+        merged: dict[str, Any] = {}
+        while (head := self._peek()) and head[0] == indent and not _is_seq_item(head[1]):
+            key, rest = _split_key(head[1])
+            self.pos += 1
+            if key is None:
+                self.complete = False  # マッピングとして解釈できない行は無視
+                continue
+            value = self._value(rest, indent)
+            if key == "<<":
+                # マージキー: 明示したキーを優先して、参照したマッピングのキーを取り込む
+                sources = cast(list[Any], value) if isinstance(value, list) else [value]
+                for source in sources:
+                    merged.update(_as_dict(source))
+            else:
+                result[key] = value
+        return {**merged, **result} if merged else result
+
+    def _sequence(self, indent: int) -> list[Any]:
+        items: list[Any] = []
+        while (head := self._peek()) and head[0] == indent and _is_seq_item(head[1]):
+            anchor, rest = _split_anchor(head[1][1:].lstrip(" "))
+            if rest and _split_key(rest)[0] is not None and rest[0] not in "[{\"'*":
+                # "- key: value" はその位置から始まるマッピングとして読む
+                column = indent + len(head[1]) - len(rest)
+                self.lines[self.pos] = " " * column + rest
+                value = self._mapping(column)
+            else:
+                self.pos += 1
+                value = self._value(rest, indent)
+            if anchor:
+                self.anchors[anchor] = value
+            items.append(value)
+        return items
+
+    def _value(self, rest: str, indent: int) -> Any:
+        anchor, rest = _split_anchor(rest)
+        value = self._node(rest, indent)
+        if anchor:
+            self.anchors[anchor] = value
+        return value
+
+    def _node(self, rest: str, indent: int) -> Any:
+        if rest.startswith("*"):
+            if rest[1:] not in self.anchors:
+                self.complete = False
+            return self.anchors.get(rest[1:])
+        if not rest:
+            head = self._peek()
+            if head and (head[0] > indent or (head[0] == indent and _is_seq_item(head[1]))):
+                return self._block(head[0])
+            return None
+        if rest[0] in "|>":
+            return self._block_scalar(indent, folded=rest[0] == ">")
+        if rest[0] in "[{":
+            # 複数行にまたがるフロー形式は括弧が閉じるまで連結する
+            while _bracket_depth(rest) > 0 and self.pos < len(self.lines):
+                rest += " " + _strip_comment(self.lines[self.pos]).strip()
+                self.pos += 1
+            return _FlowParser(rest).parse()
+        # 次の行以降に続く、インデントの深い行は複数行のスカラーの続き
+        while (head := self._peek()) and head[0] > indent:
+            rest += " " + head[1]
+            self.pos += 1
+        return _scalar(rest)
+
+    def _block_scalar(self, indent: int, folded: bool) -> str:
+        body: list[str] = []
+        while self.pos < len(self.lines):
+            raw = self.lines[self.pos]
+            if raw.strip() and len(raw) - len(raw.lstrip(" ")) <= indent:
+                break
+            body.append(raw.strip())
+            self.pos += 1
+        return (" " if folded else "\n").join(body).strip()
+
+
+class _FlowParser:
+    """フロー形式（[a, b] / {k: v}）の解析"""
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.pos = 0
+
+    def parse(self) -> Any:
+        self._skip_spaces()
+        if self.pos >= len(self.text):
+            return None
+        char = self.text[self.pos]
+        if char == "[":
+            return self._items("]")
+        if char == "{":
+            return dict(self._pairs())
+        return _scalar(self._token())
+
+    def _items(self, close: str) -> list[Any]:
+        items: list[Any] = []
+        self.pos += 1
+        while self._skip_spaces() and self.text[self.pos] != close:
+            start = self.pos
+            items.append(self.parse())
+            self._skip_separator()
+            self.pos += self.pos == start  # 解釈できない文字は読み飛ばす
+        self.pos += 1
+        return items
+
+    def _pairs(self) -> list[tuple[str, Any]]:
+        pairs: list[tuple[str, Any]] = []
+        self.pos += 1
+        while self._skip_spaces() and self.text[self.pos] != "}":
+            start = self.pos
+            key = str(_scalar(self._token(key=True)))
+            self._skip_spaces()
+            if self.pos < len(self.text) and self.text[self.pos] == ":":
+                self.pos += 1
+            pairs.append((key, self.parse()))
+            self._skip_separator()
+            self.pos += self.pos == start  # 解釈できない文字は読み飛ばす
+        self.pos += 1
+        return pairs
+
+    def _token(self, key: bool = False) -> str:
+        start = self.pos
+        if self.text[start] in "\"'":
+            quote = self.text[start]
+            self.pos = self.text.find(quote, start + 1) + 1 or len(self.text)
+            return self.text[start : self.pos]
+        stops = ",]}:" if key else ",]}"
+        while self.pos < len(self.text) and self.text[self.pos] not in stops:
+            self.pos += 1
+        return self.text[start : self.pos].strip()
+
+    def _skip_spaces(self) -> bool:
+        while self.pos < len(self.text) and self.text[self.pos] == " ":
+            self.pos += 1
+        return self.pos < len(self.text)
+
+    def _skip_separator(self) -> None:
+        self._skip_spaces()
+        if self.pos < len(self.text) and self.text[self.pos] == ",":
+            self.pos += 1
+
+
+def _strip_comment(line: str) -> str:
+    """引用符の外にある " #" 以降を取り除く"""
+    quote = ""
+    for i, char in enumerate(line):
+        if quote:
+            quote = "" if char == quote else quote
+        elif char in "\"'" and (i == 0 or line[i - 1] in " :[{,-"):
+            quote = char
+        elif char == "#" and (i == 0 or line[i - 1] == " "):
+            return line[:i]
+    return line
+
+
+def _split_anchor(content: str) -> tuple[str | None, str]:
+    """ "&name 値" を (アンカー名, 値) に分割（アンカーがなければ None）"""
+    if not content.startswith("&"):
+        return None, content
+    name, _, rest = content[1:].partition(" ")
+    return name, rest.strip()
+
+
+def _is_seq_item(content: str) -> bool:
+    return content == "-" or content.startswith("- ")
+
+
+def _split_key(content: str) -> tuple[str | None, str]:
+    """`key: value` 形式の行を (key, value) に分割（マッピングでなければ key=None）"""
+    if content[0] in "\"'":
+        end = content.find(content[0], 1)
+        if end > 0 and content[end + 1 : end + 2] == ":":
+            return content[1:end], content[end + 2 :].strip()
+        return None, content
+    index = content.find(": ")
+    if index < 0 and content.endswith(":"):
+        index = len(content) - 1
+    if index <= 0 or content[0] in "[{":
+        return None, content
+    return content[:index].strip(), content[index + 1 :].strip()
+
+
+def _bracket_depth(text: str) -> int:
+    return sum(text.count(c) for c in "[{") - sum(text.count(c) for c in "]}")
+
+
+def _scalar(text: str) -> str | None:
+    """スカラー値を文字列として返す（型変換はしない）"""
+    if text in {"", "~", "null"}:
+        return None
+    if len(text) >= 2 and text[0] == text[-1] == "'":
+        return text[1:-1].replace("''", "'")
+    if len(text) >= 2 and text[0] == text[-1] == '"':
+        return text[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+    return text
+
+
+def load_yaml(text: str) -> Any:
+    """ワークフローファイル（YAMLサブセット）を辞書・リスト・文字列に変換"""
+    return _YamlReader(text).read()
+
+
+def _as_dict(value: object) -> dict[str, Any]:
+    """マッピングならそのまま、それ以外は空の辞書を返す"""
+    return cast(dict[str, Any], value) if isinstance(value, dict) else {}
+
+
+def _as_list(value: object) -> list[str]:
+    """文字列またはリストを文字列リストに正規化"""
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(v) for v in cast(list[Any], value) if v is not None]
+    return [str(value)]
+
+
+def _parse_events(on: object) -> tuple[list[str], dict[str, PathFilter]]:
+    """`on:` からイベント一覧とパスフィルタを抽出"""
+    events = _as_dict(on)
+    if not isinstance(on, dict):
+        return _as_list(on), {}
+    filters: dict[str, PathFilter] = {}
+    for event in PATH_FILTER_EVENTS:
+        config = _as_dict(events.get(event))
+        if "paths" in config or "paths-ignore" in config:
+            filters[event] = PathFilter(
+                paths=_as_list(config["paths"]) if "paths" in config else None,
+                paths_ignore=_as_list(config["paths-ignore"]) if "paths-ignore" in config else None,
+            )
+    return list(events), filters
+
+
+def _parse_job(job_id: str, config: object) -> JobInfo:
+    """ジョブ定義からJobInfoを生成"""
+    job = _as_dict(config)
+    axes = _as_dict(_as_dict(job.get("strategy")).get("matrix"))
+    name = job.get("name")
+
+    return JobInfo(
+        id=job_id,
+        name=str(name) if name is not None else None,
+        needs=_as_list(job.get("needs")),
+        matrix={k: _as_list(v) for k, v in axes.items() if k not in {"include", "exclude"}},
+    )
+
+
+def parse_workflow(path: Path, data: bytes, mtime_ns: int) -> WorkflowInfo:
+    """ワークフローファイルの内容をWorkflowInfoに変換"""
+    reader = _YamlReader(data.decode("utf-8", errors="replace"))
+    root = _as_dict(reader.read())
+    # PyYAML等と異なり "on" キーは文字列のまま残る
+    events, path_filters = _parse_events(root.get("on"))
+    name = root.get("name")
+
+    return WorkflowInfo(
+        file=path.name,
+        name=str(name) if name is not None else None,
+        mtime_ns=mtime_ns,
+        size=len(data),
+        sha256=hashlib.sha256(data).hexdigest(),
+        events=events,
+        path_filters=path_filters,
+        jobs=[_parse_job(job_id, job) for job_id, job in _as_dict(root.get("jobs")).items()],
+        complete=reader.complete,
+    )
+
+
+class WorkflowIndex:
+    """ワークフロー/ジョブ一覧の永続キャッシュ
+
+    ファイルの更新時刻とサイズが変わっていなければキャッシュをそのまま使い、
+    変わっていれば内容のハッシュを比較して、実際に変更されたファイルだけを再解析する。
+    """
+
+    def __init__(
+        self,
+        workflow_dir: Path = Path(".github/workflows"),
+        cache_path: Path = ACT_LENS_DIR / "workflows.json",
+    ) -> None:
+        self.workflow_dir = workflow_dir
+        self.cache_path = cache_path
+
+    def load(self) -> dict[str, WorkflowInfo]:
+        """
+        最新のインデックスを取得（変更があったファイルのみ再解析してキャッシュを更新）
+
+        Returns:
+            ワークフローファイル名 → WorkflowInfo
+        """
+        cached = self._read_cache()
+        if not self.workflow_dir.exists():
+            return {}
+
+        index: dict[str, WorkflowInfo] = {}
+        changed = False
+        files = sorted([*self.workflow_dir.glob("*.yml"), *self.workflow_dir.glob("*.yaml")])
+        for path in files:
+            stat = path.stat()
+            entry = cached.get(path.name)
+            if entry and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+                index[path.name] = entry
+                continue
+
+            data = path.read_bytes()
+            if entry and entry.sha256 == hashlib.sha256(data).hexdigest():
+                # 内容は同じ（touchされただけ）: 更新時刻だけ更新する
+                entry = entry.model_copy(update={"mtime_ns": stat.st_mtime_ns})
+            else:
+                entry = parse_workflow(path, data, stat.st_mtime_ns)
+            index[path.name] = entry
+            changed = True
+
+        if changed or index.keys() != cached.keys():
+            self._write_cache(index)
+        return index
+
+    def jobs(self, workflow: str | None = None) -> list[tuple[str, JobInfo]]:
+        """(ワークフローファイル名, ジョブ) の一覧を取得"""
+        return [
+            (name, job)
+            for name, info in self.load().items()
+            if workflow is None or name == workflow
+            for job in info.jobs
+        ]
+
+    def workflows_for_job(self, job_id: str) -> list[str]:
+        """指定したジョブIDを含むワークフローファイル名を取得"""
+        return [name for name, job in self.jobs() if job.id == job_id]
+
+    def _read_cache(self) -> dict[str, WorkflowInfo]:
+        """キャッシュを読み込む（壊れている・形式が古い場合は空として扱う）"""
+        try:
+            raw = json.loads(self.cache_path.read_text(encoding="utf-8"))
+            if raw.get("version") != INDEX_VERSION:
+                return {}
+            return {
+                name: WorkflowInfo.model_validate(entry)
+                for name, entry in raw.get("workflows", {}).items()
+            }
+        except (OSError, ValueError, AttributeError, ValidationError):
+            return {}
+
+    def _write_cache(self, index: dict[str, WorkflowInfo]) -> None:
+        """キャッシュを書き込む（書き込めない環境では何もしない）"""
+        payload = {
+            "version": INDEX_VERSION,
+            "workflows": {name: info.model_dump(mode="json") for name, info in index.items()},
+        }
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+            tmp_path.replace(self.cache_path)
+        except OSError:
+            pass
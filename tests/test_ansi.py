@@ -0,0 +1,148 @@
+"""ansi.pyのテスト"""
+
+from pathlib import Path
+
+import pytest
+
+from act_lens.ansi import AnsiStripper, strip_ansi
+from act_lens.parser import LogParser
+
+COLORED = "\n".join(
+    [
+        "[CI/test]   | \x1b[1m\x1b[31mFAILED\x1b[0m tests/test_app.py::test_add",
+        "[CI/test]   | \x1b]8;;https://example.com\x07link\x1b]8;;\x07 done",
+        "[CI/test]   | Downloading  10%\rDownloading  50%\rDownloading 100%",
+        "[CI/test]   | \x1b(B\x1b[mAssertionError\x1b[K: boom\r",
+    ]
+)
+
+EXPECTED = "\n".join(
+    [
+        "[CI/test]   | FAILED tests/test_app.py::test_add",
+        "[CI/test]   | link done",
+        "[CI/test]   | Downloading 100%",
+        "[CI/test]   | AssertionError: boom",
+    ]
+)
+
+
+class TestStripAnsi:
+    """strip_ansiのテスト"""
+
+    def test_strips_escapes_and_overwrites(self) -> None:
+        """SGR/OSC等のエスケープシーケンスを除き、\\r で上書きされた行は最後の内容を残す"""
+        assert strip_ansi(COLORED) == EXPECTED
+
+    def test_keeps_act_prefix_on_overwrite(self) -> None:
+        """\\r による上書きはactの行頭の接頭辞の後ろ（ツールの出力）だけに適用する"""
+        assert strip_ansi("[CI/a (3.11)]   | 1/3\r2/3\r3/3\n[CI/b] x\ry") == (
+            "[CI/a (3.11)]   | 3/3\ny"
+        )
+
+    def test_plain_text_unchanged(self) -> None:
+        """ESCと \\r を含まないテキストはそのまま返す"""
+        text = "[CI/test]   | plain\n\n"
+        assert strip_ansi(text) is text
+
+    @pytest.mark.parametrize(
+        ("text", "expected"),
+        [
+            ("a\r\nb\r\n", "a\nb\n"),
+            ("progress\r\r\n", "progress\n"),
+            ("old\rnew\r", "new"),
+            ("\x1b", ""),
+            ("\x1b]0;unterminated title\nnext", "\nnext"),
+        ],
+    )
+    def test_edge_cases(self, text: str, expected: str) -> None:
+        """CRLF・行末の \\r・単独のESC・終端のないOSCを処理する"""
+        assert strip_ansi(text) == expected
+
+
+class TestAnsiStripper:
+    """AnsiStripperのテスト"""
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 64])
+    def test_chunks_match_whole_text(self, size: int) -> None:
+        """どこで区切った断片でも、全体を正規化した結果と同じになる"""
+        stripper = AnsiStripper(1024)
+        chunks = [COLORED[i : i + size] for i in range(0, len(COLORED), size)]
+
+        out = "".join(stripper.feed(chunk) for chunk in chunks) + stripper.flush()
+        assert out == EXPECTED
+
+    def test_splits_long_pending_line(self) -> None:
+        """改行のない出力が上限を超えたら、その位置で行を区切る"""
+        stripper = AnsiStripper(8)
+
+        assert stripper.feed("\x1b[31m") == ""
+        assert stripper.feed("abcdef") == "abcdef\n"
+        assert stripper.flush() == ""
+
+
+class TestParserNormalization:
+    """LogParserでの正規化"""
+
+    def test_colored_output_is_classified(self) -> None:
+        """色付けされた出力でもエラーを検出し、メッセージやトレースに残さない"""
+        log = "\n".join(
+            [
+                "[CI/test] ⭐ Run Main pytest",
+                "[CI/test]   | \x1b[31mTraceback (most recent call last):\x1b[0m",
+                '[CI/test]   |   File "\x1b[36mtests/test_app.py\x1b[0m", line 3, in test',
+                "[CI/test]   | \x1b[1;31mValueError\x1b[0m\x1b[1m: bad\x1b[0m",
+                "[CI/test]   ❌  Failure - Main pytest [1s]",
+            ]
+        )
+        parser = LogParser()
+        by_text = parser.parse(log)
+        parser.feed(log)
+        by_feed = parser.finalize()
+
+        assert by_text is not None and by_feed is not None
+        assert (by_text.error_type, by_text.file_path) == ("VALUE", "tests/test_app.py")
+        assert by_text.stack_trace is not None
+        assert "\x1b" not in by_text.stack_trace
+        assert by_feed.model_dump(exclude={"timestamp"}) == by_text.model_dump(
+            exclude={"timestamp"}
+        )
+
+    def test_colored_prefixes_routed(self, tmp_path: Path) -> None:
+        """接頭辞が色付けされたログも、4つの入口で同じジョブ・ステップに振り分ける"""
+        test, lint = "\x1b[34m[CI/test] \x1b[0m", "\x1b[35m[CI/lint] \x1b[0m"
+        log = "\n".join(
+            [
+                f"{test}⭐ Run Main pytest",
+                f"{lint}⭐ Run Main ruff",
+                f"{test}  \x1b[34m|\x1b[0m \x1b[31mAssertionError\x1b[0m: expected 5",
+                f"{lint}  \x1b[35m|\x1b[0m All checks passed!",
+                f"{test}  ❌  Failure - Main pytest [1.5s]",
+                f"{lint}  ✅  Success - Main ruff [0.2s]",
+            ]
+        )
+        path = tmp_path / "act.log"
+        path.write_text(log, encoding="utf-8")
+        parser = LogParser()
+        parser.feed(log)
+        results = [
+            parser.finalize_all(),
+            parser.parse_all(log.split("\n")),
+            parser.parse_text(log),
+            parser.parse_file(path),
+        ]
+
+        for failures in results:
+            assert [(f.job, f.step, f.error_type) for f in failures] == [
+                ("CI/test", "Main pytest", "ASSERTION")
+            ]
+            assert failures[0].model_dump(exclude={"timestamp"}) == results[0][0].model_dump(
+                exclude={"timestamp"}
+            )
+
+    def test_detect_fatal_on_colored_line(self) -> None:
+        """fail-fastの判定も色付けされた行で行える"""
+        parser = LogParser()
+        marker = "\x1b[34m[CI/test]\x1b[0m   \x1b[31m❌  Failure - Main pytest\x1b[0m"
+        failed = "[CI/test]   | \x1b[31mFAILED\x1b[0m tests/test_a.py::test_x - assert 1 == 2"
+        assert parser.detect_fatal(marker) == "BUILD_FAILURE"
+        assert parser.detect_fatal(failed) == "ASSERTION"
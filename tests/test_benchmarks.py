@@ -0,0 +1,129 @@
+"""benchmarksのテスト（合成ログの生成と計測結果の比較）"""
+
+import re
+from pathlib import Path
+
+import pytest
+
+from act_lens.guard import PatternGuard
+from act_lens.parser import LogParser
+from benchmarks.ansi import make_log
+from benchmarks.classifier import config_patterns, measure, trigger_log
+from benchmarks.generator import LogSpec, failing_jobs, generate, job_names, write_log
+from benchmarks.run import compare
+
+
+class TestGenerator:
+    """合成ログの生成のテスト"""
+
+    @pytest.mark.parametrize(
+        ("failures", "position", "expected"),
+        [
+            (1, 1.0, ["CI/job-3"]),
+            (1, 0.0, ["CI/job-0"]),
+            (2, 0.5, ["CI/job-1", "CI/job-2"]),
+        ],
+    )
+    def test_parser_finds_generated_failures(
+        self, failures: int, position: float, expected: list[str]
+    ) -> None:
+        """指定した位置・数のジョブが失敗し、パーサーがその失敗を抽出する"""
+        spec = LogSpec(size=64 * 1024, failures=failures, failure_position=position)
+        assert failing_jobs(spec) == expected
+
+        result = LogParser().parse_text("\n".join(generate(spec)))
+        assert [(f.job, f.error_type, f.step) for f in result] == [
+            (job, "ASSERTION", "Main pytest") for job in expected
+        ]
+        assert result[0].stack_trace is not None
+        assert result[0].stack_trace.count('  File "') == spec.traceback_depth
+
+    def test_size_and_determinism(self, tmp_path: Path) -> None:
+        """目安のサイズのログを書き出し、同じ条件からは同じログを生成する"""
+        spec = LogSpec(size=256 * 1024, jobs=2, noise_ratio=1.0, seed=7)
+        size = write_log(spec, tmp_path / "a.log")
+
+        assert 256 * 1024 <= size < 256 * 1024 * 1.5
+        assert (tmp_path / "a.log").read_text(encoding="utf-8").splitlines() == list(generate(spec))
+        prefixes = tuple(f"[{job}]" for job in job_names(spec))
+        assert all(line.startswith(prefixes) for line in generate(spec))
+
+    def test_invalid_spec(self) -> None:
+        """不正な条件はValueError"""
+        with pytest.raises(ValueError, match="failures"):
+            list(generate(LogSpec(size=1024, jobs=2, failures=3)))
+        with pytest.raises(ValueError, match="noise_ratio"):
+            list(generate(LogSpec(size=1024, noise_ratio=1.5)))
+
+
+class TestAnsiLog:
+    """正規化のベンチマーク用のログのテスト"""
+
+    def test_colored_log_parses_like_plain(self) -> None:
+        """色付けしたログも、していないログと同じ失敗を抽出する"""
+        plain, colored = make_log(1, colored=False), make_log(1, colored=True)
+        assert "\x1b[" in colored
+
+        failures = [LogParser().parse_text(text) for text in (plain, colored)]
+        assert [[(f.job, f.step, f.error_type) for f in result] for result in failures] == [
+            [("CI/test", "Main pytest", "ASSERTION")]
+        ] * 2
+
+
+class TestTriggerLog:
+    """トリガーを含む行が大量にあるログのベンチマークのテスト"""
+
+    def test_failure_is_classified(self) -> None:
+        """トリガーを含む行に埋もれた AssertionError を判定する"""
+        failures = LogParser().parse_text(trigger_log(1_000))
+        assert [(f.step, f.error_type) for f in failures] == [("Main build", "ASSERTION")]
+
+    def test_rank_is_not_slower_than_sequential_search(self) -> None:
+        """分類器の判定は、全パターンを優先度順にログ全体へ re.search するより大きく遅くない"""
+        classifier, sequential = measure(20_000)
+        assert classifier < sequential * 3 + 0.01
+
+    def test_config_patterns_cost_string_search_only(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """設定ファイルで追加した80個のパターンは、ログになければ正規表現を照合しない"""
+        searched: list[str] = []
+        search = PatternGuard.search
+
+        def counting(
+            guard: PatternGuard, pattern: re.Pattern[str], text: str, pos: int, endpos: int
+        ) -> re.Match[str] | None:
+            searched.append(pattern.pattern)
+            return search(guard, pattern, text, pos, endpos)
+
+        monkeypatch.setattr(PatternGuard, "search", counting)
+        text = trigger_log(1_000)
+        counts: list[int] = []
+        for patterns in (0, 80):
+            searched.clear()
+            classifier = LogParser(patterns=config_patterns(patterns)).classifier
+            assert classifier.classify(text) == "ASSERTION"
+            counts.append(len(searched))
+        assert counts[0] == counts[1]
+
+    def test_config_patterns_do_not_slow_rank(self) -> None:
+        """80個のパターンを追加したログでも、パターンごとに re.search するより十分速い"""
+        classifier, sequential = measure(5_000, patterns=80, repeat=1)
+        assert classifier < sequential / 3
+
+
+class TestCompare:
+    """計測結果の比較のテスト"""
+
+    def test_reports_regressions_over_threshold(self) -> None:
+        """閾値を超えて遅くなった計測だけを返す（前回にない計測と短すぎる計測は除く）"""
+        previous = [
+            {"size": "1MB", "case": "parse", "seconds": 0.10},
+            {"size": "1MB", "case": "format", "seconds": 0.0001},
+            {"size": "1MB", "case": "parse_file", "seconds": 0.10},
+        ]
+        results = [
+            {"size": "1MB", "case": "parse", "seconds": 0.12},
+            {"size": "1MB", "case": "format", "seconds": 0.001},
+            {"size": "1MB", "case": "parse_file", "seconds": 0.105},
+            {"size": "10MB", "case": "parse", "seconds": 1.0},
+        ]
+        assert compare(results, previous, threshold=0.1) == ["1MB/parse"]
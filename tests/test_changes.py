@@ -0,0 +1,124 @@
+"""changes.pyのテスト"""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from act_lens.changes import affected_workflows, changed_files, is_triggered, tracked_content
+from act_lens.models import PathFilter, WorkflowInfo
+
+
+def _workflow(name: str, events: list[str], **filters: PathFilter) -> WorkflowInfo:
+    return WorkflowInfo(
+        file=name, mtime_ns=0, size=0, sha256="", events=events, path_filters=filters
+    )
+
+
+class TestIsTriggered:
+    """パスフィルタ判定のテスト"""
+
+    @pytest.mark.parametrize(
+        ("patterns", "path", "expected"),
+        [
+            (["src/**"], "src/act_lens/cli.py", True),
+            (["src/*"], "src/act_lens/cli.py", False),
+            (["*.md"], "README.md", True),
+            (["*.md"], "docs/design.md", False),
+            (["**.md"], "docs/design.md", True),
+            (["**/README.md"], "README.md", True),
+            (["**/README.md"], "docs/README.md", True),
+            (["src/**", "!src/**/*.md"], "src/notes.md", False),
+            (["src/**", "!src/**/*.md", "src/keep.md"], "src/keep.md", True),
+            (["file?.txt"], "file1.txt", True),
+        ],
+    )
+    def test_paths(self, patterns: list[str], path: str, expected: bool) -> None:
+        """pathsはいずれかの変更ファイルがマッチすれば発火"""
+        assert is_triggered(PathFilter(paths=patterns), [path]) is expected
+
+    def test_paths_ignore(self) -> None:
+        """paths-ignoreは全ての変更ファイルが無視対象なら発火しない"""
+        path_filter = PathFilter(paths_ignore=["docs/**", "*.md"])
+        assert not is_triggered(path_filter, ["docs/design.md", "README.md"])
+        assert is_triggered(path_filter, ["README.md", "src/act_lens/cli.py"])
+
+    def test_no_filter(self) -> None:
+        """フィルタなしは変更があれば発火"""
+        assert is_triggered(None, ["anything"])
+        assert not is_triggered(None, [])
+
+
+class TestAffectedWorkflows:
+    """影響を受けるワークフロー判定のテスト"""
+
+    def test_affected_workflows(self) -> None:
+        """pushで発火するワークフローのみを返す"""
+        workflows = {
+            "ci.yml": _workflow("ci.yml", ["push"], push=PathFilter(paths_ignore=["docs/**"])),
+            "docs.yml": _workflow("docs.yml", ["push"], push=PathFilter(paths=["docs/**"])),
+            "release.yml": _workflow("release.yml", ["workflow_dispatch"]),
+        }
+
+        assert affected_workflows(workflows, ["docs/design.md"]) == ["docs.yml"]
+        assert affected_workflows(workflows, ["src/cli.py"]) == ["ci.yml"]
+
+    def test_changed_workflow_file_is_always_affected(self) -> None:
+        """ワークフローファイル自体の変更はフィルタに関係なく対象"""
+        workflows = {
+            "docs.yml": _workflow("docs.yml", ["push"], push=PathFilter(paths=["docs/**"]))
+        }
+        assert affected_workflows(workflows, [".github/workflows/docs.yml"]) == ["docs.yml"]
+
+
+class TestChangedFiles:
+    """gitの変更ファイル取得のテスト"""
+
+    @pytest.fixture
+    def repo(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+        """コミット済みのファイルを1つ持つgitリポジトリ"""
+        monkeypatch.chdir(tmp_path)
+
+        def git(*args: str) -> None:
+            subprocess.run(["git", *args], check=True, capture_output=True)
+
+        git("init", "-q")
+        git("config", "user.email", "test@example.com")
+        git("config", "user.name", "test")
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "app.py").write_text("a = 1\n")
+        (tmp_path / "README.md").write_text("# readme\n")
+        git("add", ".")
+        git("commit", "-q", "-m", "init")
+        return tmp_path
+
+    def test_modified_and_untracked_files(self, repo: Path) -> None:
+        """変更ファイルと未追跡ファイルを返す"""
+        (repo / "src" / "app.py").write_text("a = 2\n")
+        (repo / "docs").mkdir()
+        (repo / "docs" / "new.md").write_text("new\n")
+
+        assert changed_files("HEAD") == ["docs/new.md", "src/app.py"]
+
+    def test_invalid_ref(self, repo: Path) -> None:
+        """存在しないrefはエラー"""
+        with pytest.raises(ValueError):
+            changed_files("no-such-ref")
+
+    def test_option_like_ref_is_rejected(self, repo: Path) -> None:
+        """オプションとして解釈されるrefは拒否"""
+        with pytest.raises(ValueError):
+            changed_files("--output=/tmp/x")
+
+    def test_tracked_content(self, repo: Path) -> None:
+        """追跡ファイルの内容ハッシュを返し、作業ツリーの変更を反映する"""
+        before = tracked_content()
+        assert sorted(before) == ["README.md", "src/app.py"]
+
+        (repo / "src" / "app.py").write_text("a = 2\n")
+        (repo / "untracked.txt").write_text("x\n")
+        after = tracked_content()
+
+        assert sorted(after) == ["README.md", "src/app.py"]
+        assert after["src/app.py"] != before["src/app.py"]
+        assert after["README.md"] == before["README.md"]
@@ -0,0 +1,123 @@
+"""classifier.pyのテスト"""
+
+import re
+
+from act_lens.classifier import Classifier, build_classifier
+from act_lens.parser import LogParser
+
+RULES = [
+    (r"AssertionError", "ASSERTION"),
+    (r"KeyError", "KEY"),
+    (r"Error: Process completed with exit code [1-9]", "BUILD_FAILURE"),
+    (r"Error:", "UNKNOWN"),
+]
+
+
+class TestClassifier:
+    """分類器のテスト"""
+
+    def test_highest_priority_wins(self) -> None:
+        """ログ中の出現順ではなく、パターンの優先度で判定する"""
+        classifier = Classifier(RULES)
+        text = "Error: something\nKeyError: 'x'\nAssertionError: boom"
+
+        assert classifier.classify(text) == "ASSERTION"
+        assert classifier.classify("Error: something\nKeyError: 'x'") == "KEY"
+
+    def test_same_position_prefers_higher_priority(self) -> None:
+        """同じ位置で複数のパターンがマッチする場合は優先度の高い方を選ぶ"""
+        classifier = Classifier(RULES)
+
+        assert classifier.classify("Error: Process completed with exit code 1") == "BUILD_FAILURE"
+
+    def test_no_match(self) -> None:
+        """どのパターンにもマッチしなければNone"""
+        assert Classifier(RULES).classify("all good") is None
+
+    def test_ignore_case_by_default(self) -> None:
+        """デフォルトでは大文字小文字を区別しない"""
+        assert Classifier(RULES).classify("assertionerror") == "ASSERTION"
+        assert Classifier(RULES, flags=re.NOFLAG).classify("assertionerror") is None
+
+    def test_triggers_limit_scanned_lines(self) -> None:
+        """トリガーを含む行だけを照合しても結果は同じ"""
+        classifier = Classifier(RULES, triggers=["ERROR"])
+        text = "ok\n  KeyError: 'x'\nok\nAssertionError\n"
+
+        assert classifier.classify(text) == "ASSERTION"
+        assert classifier.search(text)
+        assert not classifier.search("ok\nok\n")
+
+    def test_redundant_triggers_are_dropped(self) -> None:
+        """他のトリガーを含むトリガーは探さない（含まれる側で同じ行が見つかる）"""
+        classifier = Classifier(RULES, triggers=["Error", "error:", "KeyError", "timed out"])
+
+        assert classifier.triggers == ("error", "timed out")
+
+    def test_text_changing_length_when_lowercased(self) -> None:
+        """小文字化で長さが変わる文字を含む場合もテキスト全体を照合して判定する"""
+        classifier = Classifier(RULES, triggers=["error"])
+
+        assert classifier.classify("İstanbul\nKeyError: 'x'") == "KEY"
+
+    def test_limit_searches_only_higher_priorities(self) -> None:
+        """limit を渡すと、それより優先度の高いパターンだけを照合する"""
+        classifier = Classifier(RULES)
+        text = "Error: something\nKeyError: 'x'"
+
+        assert classifier.rank(text) == 1
+        assert classifier.rank(text, limit=2) == 1
+        assert classifier.rank(text, limit=1) is None
+        assert classifier.rank(text, limit=0) is None
+
+    def test_match_must_fit_in_one_line(self) -> None:
+        """行をまたぐマッチは採らず、マッチした行の中で照合し直す"""
+        classifier = Classifier([(r"Error:\s+boom", "BOOM")], triggers=["error"])
+
+        assert classifier.classify("Error:\nboom") is None
+        assert classifier.classify("Error:\nboom\nError:  boom") == "BOOM"
+
+    def test_rule_needles_come_from_pattern(self) -> None:
+        """パターンから求めた固定の文字列を含む行だけを、そのパターンで照合する"""
+        classifier = Classifier(RULES, triggers=["error"])
+
+        assert classifier.needles[0] == ("assertionerror",)
+        assert classifier.needles[1] == ("keyerror",)
+        assert classifier.rank("TypeError: x\nkeyerror") == 1
+
+    def test_build_classifier_is_cached(self) -> None:
+        """同じパターン表の分類器は使い回す"""
+        assert build_classifier(tuple(RULES)) is build_classifier(tuple(RULES))
+
+    def test_parser_triggers_cover_every_pattern(self) -> None:
+        """LogParserの全パターンのマッチ例がいずれかのトリガーを含む"""
+        samples = [
+            "AssertionError",
+            "TimeoutError",
+            "timed out",
+            "SyntaxError",
+            "ModuleNotFoundError",
+            "❌ Failure",
+            "Error: Process completed with exit code 2",
+            "Error:",
+        ]
+        for sample in samples:
+            assert any(t in sample.lower() for t in LogParser.ERROR_TRIGGERS), sample
+
+    def test_parser_triggers_cover_tool_patterns(self) -> None:
+        """ツール固有のパターンのマッチ例も、分類器のいずれかのトリガーを含む"""
+        triggers = LogParser().classifier.triggers
+        samples = [
+            "FAILED tests/test_a.py::test_x - assert 1 == 2",
+            "src/app.py:12: error: Incompatible types",
+            "Found 2 errors.",
+            "FAIL\texample.com/calc [build failed]",
+            "--- FAIL: TestAdd (0.00s)",
+            "error[E0308]: mismatched types",
+            "assertion `left == right` failed",
+            "test result: FAILED. 1 passed; 1 failed",
+            "Tests:       1 failed, 3 passed, 4 total",
+            "src/app.ts(10,5): error TS2322: Type 'string'",
+        ]
+        for sample in samples:
+            assert any(t in sample.lower() for t in triggers), sample
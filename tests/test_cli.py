@@ -0,0 +1,756 @@
+"""cli.pyのテスト"""
+
+import io
+import os
+import threading
+from collections.abc import Iterator
+from functools import partial
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from typer.testing import CliRunner
+
+from act_lens.cli import app
+from act_lens.guard import PatternGuard
+from act_lens.runner import ActStream, StepTiming
+from act_lens.spool import MAX_SPOOL_FILES
+
+cli_runner = CliRunner()
+
+FAILED_LOG = (
+    "[CI/test] ⭐ Run Main pytest",
+    "[CI/test]   | AssertionError: expected 5 but got 3",
+    "[CI/test]   ❌  Failure - Main pytest [1.5s]",
+)
+
+
+class _StoppableStream(ActStream):
+    """terminate() でプロセスを停止したときと同じ状態になるActStream"""
+
+    def __init__(self, returncode: int, lines: tuple[str, ...] = ()) -> None:
+        super().__init__(returncode=returncode, lines=lines)
+        self.started = threading.Event()
+        self.stopped = threading.Event()
+
+    def terminate(self, force: bool = False) -> None:
+        self.terminated = True
+        self.returncode = -15
+        self.stopped.set()
+
+
+class _BlockingStream(_StoppableStream):
+    """terminate() されるまで出力を返さないActStream"""
+
+    def __iter__(self) -> Iterator[str]:
+        self.started.set()
+        assert self.stopped.wait(10)
+        yield from ()
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cwd(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """リポジトリ自身の .github/workflows や .act-lens/ に触れないよう作業ディレクトリを隔離"""
+    monkeypatch.chdir(tmp_path)
+
+
+def _write_workflow(name: str, content: str) -> None:
+    workflow_dir = Path(".github/workflows")
+    workflow_dir.mkdir(parents=True, exist_ok=True)
+    (workflow_dir / name).write_text(content, encoding="utf-8")
+
+
+class TestCli:
+    """CLIのテスト"""
+
+    @patch("act_lens.cli.ActRunner.stream_act")
+    def test_success(self, mock_stream: MagicMock) -> None:
+        """actが成功した場合は成功メッセージを表示"""
+        mock_stream.return_value = ActStream(returncode=0, lines=("[CI/test] ✅ Success",))
+
+        result = cli_runner.invoke(app, [])
+
+        assert result.exit_code == 0
+        assert "成功 - エラーなし" in result.output
+
+    @patch("act_lens.cli.ActRunner.stream_act")
+    def test_failure_report_saved(self, mock_stream: MagicMock, tmp_path: Path) -> None:
+        """失敗時はレポートを保存する"""
+        mock_stream.return_value = ActStream(returncode=1, lines=FAILED_LOG)
+        output = tmp_path / "report.md"
+
+        result = cli_runner.invoke(app, ["--no-clipboard", "-o", str(output)])
+
+        assert result.exit_code == 0
+        report = output.read_text(encoding="utf-8")
+        assert "ASSERTION" in report
+        assert "**Raw log**: `" in report
+        assert len(list(Path(".act-lens").glob("log_*.log.gz"))) == 1
+
+    @patch("act_lens.cli.ActRunner.stream_act")
+    def test_verbose_reads_log_back_from_spool(
+        self, mock_stream: MagicMock, tmp_path: Path
+    ) -> None:
+        """--verboseでは失敗したジョブの生ログをスプールから読み戻して表示する"""
+        mock_stream.return_value = ActStream(returncode=1, lines=FAILED_LOG)
+
+        result = cli_runner.invoke(app, ["-v", "--no-clipboard", "-o", str(tmp_path / "r.md")])
+
+        assert result.exit_code == 0
+        assert "--- ログ ---" in result.output
+        assert "expected 5 but got 3" in result.output
+
+    @patch("act_lens.cli.ActRunner.stream_act")
+    def test_spools_of_current_run_kept(self, mock_stream: MagicMock, tmp_path: Path) -> None:
+        """対象が多くても、この実行で作成したスプールは削除せず --verbose で読み戻せる"""
+
+        def fake_stream(*_args: object, **_kwargs: object) -> ActStream:
+            return ActStream(returncode=1, lines=FAILED_LOG)
+
+        mock_stream.side_effect = fake_stream
+        jobs = [arg for i in range(MAX_SPOOL_FILES + 2) for arg in ("-j", f"job{i}")]
+
+        result = cli_runner.invoke(
+            app, [*jobs, "-v", "--no-clipboard", "-o", str(tmp_path / "r.md")]
+        )
+
+        assert result.exit_code == 0
+        assert result.output.count("--- ログ ---") == MAX_SPOOL_FILES + 2
+        assert len(list(Path(".act-lens").glob("log_*.log.gz"))) == MAX_SPOOL_FILES + 2
+
+    @patch("act_lens.cli.ActRunner.stream_act")
+    def test_verbose_collapses_repeated_lines(self, mock_stream: MagicMock, tmp_path: Path) -> None:
+        """--verboseの表示では進捗表示等の繰り返し行を1行に折り畳む"""
+        pulls = tuple(f"[CI/test]   | Downloading {n}%" for n in range(0, 101, 10))
+        mock_stream.return_value = ActStream(returncode=1, lines=pulls + FAILED_LOG)
+
+        result = cli_runner.invoke(app, ["-v", "--no-clipboard", "-o", str(tmp_path / "r.md")])
+
+        assert result.exit_code == 0
+        assert "Downloading 100%  (×11)" in result.output
+        assert "Downloading 50%" not in result.output
+
+    @patch("act_lens.cli.ActRunner.list_workflows")
+    @patch("act_lens.cli.ActRunner.stream_act")
+    def test_parallel_runs_every_workflow(
+        self, mock_stream: MagicMock, mock_list: MagicMock, tmp_path: Path
+    ) -> None:
+        """--parallel指定時は全ワークフローを並列実行し、失敗を1つのレポートにまとめる"""
+        mock_list.return_value = ["ci.yml", "lint.yml", "docs.yml"]
+
+        def fake_stream(workflow: str | None, job: str | None, timeout: float) -> ActStream:
+            if workflow == "docs.yml":
+                return ActStream(returncode=0, lines=("[Docs/build] ✅ Success",))
+            return ActStream(returncode=1, lines=FAILED_LOG)
+
+        mock_stream.side_effect = fake_stream
+        output = tmp_path / "report.md"
+
+        result = cli_runner.invoke(app, ["--parallel", "3", "--no-clipboard", "-o", str(output)])
+
+        assert result.exit_code == 0
+        assert mock_stream.call_count == 3
+        report = output.read_text(encoding="utf-8")
+        assert "(2 failures)" in report
+        assert "ci.yml" in report
+        assert "lint.yml" in report
+
+    @patch("act_lens.cli.ActRunner.stream_act")
+    def test_multiple_jobs(self, mock_stream: MagicMock, tmp_path: Path) -> None:
+        """--jobを複数指定するとジョブごとにactを実行する"""
+        mock_stream.return_value = ActStream(returncode=0, lines=())
+
+        result = cli_runner.invoke(app, ["-j", "lint", "-j", "test", "--parallel", "2"])
+
+        assert result.exit_code == 0
+        called_jobs = sorted(call.args[1] for call in mock_stream.call_args_list)
+        assert called_jobs == ["lint", "test"]
+
+    @patch("act_lens.cli.ActStream.terminate")
+    @patch("act_lens.cli.ActRunner.stream_act")
+    def test_fail_fast_terminates_act(
+        self, mock_stream: MagicMock, mock_terminate: MagicMock, tmp_path: Path
+    ) -> None:
+        """--fail-fast指定時は最初の失敗でactを停止し、それまでのログでレポートを作る"""
+        mock_stream.return_value = ActStream(returncode=1, lines=FAILED_LOG)
+        output = tmp_path / "report.md"
+
+        result = cli_runner.invoke(app, ["--fail-fast", "--no-clipboard", "-o", str(output)])
+
+        assert result.exit_code == 0
+        mock_terminate.assert_called_once()
+        assert "fail-fast" in result.output
+        assert "ASSERTION" in output.read_text(encoding="utf-8")
+
+    @patch("act_lens.cli.ActStream.terminate")
+    @patch("act_lens.cli.ActRunner.stream_act")
+    def test_fail_fast_stops_act_started_meanwhile(
+        self, mock_stream: MagicMock, mock_terminate: MagicMock
+    ) -> None:
+        """他の対象で失敗を検出した時点で起動中だったactも、ログを読む前に停止する"""
+        started, stopped = threading.Event(), threading.Event()
+
+        def fake_terminate(*_args: object) -> None:
+            stopped.set()
+
+        mock_terminate.side_effect = fake_terminate
+
+        def fake_stream(_workflow: str | None, job: str | None, **_: object) -> ActStream:
+            if job == "b":
+                started.set()
+                assert stopped.wait(10)
+                return ActStream(returncode=0, lines=())
+            assert started.wait(10)
+            return ActStream(returncode=1, lines=FAILED_LOG)
+
+        mock_stream.side_effect = fake_stream
+
+        result = cli_runner.invoke(
+            app,
+            ["--fail-fast", "-j", "a", "-j", "b", "--parallel", "2", "--no-clipboard"],
+        )
+
+        assert result.exit_code == 0
+        assert mock_terminate.call_count == 2
+
+    @patch("act_lens.cli.ActRunner.stream_act")
+    def test_fail_fast_stop_is_not_reported_as_exit_code(self, mock_stream: MagicMock) -> None:
+        """fail-fastで停止した実行は、停止時の終了コードではなくfail-fastでの停止として表示する"""
+        failing = _StoppableStream(1, FAILED_LOG)
+        stopped = _StoppableStream(0)
+
+        def fake_stream(_workflow: str | None, job: str | None, **_: object) -> ActStream:
+            if job == "b":
+                stopped.started.set()
+                assert failing.stopped.wait(10)
+                return stopped
+            assert stopped.started.wait(10)
+            return failing
+
+        mock_stream.side_effect = fake_stream
+
+        result = cli_runner.invoke(
+            app,
+            ["--fail-fast", "-j", "a", "-j", "b", "--parallel", "2", "--no-clipboard"],
+        )
+
+        assert result.exit_code == 0
+        assert stopped.stopped.is_set()
+        output = result.output.replace("\n", "")
+        assert "a: 失敗（fail-fastで停止）" in output
+        assert "b: 停止（fail-fast）" in output
+        assert "-15" not in output
+        assert "エラー情報を抽出できませんでした" not in output
+
+    @patch("act_lens.cli.LogSpool.create")
+    @patch("act_lens.cli.ActRunner.stream_act")
+    def test_error_after_start_terminates_act(
+        self, mock_stream: MagicMock, mock_spool: MagicMock
+    ) -> None:
+        """actの起動後にスプールの作成等で失敗しても、actを実行したまま残さない"""
+        stream = _StoppableStream(0, FAILED_LOG)
+        mock_stream.return_value = stream
+        mock_spool.side_effect = OSError("disk full")
+
+        result = cli_runner.invoke(app, ["--no-clipboard"])
+
+        assert isinstance(result.exception, OSError)
+        assert stream.stopped.is_set()
+
+    @patch("act_lens.cli.ActRunner.stream_act")
+    def test_interrupt_terminates_running_act(self, mock_stream: MagicMock) -> None:
+        """Ctrl-Cで中断したら、fail-fastでなくても実行中のactを停止してから終わる"""
+        running = _BlockingStream(0)
+
+        class Interrupted(_StoppableStream):
+            def __iter__(self) -> Iterator[str]:
+                # 他の対象のactの実行中に、端末からのCtrl-Cと同じ例外が主スレッドに届く
+                assert running.started.wait(10)
+                raise KeyboardInterrupt
+
+        def fake_stream(_workflow: str | None, job: str | None, **_: object) -> ActStream:
+            return running if job == "b" else Interrupted(1)
+
+        mock_stream.side_effect = fake_stream
+
+        result = cli_runner.invoke(app, ["-j", "a", "-j", "b", "--parallel", "2"])
+
+        assert result.exit_code == 130
+        assert running.stopped.is_set()
+        assert "中断" in result.output
+
+    @patch("act_lens.cli.ActRunner.stream_act")
+    def test_fail_fast_skips_pending_targets(self, mock_stream: MagicMock, tmp_path: Path) -> None:
+        """fail-fast発動後は未開始のジョブを実行しない"""
+        mock_stream.return_value = ActStream(returncode=1, lines=FAILED_LOG)
+
+        result = cli_runner.invoke(
+            app,
+            ["--fail-fast", "-j", "a", "-j", "b", "--no-clipboard", "-o", str(tmp_path / "r.md")],
+        )
+
+        assert result.exit_code == 0
+        assert mock_stream.call_count == 1
+        assert "スキップ" in result.output
+
+    @patch("act_lens.cli.ActRunner.stream_act")
+    def test_job_timeouts(self, mock_stream: MagicMock) -> None:
+        """--job-timeoutで指定したジョブのみタイムアウトを上書きする"""
+        mock_stream.return_value = ActStream(returncode=0, lines=())
+
+        result = cli_runner.invoke(
+            app,
+            [
+                "-j",
+                "unit",
+                "-j",
+                "integration",
+                "--timeout",
+                "60",
+                "--job-timeout",
+                "integration=900",
+            ],
+        )
+
+        assert result.exit_code == 0
+        timeouts = {call.args[1]: call.kwargs["timeout"] for call in mock_stream.call_args_list}
+        assert timeouts == {"unit": 60, "integration": 900}
+
+    @patch("act_lens.cli.ActRunner.stream_act")
+    def test_job_timeouts_unused_warned(self, mock_stream: MagicMock) -> None:
+        """実行対象のジョブにない --job-timeout は、使わないことを警告する"""
+        mock_stream.return_value = ActStream(returncode=0, lines=())
+
+        result = cli_runner.invoke(
+            app, ["-j", "unit", "--job-timeout", "unit=60", "--job-timeout", "integraton=900"]
+        )
+
+        assert result.exit_code == 0
+        assert "--job-timeout の integraton は" in result.output.replace("\n", "")
+        assert mock_stream.call_args.kwargs["timeout"] == 60
+
+    def test_job_timeouts_invalid(self) -> None:
+        """--job-timeoutの形式が不正な場合はエラー"""
+        result = cli_runner.invoke(app, ["--job-timeout", "integration"])
+        assert result.exit_code != 0
+
+    @patch("act_lens.cli.ActRunner.stream_act")
+    def test_duration_of_reported_step(self, mock_stream: MagicMock, tmp_path: Path) -> None:
+        """同じジョブで後のステップも失敗した場合も、レポートのステップの実時間を表示する"""
+        stream = ActStream(
+            returncode=1,
+            lines=(
+                *FAILED_LOG,
+                "[CI/test] ⭐ Run Post upload-report",
+                "[CI/test]   | Error: upload failed",
+                "[CI/test]   ❌  Failure - Post upload-report [0s]",
+            ),
+        )
+        stream.step_timings = {
+            ("CI/test", "Main pytest"): StepTiming("CI/test", "Main pytest", 3.0, True),
+            ("CI/test", "Post upload-report"): StepTiming(
+                "CI/test", "Post upload-report", 0.0, True
+            ),
+        }
+        mock_stream.return_value = stream
+        output = tmp_path / "report.md"
+
+        result = cli_runner.invoke(app, ["--no-clipboard", "-o", str(output)])
+
+        assert result.exit_code == 0
+        report = output.read_text(encoding="utf-8")
+        assert "CI/test → Main pytest" in report
+        assert "**Duration**: 3.0秒" in report
+
+    @patch("act_lens.cli.ActRunner.stream_act")
+    def test_timeout_report_shows_running_step(
+        self, mock_stream: MagicMock, tmp_path: Path
+    ) -> None:
+        """タイムアウト時は途中までのログから実行中ステップを示すTIMEOUTレポートを作る"""
+        stream = ActStream(
+            returncode=124,
+            lines=(
+                "[CI/integration] ✅  Success - Main Setup [2.1s]",
+                "[CI/integration] ⭐ Run Main Integration tests",
+                "[CI/integration]   | tests/test_api.py::test_slow ...",
+            ),
+        )
+        stream.timed_out = True
+        mock_stream.return_value = stream
+        output = tmp_path / "report.md"
+
+        result = cli_runner.invoke(app, ["--timeout", "5", "--no-clipboard", "-o", str(output)])
+
+        assert result.exit_code == 0
+        report = output.read_text(encoding="utf-8")
+        assert "`TIMEOUT`" in report
+        assert "CI/integration → Main Integration tests" in report
+
+    @patch("act_lens.cli.ActRunner.stream_act")
+    def test_timeout_report_without_classified_error(
+        self, mock_stream: MagicMock, tmp_path: Path
+    ) -> None:
+        """実行中のジョブにエラーがなくても、TIMEOUTレポートに途中までの出力の情報を含める"""
+        stream = ActStream(
+            returncode=124,
+            lines=(
+                "[CI/integration] ⭐ Run Main Integration tests",
+                "[CI/integration]   | Traceback (most recent call last):",
+                '[CI/integration]   |   File "tests/test_api.py", line 12, in test_slow',
+                "[CI/integration]   | retrying after HTTP Error 503",
+            ),
+        )
+        stream.timed_out = True
+        mock_stream.return_value = stream
+        output = tmp_path / "report.md"
+
+        result = cli_runner.invoke(app, ["--timeout", "5", "--no-clipboard", "-o", str(output)])
+
+        assert result.exit_code == 0
+        report = output.read_text(encoding="utf-8")
+        assert "`TIMEOUT`" in report
+        assert "tests/test_api.py:12" in report
+        assert "retrying after HTTP Error 503" in report
+        assert "unknown" not in report
+
+    @pytest.mark.parametrize(
+        "args", [["--timeout", "inf"], ["--timeout", "nan"], ["--job-timeout", "lint=inf"]]
+    )
+    @patch("act_lens.cli.ActRunner.stream_act")
+    def test_non_finite_timeout_rejected(self, mock_stream: MagicMock, args: list[str]) -> None:
+        """有限でないタイムアウトはactを起動する前にエラー"""
+        result = cli_runner.invoke(app, args)
+
+        assert result.exit_code != 0
+        mock_stream.assert_not_called()
+
+    @patch("act_lens.cli.ActRunner.stream_act")
+    def test_list_jobs_without_running_act(self, mock_stream: MagicMock) -> None:
+        """--listはインデックスからジョブ一覧を表示し、actを起動しない"""
+        _write_workflow(
+            "ci.yml", "on: push\njobs:\n  lint:\n    runs-on: x\n  test:\n    needs: lint\n"
+        )
+
+        result = cli_runner.invoke(app, ["--list"])
+
+        assert result.exit_code == 0
+        assert "lint" in result.output
+        assert "needs: lint" in result.output
+        mock_stream.assert_not_called()
+
+    @patch("act_lens.cli.ActRunner.stream_act")
+    def test_unknown_job_is_rejected(self, mock_stream: MagicMock) -> None:
+        """インデックスに存在しないジョブはactを起動する前にエラー"""
+        _write_workflow("ci.yml", "on: push\njobs:\n  lint:\n    runs-on: x\n")
+
+        result = cli_runner.invoke(app, ["-j", "tset"])
+
+        assert result.exit_code != 0
+        mock_stream.assert_not_called()
+
+    @patch("act_lens.cli.ActRunner.stream_act")
+    def test_partial_index_does_not_reject_job(self, mock_stream: MagicMock) -> None:
+        """解釈しきれなかったワークフローがあれば、ジョブの検証と絞り込みはactに任せる"""
+        _write_workflow("ci.yml", "on: push\njobs:\n  lint:\n    runs-on: x\n")
+        _write_workflow(
+            "odd.yml", "on: push\njobs:\n    build:\n      runs-on: x\n  test:\n    runs-on: x\n"
+        )
+        mock_stream.return_value = ActStream(returncode=0, lines=())
+
+        assert cli_runner.invoke(app, ["-j", "test"]).exit_code == 0
+        assert cli_runner.invoke(app, ["-j", "build"]).exit_code == 0
+        assert [c.args[:2] for c in mock_stream.call_args_list] == [(None, "test"), (None, "build")]
+        assert cli_runner.invoke(app, ["-w", "ci.yml", "-j", "test"]).exit_code != 0
+        listed = cli_runner.invoke(app, ["--list"]).output.replace("\n", "")
+        assert "odd.yml: 解釈できない箇所" in listed
+
+    @patch("act_lens.cli.ActRunner.stream_act")
+    def test_job_selects_its_workflow(self, mock_stream: MagicMock) -> None:
+        """ジョブを含むワークフローが1つなら -W で絞り込んで実行"""
+        _write_workflow("ci.yml", "on: push\njobs:\n  lint:\n    runs-on: x\n")
+        _write_workflow("docs.yml", "on: push\njobs:\n  build:\n    runs-on: x\n")
+        mock_stream.return_value = ActStream(returncode=0, lines=())
+
+        result = cli_runner.invoke(app, ["-j", "build"])
+
+        assert result.exit_code == 0
+        assert mock_stream.call_args.args[:2] == ("docs.yml", "build")
+
+    @patch("act_lens.cli.changed_files")
+    @patch("act_lens.cli.ActRunner.stream_act")
+    def test_changed_since_runs_only_affected_workflows(
+        self, mock_stream: MagicMock, mock_changed: MagicMock
+    ) -> None:
+        """--changed-sinceでは変更で発火するワークフローだけを実行する"""
+        _write_workflow(
+            "ci.yml",
+            "on:\n  push:\n    paths-ignore: ['docs/**']\njobs:\n  test:\n    runs-on: x\n",
+        )
+        _write_workflow(
+            "docs.yml", "on:\n  push:\n    paths: ['docs/**']\njobs:\n  build:\n    runs-on: x\n"
+        )
+        mock_changed.return_value = ["docs/index.md"]
+        mock_stream.return_value = ActStream(returncode=0, lines=())
+
+        result = cli_runner.invoke(app, ["--changed-since", "origin/main"])
+
+        assert result.exit_code == 0
+        mock_changed.assert_called_once_with("origin/main")
+        assert [call.args[0] for call in mock_stream.call_args_list] == ["docs.yml"]
+
+    @patch("act_lens.cli.changed_files")
+    @patch("act_lens.cli.ActRunner.stream_act")
+    def test_changed_since_limited_to_workflow(
+        self, mock_stream: MagicMock, mock_changed: MagicMock
+    ) -> None:
+        """--workflow を指定すると、発火するワークフローのうちそのワークフローだけを実行する"""
+        for name in ("ci.yml", "lint.yml"):
+            _write_workflow(name, "on: push\njobs:\n  test:\n    runs-on: x\n")
+        mock_changed.return_value = ["src/app.py"]
+        mock_stream.return_value = ActStream(returncode=0, lines=())
+
+        result = cli_runner.invoke(app, ["--changed-since", "HEAD", "-w", "lint.yml"])
+        assert result.exit_code == 0
+        assert [call.args[0] for call in mock_stream.call_args_list] == ["lint.yml"]
+
+        result = cli_runner.invoke(app, ["--changed-since", "HEAD", "-w", "missing.yml"])
+        assert result.exit_code != 0
+        assert mock_stream.call_count == 1
+
+    @patch("act_lens.cli.changed_files")
+    @patch("act_lens.cli.ActRunner.stream_act")
+    def test_changed_since_nothing_affected(
+        self, mock_stream: MagicMock, mock_changed: MagicMock
+    ) -> None:
+        """発火するワークフローがなければactを起動しない"""
+        _write_workflow(
+            "ci.yml", "on:\n  push:\n    paths: ['src/**']\njobs:\n  test:\n    runs-on: x\n"
+        )
+        mock_changed.return_value = ["README.md"]
+
+        result = cli_runner.invoke(app, ["--changed-since", "HEAD"])
+
+        assert result.exit_code == 0
+        assert "発火するワークフローはありません" in result.output
+        mock_stream.assert_not_called()
+
+    @patch("act_lens.cli.tracked_content")
+    @patch("act_lens.cli.ActRunner.stream_act")
+    def test_reuse_results_skips_act_when_unchanged(
+        self, mock_stream: MagicMock, mock_tracked: MagicMock, tmp_path: Path
+    ) -> None:
+        """--reuse-resultsでは入力が同じなら前回の成功を再利用し、失敗や入力の変更は再実行する"""
+        _write_workflow("ci.yml", "on: push\njobs:\n  test:\n    runs-on: x\n")
+        mock_tracked.return_value = {"src/app.py": "111"}
+        process = MagicMock()
+
+        def fake_stream(*_args: object, **_kwargs: object) -> ActStream:
+            process.stderr = io.StringIO("")
+            return ActStream(process)
+
+        mock_stream.side_effect = fake_stream
+        args = ["-w", "ci.yml", "--reuse-results", "--no-clipboard", "-o", str(tmp_path / "r.md")]
+
+        # 失敗は再利用せず、同じ入力でも実行し直す
+        process.wait.return_value = 1
+        for _ in range(2):
+            process.stdout = io.StringIO("\n".join(FAILED_LOG) + "\n")
+            failed = cli_runner.invoke(app, args)
+            assert failed.exit_code == 0
+            assert "前回の結果を再利用" not in failed.output
+        assert mock_stream.call_count == 2
+        assert "ASSERTION" in (tmp_path / "r.md").read_text(encoding="utf-8")
+
+        process.stdout = io.StringIO("")
+        process.wait.return_value = 0
+        first = cli_runner.invoke(app, args)
+        second = cli_runner.invoke(app, args)
+        assert mock_stream.call_count == 3
+        assert "成功 - エラーなし" in first.output
+        assert "前回の結果を再利用" in second.output
+        assert "成功 - エラーなし" in second.output
+
+        mock_tracked.return_value = {"src/app.py": "222"}
+        process.stdout = io.StringIO("")
+        cli_runner.invoke(app, args)
+        assert mock_stream.call_count == 4
+
+    @patch("act_lens.cli.ActRunner.stream_act")
+    def test_from_log_file(self, mock_stream: MagicMock, tmp_path: Path) -> None:
+        """--from-logでは保存済みのログを解析し、actは実行しない"""
+        log = tmp_path / "act.log"
+        log.write_text("\r\n".join(FAILED_LOG) + "\r\n", encoding="utf-8")
+        output = tmp_path / "report.md"
+
+        result = cli_runner.invoke(
+            app, ["--from-log", str(log), "--no-clipboard", "-o", str(output)]
+        )
+
+        assert result.exit_code == 0
+        mock_stream.assert_not_called()
+        report = output.read_text(encoding="utf-8")
+        assert "ASSERTION" in report
+        assert str(log.resolve()) in report
+
+    def test_from_log_source_modified_after_log(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """ログより後に更新されたソースファイルは前後の行を表示せず、警告する"""
+        monkeypatch.chdir(tmp_path)
+        source = tmp_path / "tests" / "test_app.py"
+        source.parent.mkdir()
+        source.write_text("".join(f"x = {n}\n" for n in range(1, 11)), encoding="utf-8")
+        log = tmp_path / "act.log"
+        log.write_text(
+            "\n".join(
+                [
+                    "[CI/test] ⭐ Run Main pytest",
+                    '[CI/test]   |   File "/github/workspace/tests/test_app.py", line 9, in test',
+                    "[CI/test]   | AssertionError: boom",
+                    "[CI/test]   ❌  Failure - Main pytest [1s]",
+                ]
+            ),
+            encoding="utf-8",
+        )
+        later = log.stat().st_mtime_ns + 10**9
+        os.utime(source, ns=(later, later))
+        output = tmp_path / "report.md"
+
+        result = cli_runner.invoke(
+            app, ["--from-log", str(log), "--no-clipboard", "-o", str(output)]
+        )
+
+        report = output.read_text(encoding="utf-8")
+        assert "`tests/test_app.py:9`" in report
+        assert "### Error Details" not in report
+        assert "前後の行を表示しません" in result.output.replace("\n", "")
+
+    @patch("act_lens.cli.ActRunner.stream_act")
+    def test_from_log_stdin(self, mock_stream: MagicMock, tmp_path: Path) -> None:
+        """'-' は標準入力から読み、詳細表示用にスプールへ退避する"""
+        output = tmp_path / "report.md"
+
+        result = cli_runner.invoke(
+            app,
+            ["--from-log", "-", "-v", "--no-clipboard", "-o", str(output)],
+            input="\n".join(FAILED_LOG) + "\n",
+        )
+
+        assert result.exit_code == 0
+        mock_stream.assert_not_called()
+        assert "expected 5 but got 3" in result.output
+        assert "ASSERTION" in output.read_text(encoding="utf-8")
+        assert len(list(Path(".act-lens").glob("log_*stdin*.log.gz"))) == 1
+
+    def test_from_log_multiple_files(self, tmp_path: Path) -> None:
+        """複数のログをまとめて解析し、失敗を1つのレポートにまとめる"""
+        failed = tmp_path / "failed.log"
+        failed.write_text("\n".join(FAILED_LOG), encoding="utf-8")
+        passed = tmp_path / "passed.log"
+        passed.write_text("[CI/test]   ✅  Success - Main pytest\n", encoding="utf-8")
+        output = tmp_path / "report.md"
+
+        result = cli_runner.invoke(
+            app,
+            ["--from-log", str(failed), "--from-log", str(passed), "-P", "2"]
+            + ["--no-clipboard", "-o", str(output)],
+        )
+
+        assert result.exit_code == 0
+        assert f"{passed}: 成功" in result.output.replace("\n", "")
+        assert "ASSERTION" in output.read_text(encoding="utf-8")
+
+    def test_config_patterns(self, tmp_path: Path) -> None:
+        """.act-lens.toml のパターンで解析する"""
+        Path(".act-lens.toml").write_text(
+            '[errors]\ntriggers = ["quota"]\n'
+            'patterns = [{ pattern = "QuotaExceeded", type = "QUOTA" }]\n',
+            encoding="utf-8",
+        )
+        log = tmp_path / "act.log"
+        log.write_text(
+            "\n".join([FAILED_LOG[0], "[CI/test]   | QuotaExceeded", FAILED_LOG[2]]),
+            encoding="utf-8",
+        )
+        output = tmp_path / "report.md"
+
+        result = cli_runner.invoke(
+            app, ["--from-log", str(log), "--no-clipboard", "-o", str(output)]
+        )
+
+        assert result.exit_code == 0
+        assert "QUOTA" in output.read_text(encoding="utf-8")
+        assert Path(".act-lens/patterns.json").exists()
+
+    def test_invalid_config(self, tmp_path: Path) -> None:
+        """.act-lens.toml のパターンが不正ならエラー"""
+        Path(".act-lens.toml").write_text(
+            '[errors]\npatterns = [{ pattern = "(a+)+", type = "X" }]\n', encoding="utf-8"
+        )
+        log = tmp_path / "act.log"
+        log.write_text("\n".join(FAILED_LOG), encoding="utf-8")
+
+        result = cli_runner.invoke(app, ["--from-log", str(log)])
+
+        assert result.exit_code != 0
+        assert "act-lens.toml" in result.output
+
+    def test_slow_pattern_warned(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """照合が予算を超えて無効にしたパターンは警告し、❌で終わったステップは報告する"""
+        monkeypatch.setattr("act_lens.parser.PatternGuard", partial(PatternGuard, budget=0.01))
+        Path(".act-lens.toml").write_text(
+            '[errors]\npatterns = [{ pattern = "error.*.*z", type = "SLOW" }]\n', encoding="utf-8"
+        )
+        log = tmp_path / "act.log"
+        log.write_text(
+            "\n".join([FAILED_LOG[0], "[CI/test]   | error " + "a" * 3000, FAILED_LOG[2]]),
+            encoding="utf-8",
+        )
+        output = tmp_path / "report.md"
+
+        result = cli_runner.invoke(
+            app, ["--from-log", str(log), "--no-clipboard", "-o", str(output)]
+        )
+
+        assert result.exit_code == 0
+        assert "以降照合しないパターン: error.*.*z" in result.output.replace("\n", "")
+        assert "BUILD_FAILURE" in output.read_text(encoding="utf-8")
+
+    @patch("act_lens.cli.LogParser.parse_file", return_value=[])
+    def test_from_log_workers(self, mock_parse_file: MagicMock, tmp_path: Path) -> None:
+        """--parallel の数を、指定されたログの数で分けて各ログのジョブの解析に使う"""
+        logs = [tmp_path / "a.log", tmp_path / "b.log"]
+        for log in logs:
+            log.write_text("\n".join(FAILED_LOG), encoding="utf-8")
+
+        cli_runner.invoke(app, ["--from-log", str(logs[0]), "-P", "4"])
+        cli_runner.invoke(app, ["--from-log", str(logs[0]), "--from-log", str(logs[1]), "-P", "4"])
+
+        assert [c.args[2] for c in mock_parse_file.call_args_list] == [4, 2, 2]
+
+    def test_from_log_missing_file(self, tmp_path: Path) -> None:
+        """存在しないログファイルはエラー"""
+        result = cli_runner.invoke(app, ["--from-log", str(tmp_path / "missing.log")])
+
+        assert result.exit_code != 0
+
+    @patch("act_lens.cli.ActRunner.stream_act")
+    def test_report_contains_every_failing_job(
+        self, mock_stream: MagicMock, tmp_path: Path
+    ) -> None:
+        """1回のactで複数のジョブが失敗した場合は全てをレポートに含める"""
+        lines = FAILED_LOG + (
+            "[CI/lint] ⭐ Run Main ruff",
+            "[CI/lint]   | Error: Process completed with exit code 1",
+            "[CI/lint]   ❌  Failure - Main ruff",
+        )
+        mock_stream.return_value = ActStream(returncode=1, lines=lines)
+        output = tmp_path / "report.md"
+
+        result = cli_runner.invoke(app, ["--no-clipboard", "-o", str(output)])
+
+        assert result.exit_code == 0
+        report = output.read_text(encoding="utf-8")
+        assert report.startswith("# 🔍 Act-Lens Failure Report (2 failures)")
+        assert "`ASSERTION` CI → CI/test" in report
+        assert "`BUILD_FAILURE`" in report
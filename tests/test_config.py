@@ -0,0 +1,226 @@
+"""config.pyのテスト"""
+
+import json
+import tomllib
+from pathlib import Path
+
+import pytest
+
+from act_lens.config import (
+    PatternConfig,
+    load_patterns,
+    merge_extractors,
+    merge_rules,
+    parse_config,
+)
+from act_lens.extractors import EXTRACTORS, Extractor
+from act_lens.parser import LogParser
+
+CONFIG = """
+[errors]
+triggers = ["quota"]
+patterns = [
+    { pattern = "QuotaExceeded", type = "QUOTA" },
+    { pattern = "Error: Process completed with exit code [1-9]", type = "BUILD_FAILURE" },
+]
+
+[success]
+triggers = ["build ok"]
+patterns = ["BUILD OK"]
+
+[[extractors]]
+name = "ilint"
+errors = [{ pattern = "ilint: .+ violation", type = "LINT" }]
+error_triggers = ["ilint:"]
+locations = ['(?P<file>[^\\s:]+\\.foo):(?P<line>\\d+)']
+extensions = ["foo"]
+"""
+
+# parse_config が拒否する (TOMLの内容, エラーメッセージ)
+INVALID_TABLES: list[tuple[dict[str, object], str]] = [
+    ({"error": {}}, "不明なキー: error"),
+    ({"errors": {"pattern": []}}, "不明なキー: errors.pattern"),
+    ({"errors": {"patterns": ["QuotaExceeded"]}}, r"errors.patterns\[0\]"),
+    ({"errors": {"patterns": [{"pattern": "x"}]}}, "pattern と type"),
+    ({"errors": {"patterns": [{"pattern": "(", "type": "Q"}]}}, "不正"),
+    ({"errors": {"patterns": [{"pattern": r"(\w+\s?)*x", "type": "Q"}]}}, "指数的"),
+    ({"success": {"patterns": "BUILD OK"}}, "リスト"),
+    ({"extractors": [{"errors": []}]}, r"extractors\[0\].name"),
+    ({"errors": {"patterns": [{"pattern": r"\d+", "type": "Q"}]}}, "トリガー"),
+    ({"success": {"patterns": ["(?:ok)?"]}}, r"success.patterns\[0\]: .*トリガー"),
+    (
+        {"extractors": [{"name": "x", "errors": [{"pattern": r"E\d+|\d", "type": "X"}]}]},
+        r"extractors\[0\].errors\[0\]",
+    ),
+    ({"extractors": [{"name": "x", "locations": [r"\.foo:\d+"]}]}, "extensions"),
+    (
+        {"extractors": [{"name": "x", "locations": [r"\.foo:\d+"], "extensions": ["foo"]}]},
+        "file / line",
+    ),
+]
+
+
+def _log(*lines: str) -> str:
+    return "\n".join(
+        [
+            "[CI/test] ⭐ Run Main build",
+            *(f"[CI/test]   | {line}" for line in lines),
+            "[CI/test]   ❌  Failure - Main build [1s]",
+        ]
+    )
+
+
+class TestLoadPatterns:
+    """load_patternsのテスト"""
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        """設定ファイルがなければ追加のパターンはない"""
+        assert load_patterns(tmp_path / ".act-lens.toml", tmp_path / "cache.json") == (
+            PatternConfig()
+        )
+        assert not (tmp_path / "cache.json").exists()
+
+    def test_load(self, tmp_path: Path) -> None:
+        """エラー・成功のパターンと抽出器を読み込む"""
+        path = tmp_path / ".act-lens.toml"
+        path.write_text(CONFIG, encoding="utf-8")
+
+        config = load_patterns(path, None)
+
+        assert config.errors[0] == ("QuotaExceeded", "QUOTA")
+        assert config.error_triggers == ("quota", "error: process completed with exit code ")
+        assert config.success == ("BUILD OK",)
+        assert config.extractors[0].name == "ilint"
+        assert config.extractors[0].extensions == ("foo",)
+
+    def test_cached_by_content(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """検証済みの内容は設定ファイルの内容をキーに保存し、同じ内容なら解釈を省く"""
+        path, cache = tmp_path / ".act-lens.toml", tmp_path / "cache.json"
+        path.write_text(CONFIG, encoding="utf-8")
+        config = load_patterns(path, cache)
+        assert json.loads(cache.read_text(encoding="utf-8"))["key"]
+
+        def fail(_: object) -> PatternConfig:
+            raise AssertionError("キャッシュがあれば解釈しない")
+
+        monkeypatch.setattr("act_lens.config.parse_config", fail)
+        assert load_patterns(path, cache) == config
+
+        path.write_text(CONFIG.replace("QUOTA", "QUOTA_EXCEEDED"), encoding="utf-8")
+        with pytest.raises(AssertionError):
+            load_patterns(path, cache)
+
+    def test_broken_cache_ignored(self, tmp_path: Path) -> None:
+        """壊れたキャッシュは無視して設定ファイルを解釈し直す"""
+        path, cache = tmp_path / ".act-lens.toml", tmp_path / "cache.json"
+        path.write_text(CONFIG, encoding="utf-8")
+        cache.write_text("{not json", encoding="utf-8")
+        assert load_patterns(path, cache).errors[0] == ("QuotaExceeded", "QUOTA")
+        assert load_patterns(path, cache).errors[0] == ("QuotaExceeded", "QUOTA")
+
+    def test_invalid_toml(self, tmp_path: Path) -> None:
+        """TOMLとして不正なファイルはValueError"""
+        path = tmp_path / ".act-lens.toml"
+        path.write_text("[errors\n", encoding="utf-8")
+        with pytest.raises(ValueError, match="解釈できません"):
+            load_patterns(path, None)
+
+
+class TestParseConfig:
+    """parse_configの検証のテスト"""
+
+    @pytest.mark.parametrize(("table", "message"), INVALID_TABLES)
+    def test_invalid(self, table: dict[str, object], message: str) -> None:
+        """未知のキー・型の誤り・不正なパターンは、場所を示してValueError"""
+        with pytest.raises(ValueError, match=message):
+            parse_config(table)
+
+    def test_triggers_added(self) -> None:
+        """どのトリガーも必ずは含まないパターンは、マッチに必ず含まれる文字列をトリガーに加える"""
+        config = parse_config(
+            {
+                "errors": {
+                    "triggers": ["quota"],
+                    "patterns": [
+                        {"pattern": "QuotaExceeded", "type": "QUOTA"},
+                        {"pattern": "Rate(?:Limited|Exceeded)", "type": "RATE"},
+                    ],
+                },
+                "success": {"patterns": ["BUILD OK"]},
+                "extractors": [{"name": "x", "errors": [{"pattern": "X(?:1|2)\\d", "type": "X"}]}],
+            }
+        )
+        assert config.error_triggers == ("quota", "limited", "exceeded")
+        assert config.success_triggers == ("build ok",)
+        assert config.extractors[0].error_triggers == ("x",)
+
+
+class TestMerge:
+    """merge_rules / merge_extractorsのテスト"""
+
+    def test_merge_rules(self) -> None:
+        """同じエラータイプは同じ位置で置き換え、新しいエラータイプは先頭に置く"""
+        base = [("AssertionError", "ASSERTION"), ("Error:", "UNKNOWN")]
+        merged = merge_rules(base, [("Oops", "UNKNOWN"), ("Quota", "QUOTA"), ("Ugh", "UNKNOWN")])
+        assert merged == (
+            ("Quota", "QUOTA"),
+            ("AssertionError", "ASSERTION"),
+            ("Oops", "UNKNOWN"),
+            ("Ugh", "UNKNOWN"),
+        )
+
+    def test_merge_extractors(self) -> None:
+        """同じ名前の抽出器は置き換え、新しい抽出器は前に置く"""
+        python = Extractor("python", locations=(r"(?P<file>x)(?P<line>1)",), extensions=("py",))
+        custom = Extractor("ilint")
+        merged = merge_extractors(EXTRACTORS, [python, custom])
+        assert merged[0] is custom
+        assert merged[1] is python
+        assert [ex.name for ex in merged[1:]] == [ex.name for ex in EXTRACTORS]
+
+
+class TestLogParserPatterns:
+    """設定したパターンでの解析のテスト"""
+
+    @pytest.fixture
+    def parser(self) -> LogParser:
+        return LogParser(patterns=parse_config(tomllib.loads(CONFIG)))
+
+    def test_custom_error_type_preferred(self, parser: LogParser) -> None:
+        """新しいエラータイプは組み込みのパターンより優先する"""
+        failure = parser.parse_text(_log("QuotaExceeded while uploading", "Error: upload failed"))
+        assert [f.error_type for f in failure] == ["QUOTA"]
+        assert LogParser().parse_text(_log("QuotaExceeded while uploading"))[0].error_type == (
+            "BUILD_FAILURE"
+        )
+
+    def test_extractor(self, parser: LogParser) -> None:
+        """追加した抽出器のエラータイプと発生箇所を使う"""
+        failure = parser.parse_text(_log("ilint: naming violation at lib/mod.foo:42"))[0]
+        assert failure.error_type == "LINT"
+        assert (failure.file_path, failure.line_number) == ("lib/mod.foo", 42)
+
+    def test_without_triggers(self) -> None:
+        """triggers を省いたパターンも、マッチに必ず含まれる文字列を含む行で照合する"""
+        parser = LogParser(
+            patterns=parse_config(
+                {
+                    "errors": {"patterns": [{"pattern": "QuotaExceeded", "type": "QUOTA"}]},
+                    "success": {"patterns": ["BUILD OK"]},
+                }
+            )
+        )
+        assert parser.parse_text(_log("QuotaExceeded while uploading"))[0].error_type == "QUOTA"
+        assert parser.parse("[CI/test]   | Error: retrying\n[CI/test]   | BUILD OK") is None
+
+    def test_named_group(self) -> None:
+        """名前付きグループを含むパターンも使える"""
+        table = {"errors": {"patterns": [{"pattern": "Quota(?P<kind>Exceeded)", "type": "QUOTA"}]}}
+        parser = LogParser(patterns=parse_config(table))
+        assert parser.parse_text(_log("QuotaExceeded while uploading"))[0].error_type == "QUOTA"
+
+    def test_success_pattern(self, parser: LogParser) -> None:
+        """追加した成功パターンはUNKNOWNのエラーを打ち消す"""
+        log = "[CI/test]   | Error: retrying\n[CI/test]   | BUILD OK"
+        assert parser.parse(log) is None
+        assert LogParser().parse(log) is not None
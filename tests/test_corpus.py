@@ -0,0 +1,119 @@
+"""ゴールデンコーパス（tests/corpus/）での解析結果のテスト"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from act_lens.models import FailureInfo
+from act_lens.parser import LogParser
+from benchmarks.scorecard import (
+    BASELINE_NAME,
+    CORPUS_DIR,
+    CorpusLog,
+    FieldScore,
+    load_corpus,
+    regressions,
+    run,
+    score,
+    summary,
+)
+
+CORPUS = load_corpus()
+
+
+def _fields(failures: list[FailureInfo]) -> list[dict[str, object]]:
+    return [failure.model_dump(exclude={"timestamp"}) for failure in failures]
+
+
+@pytest.fixture
+def parser(tmp_path: Path) -> LogParser:
+    # コーパスの指すソースファイルが存在しないルート（結果をソースの有無に依存させない）
+    return LogParser(source_root=tmp_path)
+
+
+class TestCorpus:
+    """コーパスのログの解析"""
+
+    @pytest.mark.parametrize("log", CORPUS, ids=lambda log: log.name)
+    def test_failing_jobs_detected(self, parser: LogParser, log: CorpusLog) -> None:
+        """失敗したジョブを過不足なく検出し、エラータイプが期待値と一致する"""
+        failures = parser.parse_text(log.path.read_text(encoding="utf-8"))
+
+        expected = {(fields["job"], fields["error_type"]) for fields in log.expected}
+        assert {(failure.job, failure.error_type) for failure in failures} == expected
+
+    @pytest.mark.parametrize("log", CORPUS, ids=lambda log: log.name)
+    def test_every_entry_point_agrees(self, parser: LogParser, log: CorpusLog) -> None:
+        """文字列・行・mmap・プッシュ型のどの入口からでも同じ結果になる"""
+        text = log.path.read_text(encoding="utf-8")
+        by_text = _fields(parser.parse_text(text))
+
+        assert _fields(parser.parse_all(text.splitlines())) == by_text
+        assert _fields(parser.parse_file(log.path)) == by_text
+        for start in range(0, len(text), 97):
+            parser.feed(text[start : start + 97])
+        assert _fields(parser.finalize_all()) == by_text
+
+    def test_accuracy_not_below_baseline(self, parser: LogParser) -> None:
+        """フィールドごとの適合率・再現率が、記録した下限を下回らない"""
+        totals, _ = run(parser, CORPUS, repeat=1)
+        baseline = json.loads((CORPUS_DIR / BASELINE_NAME).read_text(encoding="utf-8"))
+
+        assert regressions(summary(totals), baseline) == []
+
+    def test_message_change_below_baseline(self, parser: LogParser) -> None:
+        """エラーメッセージとして報告する行が変わると、messageが下限を下回る"""
+        baseline = json.loads((CORPUS_DIR / BASELINE_NAME).read_text(encoding="utf-8"))
+        totals: dict[str, FieldScore] = {}
+        for log in CORPUS:
+            failures = [
+                failure.model_copy(update={"message": "エラーメッセージが見つかりません"})
+                for failure in parser.parse_text(log.path.read_text(encoding="utf-8"))
+            ]
+            for field, field_score in score(log.expected, failures).items():
+                totals[field] = totals.get(field, FieldScore()).merge(field_score)
+
+        assert regressions(summary(totals), baseline) == ["message.precision", "message.recall"]
+
+
+class TestScore:
+    """期待値との比較のテスト"""
+
+    def test_counts_per_field(self) -> None:
+        """ジョブで対応付け、ワークスペースの違いとメッセージの前後の文字列は許容する"""
+        expected = [
+            {"job": "CI/a", "file_path": "src/app.py", "line_number": 3, "message": "boom"},
+            {"job": "CI/b", "file_path": None, "line_number": None, "message": "bad"},
+        ]
+        failures = [
+            FailureInfo(
+                workflow="CI",
+                job="CI/a",
+                step="s",
+                error_type="VALUE",
+                message="[CI/a]   | ValueError: boom",
+                file_path="/github/workspace/src/app.py",
+                line_number=4,
+                duration=None,
+                stack_trace=None,
+            ),
+            FailureInfo(
+                workflow="CI",
+                job="CI/c",
+                step="s",
+                error_type="VALUE",
+                message="x",
+                duration=None,
+                file_path=None,
+                line_number=None,
+                stack_trace=None,
+            ),
+        ]
+        scores = score(expected, failures)
+
+        assert scores["failures"] == (1, 1, 1)
+        assert scores["file_path"] == (1, 0, 0)
+        assert scores["line_number"] == (0, 1, 1)
+        assert scores["message"] == (1, 1, 1)
+        assert scores["job"].precision == 0.5
@@ -0,0 +1,158 @@
+"""extractors.pyのテスト"""
+
+import pytest
+
+from act_lens.extractors import EXTRACTORS, Extractor, Locator, error_rules, error_triggers
+from act_lens.parser import LogParser
+
+
+@pytest.fixture
+def locator() -> Locator:
+    return Locator(EXTRACTORS)
+
+
+class TestErrorRules:
+    """error_rules / error_triggersのテスト"""
+
+    def test_tool_rules_go_before_generic(self) -> None:
+        """ツール固有のパターンは汎用のエラータイプの直前に入る"""
+        base = [("AssertionError", "ASSERTION"), ("Error:", "UNKNOWN")]
+        tool = Extractor("tool", errors=(("--- FAIL", "ASSERTION"),), error_triggers=("FAIL",))
+
+        assert error_rules(base, [tool], ("UNKNOWN",)) == (
+            ("AssertionError", "ASSERTION"),
+            ("--- FAIL", "ASSERTION"),
+            ("Error:", "UNKNOWN"),
+        )
+        assert error_rules(base, [tool], ()) == (*base, ("--- FAIL", "ASSERTION"))
+
+    def test_triggers_are_deduplicated(self) -> None:
+        """トリガーは抽出器をまたいで重複を除く"""
+        assert error_triggers(
+            [Extractor("a", error_triggers=("x", "y")), Extractor("b", error_triggers=("y",))]
+        ) == ("x", "y")
+
+
+class TestLocator:
+    """Locatorのテスト"""
+
+    @pytest.mark.parametrize(
+        ("line", "expected"),
+        [
+            ('  File "tests/test_app.py", line 42, in test_add', ("tests/test_app.py", 42)),
+            ("tests/test_app.py:42: AssertionError", ("tests/test_app.py", 42)),
+            ("src/app.py:12: error: Incompatible types", ("src/app.py", 12)),
+            ("src/app.py:1:8: F401 [*] `os` imported but unused", ("src/app.py", 1)),
+            ("   --> src/app.py:3:5", ("src/app.py", 3)),
+            ("    calc_test.go:12: expected 3, got 4", ("calc_test.go", 12)),
+            ("./main.go:10:5: undefined: foo", ("./main.go", 10)),
+            ("  --> src/main.rs:4:18", ("src/main.rs", 4)),
+            ("thread 'main' panicked at src/main.rs:2:5:", ("src/main.rs", 2)),
+            ("      at Object.<anonymous> (src/sum.test.js:10:15)", ("src/sum.test.js", 10)),
+            ("src/app.ts(10,5): error TS2322: Type 'string'", ("src/app.ts", 10)),
+            ("src/app.tsx:7:3 - error TS2304: Cannot find name", ("src/app.tsx", 7)),
+        ],
+    )
+    def test_tool_locations(self, locator: Locator, line: str, expected: tuple[str, int]) -> None:
+        """各ツールの出力形式から発生箇所を抽出する"""
+        assert locator.locate(f"[CI/test]   | {line}") == expected
+
+    def test_first_location_in_text_wins(self, locator: Locator) -> None:
+        """トリガーの種類によらず、テキスト中で最初の発生箇所を採用する"""
+        text = "\n".join(
+            [
+                "compiling 3 files: ok",
+                "src/b.ts(2,1): error TS2322: bad",
+                '  File "a.py", line 1',
+            ]
+        )
+        assert locator.locate(text) == ("src/b.ts", 2)
+
+    def test_skips_trigger_lines_without_location(self, locator: Locator) -> None:
+        """トリガーを含んでもパターンにマッチしない行は読み飛ばす"""
+        text = "Tests: 1 failed\nsetup.py: skipped\nsrc/a.py:3: error: bad"
+        assert locator.locate(text) == ("src/a.py", 3)
+
+    def test_no_trigger(self, locator: Locator) -> None:
+        """トリガーを含む行がなければNone"""
+        assert locator.locate("[CI/test]   | compiling\n[CI/test]   | done") is None
+
+
+class TestToolLogs:
+    """LogParserでのツール固有の出力の解析"""
+
+    @pytest.mark.parametrize(
+        ("lines", "error_type", "location"),
+        [
+            (
+                ["--- FAIL: TestAdd (0.00s)", "    calc_test.go:12: expected 3, got 4", "FAIL"],
+                "ASSERTION",
+                ("calc_test.go", 12),
+            ),
+            (
+                [
+                    "# example.com/calc",
+                    "./main.go:10:5: undefined: foo",
+                    "FAIL\texample.com/calc [build failed]",
+                ],
+                "COMPILE",
+                ("./main.go", 10),
+            ),
+            (
+                ["error[E0308]: mismatched types", "  --> src/main.rs:4:18"],
+                "COMPILE",
+                ("src/main.rs", 4),
+            ),
+            (
+                [
+                    "thread 'tests::add' panicked at src/lib.rs:10:9:",
+                    "assertion `left == right` failed",
+                ],
+                "ASSERTION",
+                ("src/lib.rs", 10),
+            ),
+            (
+                [
+                    "  ● sum › adds",
+                    "    expect(received).toBe(expected) // Object.is equality",
+                    "      at Object.<anonymous> (src/sum.test.js:10:15)",
+                    "Tests:       1 failed, 3 passed, 4 total",
+                ],
+                "ASSERTION",
+                ("src/sum.test.js", 10),
+            ),
+            (["src/app.ts(10,5): error TS2322: Type 'string'"], "TYPE_CHECK", ("src/app.ts", 10)),
+            (
+                [
+                    "src/app.py:12: error: Incompatible types",
+                    "Found 1 error in 1 file (checked 3 source files)",
+                ],
+                "TYPE_CHECK",
+                ("src/app.py", 12),
+            ),
+            (
+                ["src/app.py:1:8: F401 [*] `os` imported but unused", "Found 1 error."],
+                "LINT",
+                ("src/app.py", 1),
+            ),
+        ],
+    )
+    def test_error_type_and_location(
+        self, lines: list[str], error_type: str, location: tuple[str, int]
+    ) -> None:
+        """失敗したステップの出力から、ツールに応じたエラータイプと発生箇所を抽出する"""
+        log = [
+            "[CI/test] ⭐ Run Main check",
+            *(f"[CI/test]   | {line}" for line in lines),
+            "[CI/test]   ❌  Failure - Main check [1s]",
+        ]
+        failure = LogParser().parse("\n".join(log))
+
+        assert failure is not None
+        assert failure.error_type == error_type
+        assert (failure.file_path, failure.line_number) == location
+
+    def test_python_exception_outranks_tool_rules(self) -> None:
+        """Pythonの例外名はツール固有のパターンより優先する"""
+        log = "FAILED tests/test_a.py::test_x - TypeError: bad operand"
+        assert LogParser()._detect_error_type(log) == "TYPE"  # pyright: ignore[reportPrivateUsage]
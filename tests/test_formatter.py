@@ -91,6 +91,25 @@ class TestMarkdownFormatter:
         assert "Traceback" in markdown
         assert "```" in markdown  # コードブロック
 
+    def test_stack_trace_collapses_repeated_lines(self, formatter: MarkdownFormatter) -> None:
+        """スタックトレース中の進捗表示等の繰り返し行は1行に折り畳む"""
+        progress = "\n".join(f"npm http fetch GET 200 pkg-{n} {n}ms" for n in range(50))
+        failure = FailureInfo(
+            workflow="test.yml",
+            job="job",
+            step="step",
+            error_type="BUILD_FAILURE",
+            message="npm ERR! failed",
+            duration=None,
+            file_path=None,
+            line_number=None,
+            stack_trace=f"npm install\n{progress}\nnpm ERR! failed",
+        )
+        markdown = formatter.format(failure)
+        assert "npm http fetch GET 200 pkg-49 49ms  (×50)" in markdown
+        assert "pkg-0 " not in markdown
+        assert "npm ERR! failed\n```" in markdown
+
     def test_format_without_optional_fields(self, formatter: MarkdownFormatter) -> None:
         """オプショナルフィールドがなくてもフォーマット可能"""
         minimal_failure = FailureInfo(
@@ -125,3 +144,21 @@ class TestMarkdownFormatter:
         assert "Duration" in markdown
         # format_duration()の出力形式をチェック
         assert "2m 5s" in markdown or "125" in markdown
+
+    def test_format_all_single_failure(
+        self, formatter: MarkdownFormatter, sample_failure: FailureInfo
+    ) -> None:
+        """1件のみの場合はformat()と同じ出力"""
+        assert formatter.format_all([sample_failure]) == formatter.format(sample_failure)
+
+    def test_format_all_merges_failures(
+        self, formatter: MarkdownFormatter, sample_failure: FailureInfo
+    ) -> None:
+        """複数の失敗を1つのレポートにまとめる"""
+        other = sample_failure.model_copy(update={"workflow": "lint.yml", "job": "lint"})
+        markdown = formatter.format_all([sample_failure, other])
+        assert markdown.startswith("# 🔍 Act-Lens Failure Report (2 failures)")
+        assert "test.yml" in markdown
+        assert "lint.yml" in markdown
+        assert markdown.count("### Error Summary") == 2
+        assert "- `ASSERTION` lint.yml → lint:" in markdown
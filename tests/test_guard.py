@@ -0,0 +1,255 @@
+"""guard.pyのテスト"""
+
+import re
+import time
+
+import pytest
+
+from act_lens.classifier import Classifier
+from act_lens.extractors import EXTRACTORS, Locator
+from act_lens.guard import (
+    MAX_MATCH_CHARS,
+    PatternGuard,
+    check_pattern,
+    clamp,
+    compile_pattern,
+    required_texts,
+)
+from act_lens.parser import LogParser
+
+
+class TestCheckPattern:
+    """check_patternのテスト"""
+
+    @pytest.mark.parametrize(
+        "pattern",
+        [
+            r"(?:\n[^\n]*)*",
+            r"\[([^\]]+)\]\s+(.+)",
+            r"(?P<file>[^\s:]+\.py):(?P<line>\d+):\d+: [A-Z]+\d+",
+            r"(a|b)*",
+            r"(?:,\d+)*",
+        ],
+    )
+    def test_safe_patterns_accepted(self, pattern: str) -> None:
+        """入れ子の繰り返しがない、または区切りの文字で始まる繰り返しは許可する"""
+        check_pattern(pattern)
+
+    @pytest.mark.parametrize(
+        "pattern",
+        [
+            r"(a+)+",
+            r"(\w+\s?)*",
+            r"(?:[^\n]*)*",
+            r"(?:\n(?:[^\n]*)*)*",
+            r"(x*,?)+",
+            r"(?:\s*\w+)*",
+            r"(.*a){3,}",
+            r"(?:a|\w+)*",
+        ],
+    )
+    def test_nested_repeats_rejected(self, pattern: str) -> None:
+        """上限のない繰り返しの入れ子は拒否する"""
+        with pytest.raises(ValueError, match="指数的"):
+            check_pattern(pattern)
+
+    @pytest.mark.parametrize(
+        "pattern",
+        [r"error (x|x)*y", r"(a|aa)*", r"(?:a?b|b)+", r"(?:(?:-|--)v)*"],
+    )
+    def test_overlapping_alternatives_rejected(self, pattern: str) -> None:
+        """上限のない繰り返しの中の、同じ文字から始まりうる（空にマッチしうる）選択肢は拒否する"""
+        with pytest.raises(ValueError, match="選択肢が重なって"):
+            check_pattern(pattern)
+
+    def test_flags_considered(self) -> None:
+        """区切りの文字が内側にマッチしうるかは、DOTALL・IGNORECASE を考慮して判定する"""
+        check_pattern(r"(?:\n.*)*")
+        with pytest.raises(ValueError):
+            check_pattern(r"(?:\n.*)*", re.DOTALL)
+        with pytest.raises(ValueError):
+            check_pattern(r"(?s)(?:\n.*)*")
+        check_pattern(r"(?:a[^A]*)*", re.IGNORECASE)
+        with pytest.raises(ValueError):
+            check_pattern(r"(?:a[^A]*)*")
+
+    def test_invalid_pattern(self) -> None:
+        """正規表現として不正なパターンはValueError"""
+        with pytest.raises(ValueError, match="不正なパターン"):
+            compile_pattern(r"(unclosed")
+
+    def test_classifier_and_locator_check_patterns(self) -> None:
+        """分類器・Locatorは構築時にパターンを検査する"""
+        with pytest.raises(ValueError):
+            Classifier([(r"(\w+\s?)*failed", "X")], ("failed",))
+        with pytest.raises(ValueError):
+            Locator([EXTRACTORS[0]._replace(locations=(r"(?P<file>(\w+/?)+)\.py:(?P<line>\d+)",))])
+
+
+class TestRequiredTexts:
+    """required_textsのテスト"""
+
+    @pytest.mark.parametrize(
+        ("pattern", "texts"),
+        [
+            ("QuotaExceeded", ("quotaexceeded",)),
+            (r"(?:foo)?Bar\d+", ("bar",)),
+            (r"Rate(?:Limited|Exceeded)", ("limited", "exceeded")),
+            (r"(?:ab)+c", ("ab",)),
+            (r"\d+", None),
+            (r"E\d+|\d", None),
+            (r"(?=quota)\w+", None),
+        ],
+    )
+    def test_required_texts(self, pattern: str, texts: tuple[str, ...] | None) -> None:
+        """必ず通る固定の文字の並び・グループ・全ての選択肢から、最も選びやすい候補を返す"""
+        assert required_texts(pattern) == texts
+
+
+class TestPatternGuard:
+    """PatternGuardのテスト"""
+
+    def test_search(self) -> None:
+        """予算の範囲では pattern.search と同じ結果を返す"""
+        guard = PatternGuard()
+        pattern = re.compile(r"b+")
+        match = guard.search(pattern, "aabbbcc", 0, 7)
+        assert match is not None and match.span() == (2, 5)
+        assert guard.search(pattern, "aabbbcc", 0, 3) is not None
+        assert guard.search(pattern, "aabbbcc", 0, 2) is None
+        assert not guard.disabled
+
+    def test_budget_per_call(self) -> None:
+        """予算は照合1回ごとで、短い照合をいくら繰り返しても無効にしない"""
+        guard = PatternGuard(budget=0.05)
+        pattern = re.compile("error", re.IGNORECASE)
+        for _ in range(200_000):
+            guard.search(pattern, "gcc -Werror -Wall", 0, 17)
+        assert not guard.disabled
+        assert guard.search(pattern, "Error", 0, 5) is not None
+
+    def test_slow_pattern_disabled(self) -> None:
+        """予算を超えたパターンは以降マッチしないものとし、他のパターンは照合を続ける"""
+        guard = PatternGuard(budget=0.0)
+        slow, other = re.compile("a"), re.compile("b")
+        assert guard.search(slow, "a", 0, 1) is not None
+        assert guard.disabled.keys() == {"a"}
+        assert guard.search(slow, "a", 0, 1) is None
+        assert list(guard.finditer(slow, "aaa", 0, 3)) == []
+        assert guard.search(other, "b", 0, 1) is not None
+
+    def test_finditer(self) -> None:
+        """finditer は pattern.finditer と同じマッチ（空マッチを含む）を返す"""
+        guard = PatternGuard()
+        for pattern in (re.compile(r"\d+"), re.compile(r"(?=\d)")):
+            text = "a1 22 b333"
+            assert [m.span() for m in guard.finditer(pattern, text, 0, len(text))] == [
+                m.span() for m in pattern.finditer(text)
+            ]
+
+    def test_clamp(self) -> None:
+        """照合する範囲は行の先頭から MAX_MATCH_CHARS 文字まで"""
+        assert clamp(10, 20) == 20
+        assert clamp(10, 10 + MAX_MATCH_CHARS * 2) == 10 + MAX_MATCH_CHARS
+
+
+class TestClassifierBudget:
+    """分類器のパターンごとの照合が予算を超えた場合のテスト"""
+
+    def test_only_slow_rule_disabled(self) -> None:
+        """1つで予算を超えたパターンだけを無効にし、他のパターンは照合を続ける"""
+        classifier = Classifier(
+            [(r"AssertionError", "ASSERTION"), (r"error.*.*z", "SLOW"), (r"Error:", "UNKNOWN")],
+            ("error",),
+        )
+        guard = PatternGuard(budget=0.01)
+        assert classifier.rank("error " + "a" * 3000, guard=guard) is None
+        assert list(guard.disabled) == [r"error.*.*z"]
+        assert classifier.rank("AssertionError: x", guard=guard) == 0
+        assert classifier.rank("Error: x error z", guard=guard) == 2
+        assert classifier.rank("Error: x error z") == 1
+
+    def test_failed_step_kept(self) -> None:
+        """パターンを無効にしてエラーを見落としても、❌で終わったステップはBUILD_FAILURE"""
+        parser = LogParser()
+        parser.guard.disabled.update(dict.fromkeys(parser.classifier.rules, 1.0))
+        log = "\n".join(
+            [
+                "[CI/test] ⭐ Run Main build",
+                "[CI/test]   | AssertionError: boom",
+                "[CI/test]   ❌  Failure - Main build [1s]",
+            ]
+        )
+        failures = parser.parse_text(log)
+        assert [(f.step, f.error_type) for f in failures] == [("Main build", "BUILD_FAILURE")]
+
+    def test_many_cheap_lines(self) -> None:
+        """エラーのトリガーを含む短い行が大量にあっても、後のエラーを見落とさない"""
+        parser = LogParser()
+        parser.guard.budget = 0.05
+        log = "\n".join(
+            [
+                "[CI/test] ⭐ Run Main build",
+                *["[CI/test]   | gcc -Werror -Wall -c src/mod.c"] * 20_000,
+                "[CI/test]   | AssertionError: boom",
+                "[CI/test]   | Error: Process completed with exit code 1",
+                "[CI/test]   ❌  Failure - Main build [1s]",
+            ]
+        )
+        assert [f.error_type for f in parser.parse_text(log)] == ["ASSERTION"]
+        assert not parser.guard.disabled
+
+    def test_charged_once_per_rule(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """予算は、パターンごとに照合する行をつないだテキストへの1回の検索で計る（マッチごとではない）"""
+        classifier = LogParser().classifier
+        text = "\n".join(["gcc -Werror -Wall -c src/mod.c", "Error: x"] * 5_000)
+        guard = PatternGuard()
+        charged: list[str] = []
+        charge = guard.charge
+
+        def counting(pattern: str, seconds: float) -> bool:
+            charged.append(pattern)
+            return charge(pattern, seconds)
+
+        monkeypatch.setattr(guard, "charge", counting)
+        rank = classifier.rank(text, guard=guard)
+        assert rank is not None and classifier.labels[rank] == "UNKNOWN"
+        assert 0 < len(charged) <= len(classifier.rules)
+
+
+class TestPathologicalLines:
+    """バックトラックが増える長大な行の解析のテスト"""
+
+    @pytest.mark.parametrize(
+        "line",
+        [
+            "[" * 2_000_000,
+            "a.py:1" * 300_000,
+            "Error:" * 300_000,
+            "❌" + " " * 2_000_000,
+            'function e(t){return t.error?new Error("x["+t.id+"]"):t};' * 30_000,
+        ],
+        ids=["brackets", "file-like", "error-dense", "fail-space", "minified"],
+    )
+    def test_parse_completes(self, line: str) -> None:
+        """長大な1行を含むログも入力長に比例する時間で解析し、失敗を抽出する"""
+        log = "\n".join(
+            [
+                "[CI/test] ⭐ Run Main build",
+                f"[CI/test]   | {line}",
+                "[CI/test]   | Error: Process completed with exit code 1",
+                "[CI/test]   ❌  Failure - Main build [1s]",
+            ]
+        )
+        start = time.perf_counter()
+        failures = LogParser().parse_text(log)
+        assert time.perf_counter() - start < 10
+        assert [(f.job, f.step) for f in failures] == [("CI/test", "Main build")]
+
+    def test_location_beyond_limit_ignored(self) -> None:
+        """行の照合する範囲より後ろの発生箇所は拾わない"""
+        locator = Locator(EXTRACTORS)
+        near = 'File "app.py", line 3'
+        assert locator.locate(near) == ("app.py", 3)
+        assert locator.locate("x" * MAX_MATCH_CHARS + near) is None
+        assert locator.locate("x" * MAX_MATCH_CHARS + "\n" + near) == ("app.py", 3)
@@ -0,0 +1,57 @@
+"""noise.pyのテスト"""
+
+import pytest
+
+from act_lens.noise import collapse_lines, collapse_text
+
+
+class TestCollapseLines:
+    """collapse_linesのテスト"""
+
+    def test_progress_lines_folded(self) -> None:
+        """数値・進捗バーだけが異なる連続行は最後の行と行数にまとめる"""
+        lines = [
+            "Pulling image",
+            "Downloading [=>        ]  1.2MB/30MB",
+            "Downloading [=====>    ] 15.0MB/30MB",
+            "Downloading [==========] 30MB/30MB",
+            "Pull complete",
+        ]
+        assert list(collapse_lines(lines)) == [
+            "Pulling image",
+            "Downloading [==========] 30MB/30MB  (×3)",
+            "Pull complete",
+        ]
+
+    def test_short_runs_kept(self) -> None:
+        """min_run 未満の連続はそのまま残す"""
+        lines = ["retry 1 failed", "retry 2 failed", "done"]
+        assert list(collapse_lines(lines)) == lines
+        assert list(collapse_lines(lines, min_run=2)) == ["retry 2 failed  (×2)", "done"]
+
+    @pytest.mark.parametrize(
+        "lines",
+        [
+            ["", "", "", ""],
+            ["----", "-----", "------"],
+            ["E   assert x == y", "E   assert a == b", "E   assert c == d"],
+        ],
+    )
+    def test_distinct_or_empty_shapes_kept(self, lines: list[str]) -> None:
+        """空行・区切り線や、数値以外が異なる行は折り畳まない"""
+        assert list(collapse_lines(lines)) == lines
+
+    def test_lazy(self) -> None:
+        """逐次読み込みのイテラブルから、折り畳みが確定した行を順に返す"""
+        source = iter(["a", "step 1", "step 2", "step 3", "b"])
+        folded = collapse_lines(source)
+
+        assert next(folded) == "a"
+        assert next(folded) == "step 3  (×3)"
+        assert list(source) == []  # "b" まで読んで連続の終わりを確定した
+        assert list(folded) == ["b"]
+
+    def test_collapse_text(self) -> None:
+        """改行区切りのテキストにも適用できる"""
+        text = "Traceback\n" + "\n".join(f"  attempt {n}" for n in range(100)) + "\nError"
+        assert collapse_text(text) == "Traceback\n  attempt 99  (×100)\nError"
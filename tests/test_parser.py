@@ -1,12 +1,15 @@
 """LogParserのテスト"""
 # pyright: reportPrivateUsage=false
 
+import os
 import re
+from pathlib import Path
 
 import pytest
 
 from act_lens.models import FailureInfo
 from act_lens.parser import LogParser
+from act_lens.runner import MAX_LINE_CHARS
 
 
 class TestLogParser:
@@ -155,3 +158,352 @@ class TestLogParser:
                 re.compile(pattern)
             except re.error as e:
                 pytest.fail(f"Invalid regex pattern: {pattern} - {e}")
+
+    def test_parse_lines_accepts_iterator(self, parser: LogParser) -> None:
+        """行のイテレータを直接解析できる"""
+        lines = iter(["[Test/job] ❌ Failure - Main Run tests", "exitcode '1': failure"])
+        result = parser.parse_lines(lines, workflow="test.yml")
+        assert isinstance(result, FailureInfo)
+        assert result.error_type == "BUILD_FAILURE"
+        assert result.job == "Test/job"
+
+    def test_detect_fatal(self, parser: LogParser) -> None:
+        """確定的な失敗行のみをfail-fast対象と判定"""
+        assert parser.detect_fatal("[CI/test]   ❌  Failure - Main pytest") == "BUILD_FAILURE"
+        assert (
+            parser.detect_fatal("[CI/test]   | FAILED tests/test_a.py::test_x - assert 1 == 2")
+            == "ASSERTION"
+        )
+        assert parser.detect_fatal("ValueError: invalid literal") is None
+        assert parser.detect_fatal("[CI/test]   ✅  Success - Main pytest") is None
+
+    def test_detect_fatal_ignores_weak_signals(self, parser: LogParser) -> None:
+        """AssertionError 等を含むだけの行（成功したテストの名前や出力）では停止しない"""
+        lines = [
+            "[CI/test]   | tests/test_a.py::test_raises_AssertionError PASSED",
+            "[CI/test]   | AssertionError: expected 5 but got 3",
+            "[CI/test]   | tests/test_a.py::test_x FAILED",
+            "[CI/test]   | 1 failed, 3 passed",
+        ]
+        assert [parser.detect_fatal(line) for line in lines] == [None] * 4
+
+    def test_timeout_failure_uses_running_step(self, parser: LogParser) -> None:
+        """タイムアウト時は終了マーカーのないステップを失敗箇所にする"""
+        lines = [
+            "[CI/test] ⭐ Run Main Setup",
+            "[CI/test]   ✅  Success - Main Setup [1.0s]",
+            "[CI/test] ⭐ Run Main Integration tests",
+            '[CI/test]   |   File "tests/test_api.py", line 12, in test_slow',
+        ]
+        partial = parser.parse_lines(lines, workflow="ci.yml")
+        failure = parser.timeout_failure(partial, "ci.yml", 300)
+
+        assert failure.error_type == "TIMEOUT"
+        assert failure.job == "CI/test"
+        assert failure.step == "Main Integration tests"
+        assert failure.duration == 300
+        assert "300秒" in failure.message
+
+    def test_timeout_failure_without_classified_error(self, parser: LogParser) -> None:
+        """実行中ステップでエラーを検出していなくても、途中までの出力の情報を引き継ぐ"""
+        lines = [
+            "[CI/test] ⭐ Run Main Integration tests",
+            "[CI/test]   | Traceback (most recent call last):",
+            '[CI/test]   |   File "tests/test_api.py", line 12, in test_slow',
+            "[CI/test]   |     wait_for_server()",
+            "[CI/test]   | retrying after HTTP Error 503",
+        ]
+        for failures in (parser.parse_all(lines), parser.parse_text("\n".join(lines))):
+            assert failures == []
+            failure = parser.timeout_failure(None, None, 300)
+
+            assert (failure.workflow, failure.job, failure.step) == (
+                "CI",
+                "CI/test",
+                "Main Integration tests",
+            )
+            assert (failure.file_path, failure.line_number) == ("tests/test_api.py", 12)
+            assert failure.stack_trace is not None and "wait_for_server()" in failure.stack_trace
+            assert "retrying after HTTP Error 503" in failure.message
+
+    def test_parse_all_one_failure_per_job(self, parser: LogParser) -> None:
+        """失敗したジョブごとに、そのジョブの行だけから抽出する"""
+        log = [
+            "[CI/test-1] ⭐ Run Main pytest",
+            "[CI/test-2] ⭐ Run Main pytest",
+            "[CI/test-1]   | Traceback (most recent call last):",
+            '[CI/test-1]   |   File "tests/test_a.py", line 10, in test_a',
+            "[CI/test-2]   | ModuleNotFoundError: No module named 'foo'",
+            '  File "tests/test_b.py", line 3',
+            "[CI/test-1]   | AssertionError: a",
+            "[CI/test-1]   ❌  Failure - Main pytest [1.5s]",
+            "[CI/lint] ⭐ Run Main ruff",
+            "[CI/lint]   ✅  Success - Main ruff [0.5s]",
+            "[CI/test-2]   ❌  Failure - Main pytest [2.5s]",
+        ]
+
+        failures = parser.parse_all(log, "ci.yml")
+
+        assert [(f.job, f.error_type) for f in failures] == [
+            ("CI/test-1", "ASSERTION"),
+            ("CI/test-2", "IMPORT"),
+        ]
+        first, second = failures
+        assert (first.file_path, first.line_number, first.duration) == ("tests/test_a.py", 10, 1.5)
+        # 接頭辞のない行は直前のジョブに含める
+        assert (second.file_path, second.line_number, second.duration) == (
+            "tests/test_b.py",
+            3,
+            2.5,
+        )
+        assert parser.running_step is None
+
+    def test_parse_all_running_step(self, parser: LogParser) -> None:
+        """最後に出力のあったジョブの実行中ステップを記録する"""
+        log = [
+            "[CI/a] ⭐ Run Main slow",
+            "[CI/b] ⭐ Run Main slower",
+            "[CI/a]   | still running",
+        ]
+
+        assert parser.parse_all(log) == []
+        assert parser.running_step == ("CI/a", "Main slow")
+
+    def test_parse_all_scopes_to_failing_step(self, parser: LogParser) -> None:
+        """成功したステップの出力は抽出に使わない"""
+        log = [
+            "[CI/test] ⭐ Run Main setup",
+            "[CI/test]   | Traceback (most recent call last):",
+            '[CI/test]   |   File "setup.py", line 1, in <module>',
+            "[CI/test]   | ValueError: retrying",
+            "[CI/test]   ✅  Success - Main setup [0.5s]",
+            "[CI/test] ⭐ Run Main pytest",
+            '[CI/test]   |   File "tests/test_a.py", line 7, in test_a',
+            "[CI/test]   | AssertionError: a",
+            "[CI/test]   ❌  Failure - Main pytest [1.5s]",
+            "[CI/test] ⭐ Run Post cleanup",
+            "[CI/test]   | KeyError: 'x'",
+            "[CI/test]   ✅  Success - Post cleanup [0.1s]",
+        ]
+
+        (failure,) = parser.parse_all(log, "ci.yml")
+
+        assert failure.error_type == "ASSERTION"
+        assert failure.step == "Main pytest"
+        assert (failure.file_path, failure.line_number, failure.duration) == (
+            "tests/test_a.py",
+            7,
+            1.5,
+        )
+        assert failure.stack_trace is None
+
+    def test_parse_all_ignores_errors_in_successful_steps(self, parser: LogParser) -> None:
+        """全ステップが成功したジョブは、出力にエラー文字列があっても失敗にしない"""
+        log = [
+            "[CI/test] ⭐ Run Main pytest",
+            "[CI/test]   | tests/test_errors.py::test_raises_value_error PASSED",
+            "[CI/test]   | AssertionError: expected in test output",
+            "[CI/test]   ✅  Success - Main pytest [1.0s]",
+        ]
+
+        assert parser.parse_all(log) == []
+
+    def test_parse_text_matches_parse_all(self, parser: LogParser) -> None:
+        """文字列全体の解析はインデックス経由でも行単位の解析と同じ結果になる"""
+        log = "\n".join(
+            [
+                "INFO[0000] Using docker host",
+                "[CI/a] ⭐ Run Main pytest",
+                "[CI/b] ⭐ Run Main build",
+                "[CI/a]   | Traceback (most recent call last):",
+                '  File "tests/test_a.py", line 3, in test_a',
+                "[CI/b]   | Error: Process completed with exit code 2",
+                "[CI/a]   | TypeError: bad",
+                "[CI/a]   ❌  Failure - Main pytest [2m 5s]",
+                "[CI/b] ⭐ Run Main deploy",
+                "",
+            ]
+        )
+
+        def fields(failures: list[FailureInfo]) -> list[dict[str, object]]:
+            return [failure.model_dump(exclude={"timestamp"}) for failure in failures]
+
+        by_text = fields(parser.parse_text(log))
+        text_running = parser.running_step
+        by_lines = fields(parser.parse_all(log.split("\n")))
+
+        assert by_text == by_lines
+        assert [f["job"] for f in by_text] == ["CI/a", "CI/b"]
+        assert text_running == parser.running_step == ("CI/b", "Main deploy")
+
+    @pytest.mark.parametrize("size", [1, 7, 64, 100_000])
+    def test_feed_chunks_matches_parse_all(self, parser: LogParser, size: int) -> None:
+        """行の途中で区切れた断片を取り込んでも、行単位の解析と同じ結果になる"""
+        lines = [
+            "[CI/test] ⭐ Run Main pytest",
+            "[CI/test]   | Traceback (most recent call last):",
+            '[CI/test]   |   File "tests/test_a.py", line 7, in test_a',
+            "[CI/test]   | AssertionError: a",
+            "[CI/test]   ❌  Failure - Main pytest [1.5s]",
+            "[CI/lint] ⭐ Run Main ruff",
+        ]
+        log = "\r\n".join(lines)
+
+        for start in range(0, len(log), size):
+            parser.feed(log[start : start + size])
+        fed = parser.finalize_all("ci.yml")
+        fed_running = parser.running_step
+        expected = parser.parse_all(lines, "ci.yml")
+
+        assert [f.model_dump(exclude={"timestamp"}) for f in fed] == [
+            f.model_dump(exclude={"timestamp"}) for f in expected
+        ]
+        assert fed_running == parser.running_step == ("CI/lint", "Main ruff")
+
+    def test_finalize_resets_state(self, parser: LogParser) -> None:
+        """finalize() 後は新しいログとして取り込み直せる"""
+        parser.feed("[CI/a] ❌ Failure - Main Run tests\n")
+        first = parser.finalize()
+
+        parser.feed("[CI/b] ✅ Success - Main Run tests")
+        assert first is not None and first.job == "CI/a"
+        assert parser.finalize() is None
+
+    def test_feed_splits_long_line_without_newline(self, parser: LogParser) -> None:
+        """改行のない長大な出力は上限の長さで区切り、未完の行を溜め続けない"""
+        parser.feed("x" * (MAX_LINE_CHARS - 1))
+        parser.feed("x")
+        parser.feed("AssertionError: after\n")
+
+        failure = parser.finalize()
+        assert failure is not None
+        assert failure.message == "AssertionError: after"
+
+    def test_parse_file_matches_parse_all(self, parser: LogParser, tmp_path: Path) -> None:
+        """mmapしたファイルの解析は、CRLFや不正なバイトを含んでも行単位の解析と同じ結果になる"""
+        lines = [
+            "[CI/a] ⭐ Run Main pytest",
+            "[CI/b] ⭐ Run Main build",
+            "[CI/a]   | Traceback (most recent call last):",
+            '[CI/a]   |   File "tests/test_ä.py", line 7, in test_a',
+            "[CI/b]   | Error: Process completed with exit code 2",
+            "[CI/a]   | AssertionError: �",
+            "[CI/a]   ❌  Failure - Main pytest [1.5s]",
+            "[CI/b] ⭐ Run Main deploy",
+        ]
+        log = tmp_path / "act.log"
+        log.write_bytes("\r\n".join(lines).replace("�", "\udcff").encode(errors="surrogateescape"))
+
+        by_file = parser.parse_file(log, "ci.yml")
+        file_running = parser.running_step
+        expected = parser.parse_all(lines, "ci.yml")
+
+        assert [f.model_dump(exclude={"timestamp"}) for f in by_file] == [
+            f.model_dump(exclude={"timestamp"}) for f in expected
+        ]
+        assert by_file[0].file_path == "tests/test_ä.py"
+        assert file_running == parser.running_step == ("CI/b", "Main deploy")
+
+    @pytest.mark.parametrize("pool_fails", [False, True])
+    def test_parse_file_workers(
+        self, parser: LogParser, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, pool_fails: bool
+    ) -> None:
+        """複数プロセスでのジョブの解析は、1プロセスと同じ結果になる（起動できなければ1プロセス）"""
+        lines = [
+            "[CI/a] ⭐ Run Main pytest",
+            "[CI/b] ⭐ Run Main pytest",
+            "[CI/c] ⭐ Run Main lint",
+        ]
+        for i in range(200):
+            lines += [f"[CI/a]   | tests/test_a.py::test_{i} PASSED", f"[CI/b]   | building {i}"]
+        lines += [
+            "[CI/a]   | AssertionError: a",
+            "[CI/b]   | Error: Process completed with exit code 2",
+            "[CI/c]   ✅  Success - Main lint",
+            "[CI/a]   ❌  Failure - Main pytest [1.5s]",
+            "[CI/c] ⭐ Run Main deploy",
+        ]
+        log = tmp_path / "act.log"
+        log.write_text("\n".join(lines), encoding="utf-8")
+        expected = [f.model_dump(exclude={"timestamp"}) for f in parser.parse_file(log)]
+        if pool_fails:
+            monkeypatch.setattr("act_lens.parser.ProcessPoolExecutor", _unavailable_pool)
+
+        monkeypatch.setattr(parser, "PARALLEL_MIN_BYTES", 0)
+        failures = parser.parse_file(log, workers=2)
+
+        assert [f.model_dump(exclude={"timestamp"}) for f in failures] == expected
+        assert [f.job for f in failures] == ["CI/a", "CI/b"]
+        assert parser.running_step == ("CI/c", "Main deploy")
+
+    def test_parse_file_empty(self, parser: LogParser, tmp_path: Path) -> None:
+        """空のファイルは失敗なし"""
+        log = tmp_path / "empty.log"
+        log.write_bytes(b"")
+
+        assert parser.parse_file(log) == []
+
+    def test_context_from_container_path(self, tmp_path: Path) -> None:
+        """コンテナ内のパスをリポジトリのファイルに対応付け、発生箇所の前後の行を付ける"""
+        source = tmp_path / "tests" / "test_app.py"
+        source.parent.mkdir()
+        source.write_text("".join(f"x = {n}\n" for n in range(1, 11)), encoding="utf-8")
+        log = "\n".join(
+            [
+                "[CI/test] ⭐ Run Main pytest",
+                "[CI/test]   | Traceback (most recent call last):",
+                '[CI/test]   |   File "/github/workspace/tests/test_app.py", line 9, in test',
+                "[CI/test]   | AssertionError: boom",
+                "[CI/test]   ❌  Failure - Main pytest [1s]",
+            ]
+        )
+
+        failure = LogParser(source_root=tmp_path).parse(log)
+
+        assert failure is not None
+        assert failure.get_location() == "tests/test_app.py:9"
+        assert failure.context_lines == [
+            "   6 | x = 6",
+            "   7 | x = 7",
+            "   8 | x = 8",
+            ">  9 | x = 9",
+            "  10 | x = 10",
+        ]
+
+    def test_context_of_source_modified_after_log(self, tmp_path: Path) -> None:
+        """ログより後に更新されたソースファイルは、保存済みのログの解析で前後の行を付けない"""
+        source = tmp_path / "tests" / "test_app.py"
+        source.parent.mkdir()
+        source.write_text("".join(f"x = {n}\n" for n in range(1, 11)), encoding="utf-8")
+        log = tmp_path / "act.log"
+        log.write_text(
+            "\n".join(
+                [
+                    "[CI/test] ⭐ Run Main pytest",
+                    '[CI/test]   |   File "/github/workspace/tests/test_app.py", line 9, in test',
+                    "[CI/test]   | AssertionError: boom",
+                    "[CI/test]   ❌  Failure - Main pytest [1s]",
+                ]
+            ),
+            encoding="utf-8",
+        )
+        logged_at = log.stat().st_mtime_ns
+        parser = LogParser(source_root=tmp_path)
+
+        os.utime(source, ns=(logged_at - 10**9, logged_at - 10**9))
+        assert parser.parse_file(log)[0].context_lines
+        assert parser.stale_sources == []
+
+        os.utime(source, ns=(logged_at + 10**9, logged_at + 10**9))
+        [failure] = parser.parse_file(log)
+        assert failure.context_lines == []
+        assert failure.get_location() == "tests/test_app.py:9"
+        assert parser.stale_sources == ["tests/test_app.py"]
+
+    def test_context_missing_source(self, tmp_path: Path) -> None:
+        """ソースファイルが見つからなければコンテキスト行なし"""
+        assert LogParser(source_root=tmp_path)._extract_context((), "missing.py", 3) == []
+
+
+def _unavailable_pool(*_args: object, **_kwargs: object) -> None:
+    raise OSError("プロセスを起動できない環境")
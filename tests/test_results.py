@@ -0,0 +1,148 @@
+"""results.pyのテスト"""
+
+import os
+import time
+from pathlib import Path
+
+from act_lens.models import CachedResult, FailureInfo, PathFilter, WorkflowInfo
+from act_lens.results import ResultCache, result_key
+
+WORKFLOWS = {
+    "ci.yml": WorkflowInfo(
+        file="ci.yml",
+        mtime_ns=0,
+        size=0,
+        sha256="aaa",
+        events=["push"],
+        path_filters={"push": PathFilter(paths=["src/**"])},
+    )
+}
+TRACKED = {"src/app.py": "111", "README.md": "222"}
+
+
+def _key(
+    workflows: dict[str, WorkflowInfo] = WORKFLOWS,
+    job: str | None = "test",
+    tracked: dict[str, str] = TRACKED,
+    actrc: tuple[Path, ...] = (),
+) -> str:
+    return result_key(workflows, "ci.yml", job, tracked, actrc)
+
+
+class TestResultKey:
+    """キャッシュキー計算のテスト"""
+
+    def test_same_inputs_same_key(self) -> None:
+        """入力が同じならキーも同じ"""
+        assert _key() == _key()
+
+    def test_covered_file_changes_key(self) -> None:
+        """pathsの対象ファイルが変わればキーが変わる"""
+        assert _key(tracked={**TRACKED, "src/app.py": "999"}) != _key()
+
+    def test_uncovered_file_keeps_key(self) -> None:
+        """pathsの対象外のファイルの変更はキーに影響しない"""
+        assert _key(tracked={**TRACKED, "README.md": "999"}) == _key()
+
+    def test_workflow_and_job_change_key(self) -> None:
+        """ワークフローの内容やジョブが変わればキーが変わる"""
+        changed = {"ci.yml": WORKFLOWS["ci.yml"].model_copy(update={"sha256": "bbb"})}
+        assert _key(workflows=changed) != _key()
+        assert _key(job="lint") != _key()
+
+    def test_actrc_changes_key(self, tmp_path: Path) -> None:
+        """.actrcの内容が変わればキーが変わる"""
+        actrc = tmp_path / ".actrc"
+        actrc.write_text("-P ubuntu-latest=node:16\n")
+        before = _key(actrc=(actrc,))
+        actrc.write_text("-P ubuntu-latest=node:20\n")
+        assert _key(actrc=(actrc,)) != before
+
+    def test_config_changes_key(self, tmp_path: Path) -> None:
+        """解析のパターンの設定ファイルの内容が変わればキーが変わる"""
+        config = tmp_path / ".act-lens.toml"
+        missing = result_key(WORKFLOWS, "ci.yml", "test", TRACKED, (), config)
+        config.write_text('[success]\npatterns = ["OK"]\ntriggers = ["OK"]\n')
+        before = result_key(WORKFLOWS, "ci.yml", "test", TRACKED, (), config)
+        config.write_text('[success]\npatterns = ["DONE"]\ntriggers = ["DONE"]\n')
+        after = result_key(WORKFLOWS, "ci.yml", "test", TRACKED, (), config)
+        assert len({missing, before, after}) == 3
+
+
+class TestResultCache:
+    """結果キャッシュのテスト"""
+
+    def _result(self, key: str, failed: bool = False) -> CachedResult:
+        failures = [
+            FailureInfo(
+                workflow="ci.yml",
+                job="test",
+                step="pytest",
+                error_type="ASSERTION",
+                message="x",
+                duration=None,
+                file_path=None,
+                line_number=None,
+                stack_trace=None,
+            )
+        ]
+        return CachedResult(
+            key=key,
+            exit_code=1 if failed else 0,
+            log_sha256="d",
+            failures=failures if failed else [],
+        )
+
+    def test_put_and_get(self, tmp_path: Path) -> None:
+        """保存した結果を取得できる"""
+        cache = ResultCache(tmp_path)
+        cache.put(self._result("k1", failed=True))
+
+        cached = cache.get("k1")
+
+        assert cached is not None
+        assert cached.exit_code == 1
+        assert [f.error_type for f in cached.failures] == ["ASSERTION"]
+        assert cache.get("k2") is None
+
+    def test_expired_entry_is_ignored_and_evicted(self, tmp_path: Path) -> None:
+        """期限切れのエントリは使わず、次の保存時に削除する"""
+        cache = ResultCache(tmp_path, max_age=60)
+        cache.put(self._result("old"))
+        past = time.time() - 120
+        os.utime(tmp_path / "old.json", (past, past))
+
+        assert cache.get("old") is None
+        cache.put(self._result("new"))
+        assert not (tmp_path / "old.json").exists()
+
+    def test_size_limit_evicts_oldest(self, tmp_path: Path) -> None:
+        """合計サイズが上限を超えたら古いエントリから削除する"""
+        cache = ResultCache(tmp_path)
+        for i, key in enumerate(["a", "b", "c"]):
+            cache.put(self._result(key))
+            stamp = time.time() - 10 + i
+            os.utime(tmp_path / f"{key}.json", (stamp, stamp))
+        cache.max_bytes = (tmp_path / "c.json").stat().st_size * 2
+
+        cache.evict()
+
+        assert sorted(p.stem for p in tmp_path.glob("*.json")) == ["b", "c"]
+
+    def test_missing_log_is_not_reused(self, tmp_path: Path) -> None:
+        """レポートが指す生ログが削除されたエントリは使わない"""
+        cache = ResultCache(tmp_path / "results")
+        log = tmp_path / "act.log"
+        log.write_text("x", encoding="utf-8")
+        result = self._result("k1", failed=True)
+        result.failures[0].log_path = str(log)
+        cache.put(result)
+
+        assert cache.get("k1") is not None
+        log.unlink()
+        assert cache.get("k1") is None
+
+    def test_corrupt_entry_is_ignored(self, tmp_path: Path) -> None:
+        """壊れたエントリは無視する"""
+        (tmp_path / "bad.json").write_text("{", encoding="utf-8")
+        assert ResultCache(tmp_path).get("bad") is None
@@ -1,9 +1,32 @@
 """runner.pyのテスト"""
 
+import io
+import os
+import signal
+import subprocess
+import sys
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
-from act_lens.runner import ActRunner
+import pytest
+
+from act_lens.runner import (
+    MAX_LINE_CHARS,
+    STDERR,
+    STDOUT,
+    TIMEOUT_EXIT_CODE,
+    ActRunner,
+    ActStream,
+)
+
+
+def _fake_process(stdout: str = "", stderr: str = "", returncode: int = 0) -> MagicMock:
+    """stdout/stderrのパイプを持つ偽のPopenプロセス"""
+    process = MagicMock()
+    process.stdout = io.StringIO(stdout)
+    process.stderr = io.StringIO(stderr)
+    process.wait.return_value = returncode
+    return process
 
 
 class TestActRunner:
@@ -52,14 +75,10 @@ class TestActRunner:
         assert "release.yaml" in workflows
         assert "readme.md" not in workflows
 
-    @patch("act_lens.runner.subprocess.run")
+    @patch("act_lens.runner.subprocess.Popen")
     def test_run_act_success(self, mock_run: MagicMock) -> None:
         """actコマンド実行成功"""
-        mock_run.return_value = MagicMock(
-            stdout="Success output",
-            stderr="",
-            returncode=0,
-        )
+        mock_run.return_value = _fake_process("Success output", "", 0)
 
         runner = ActRunner()
         output, returncode = runner.run_act()
@@ -68,14 +87,10 @@ class TestActRunner:
         assert returncode == 0
         mock_run.assert_called_once()
 
-    @patch("act_lens.runner.subprocess.run")
+    @patch("act_lens.runner.subprocess.Popen")
     def test_run_act_with_workflow(self, mock_run: MagicMock) -> None:
         """ワークフロー指定でactコマンド実行"""
-        mock_run.return_value = MagicMock(
-            stdout="Output",
-            stderr="",
-            returncode=0,
-        )
+        mock_run.return_value = _fake_process("Output", "", 0)
 
         runner = ActRunner()
         runner.run_act(workflow="ci.yml")
@@ -86,14 +101,10 @@ class TestActRunner:
         assert "-W" in call_args
         assert str(Path(".github/workflows/ci.yml")) in str(call_args)
 
-    @patch("act_lens.runner.subprocess.run")
+    @patch("act_lens.runner.subprocess.Popen")
     def test_run_act_with_job(self, mock_run: MagicMock) -> None:
         """ジョブ指定でactコマンド実行"""
-        mock_run.return_value = MagicMock(
-            stdout="Output",
-            stderr="",
-            returncode=0,
-        )
+        mock_run.return_value = _fake_process("Output", "", 0)
 
         runner = ActRunner()
         runner.run_act(job="test")
@@ -103,14 +114,10 @@ class TestActRunner:
         assert "-j" in call_args
         assert "test" in call_args
 
-    @patch("act_lens.runner.subprocess.run")
+    @patch("act_lens.runner.subprocess.Popen")
     def test_run_act_failure(self, mock_run: MagicMock) -> None:
         """actコマンド実行失敗"""
-        mock_run.return_value = MagicMock(
-            stdout="",
-            stderr="Error: act failed",
-            returncode=1,
-        )
+        mock_run.return_value = _fake_process("", "Error: act failed", 1)
 
         runner = ActRunner()
         output, returncode = runner.run_act()
@@ -118,7 +125,7 @@ class TestActRunner:
         assert "Error: act failed" in output
         assert returncode == 1
 
-    @patch("act_lens.runner.subprocess.run")
+    @patch("act_lens.runner.subprocess.Popen")
     def test_run_act_path_traversal_protection(self, mock_run: MagicMock) -> None:
         """パストラバーサル攻撃を防ぐ"""
         runner = ActRunner()
@@ -147,14 +154,10 @@ class TestActRunner:
         assert "'.'" in output or "相対パス" in output
         mock_run.assert_not_called()
 
-    @patch("act_lens.runner.subprocess.run")
+    @patch("act_lens.runner.subprocess.Popen")
     def test_run_act_valid_workflow_only(self, mock_run: MagicMock) -> None:
         """有効なワークフロー名のみ許可"""
-        mock_run.return_value = MagicMock(
-            stdout="Output",
-            stderr="",
-            returncode=0,
-        )
+        mock_run.return_value = _fake_process("Output", "", 0)
 
         runner = ActRunner()
         runner.run_act(workflow="ci.yml")
@@ -163,3 +166,182 @@ class TestActRunner:
         call_args = mock_run.call_args[0][0]
         assert "act" in call_args
         assert "-W" in call_args
+
+    @patch("act_lens.runner.subprocess.Popen")
+    def test_stream_act_yields_lines(self, mock_popen: MagicMock) -> None:
+        """ストリームモードでは出力を1行ずつ返し、読み切った後に終了コードを参照できる"""
+        mock_popen.return_value = _fake_process("line1\nline2\r\nline3", "", 1)
+
+        runner = ActRunner()
+        stream = runner.stream_act(workflow="ci.yml", job="test")
+
+        assert list(stream) == ["line1", "line2", "line3"]
+        assert stream.returncode == 1
+        call_args = mock_popen.call_args[0][0]
+        assert "-W" in call_args
+        assert "-j" in call_args
+
+    @patch("act_lens.runner.subprocess.Popen")
+    def test_stream_act_splits_very_long_lines(self, mock_popen: MagicMock) -> None:
+        """上限を超える長い行は分割して読み出す"""
+        mock_popen.return_value = _fake_process("x" * (MAX_LINE_CHARS + 10) + "\n")
+
+        lines = list(ActRunner().stream_act())
+
+        assert [len(line) for line in lines] == [MAX_LINE_CHARS, 10]
+
+    @patch("act_lens.runner.subprocess.Popen")
+    def test_stream_act_path_traversal_protection(self, mock_popen: MagicMock) -> None:
+        """ストリームモードでも不正なワークフロー名は拒否される"""
+        stream = ActRunner().stream_act(workflow="../ci.yml")
+
+        lines = list(stream)
+
+        assert stream.returncode == 1
+        assert "パス区切り文字" in lines[0]
+        mock_popen.assert_not_called()
+
+    @patch("act_lens.runner.subprocess.Popen")
+    def test_stream_act_command_not_found(self, mock_popen: MagicMock) -> None:
+        """actが見つからない場合は終了コード127"""
+        mock_popen.side_effect = FileNotFoundError
+
+        stream = ActRunner().stream_act()
+
+        assert list(stream) == []
+        assert stream.returncode == 127
+
+    @patch("act_lens.runner.os.killpg")
+    @patch("act_lens.runner.subprocess.Popen")
+    def test_stream_terminate_kills_process_group(
+        self, mock_popen: MagicMock, mock_killpg: MagicMock
+    ) -> None:
+        """terminate()はactのプロセスグループごと停止する"""
+        process = _fake_process()
+        process.pid = 4321
+        process.poll.return_value = None
+        mock_popen.return_value = process
+
+        stream = ActRunner().stream_act()
+        stream.terminate()
+
+        assert stream.terminated
+        if os.name == "posix":
+            assert mock_popen.call_args.kwargs["start_new_session"] is True
+            mock_killpg.assert_called_once_with(4321, signal.SIGTERM)
+
+    def test_stream_terminate_without_process(self) -> None:
+        """プロセスのないストリームのterminate()は何もしない"""
+        stream = ActStream(returncode=1, lines=("error",))
+        stream.terminate()
+        assert not stream.terminated
+
+    def test_stream_context_stops_act_on_error(self) -> None:
+        """with文を読み切る前に例外で抜けたら、actを停止する"""
+        process = subprocess.Popen(
+            [sys.executable, "-c", "import time; print('started', flush=True); time.sleep(30)"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            start_new_session=os.name == "posix",
+        )
+
+        with pytest.raises(RuntimeError), ActStream(process) as stream:
+            assert next(iter(stream)) == "started"
+            raise RuntimeError("parser failed")
+
+        assert stream.terminated
+        assert process.wait(timeout=10) != 0
+
+    def test_stream_timeout_keeps_partial_lines(self) -> None:
+        """ストリームのタイムアウト時はactを停止し、届いた行は最後まで返す"""
+        process = subprocess.Popen(
+            [sys.executable, "-c", "import time; print('started', flush=True); time.sleep(30)"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            start_new_session=os.name == "posix",
+        )
+        stream = ActStream(process, timeout=0.5)
+
+        lines = list(stream)
+
+        assert lines == ["started"]
+        assert stream.timed_out
+        assert stream.returncode == TIMEOUT_EXIT_CODE
+
+    def test_records_merge_stdout_and_stderr_in_arrival_order(self) -> None:
+        """stdout/stderrを到着順に並べ、到着時刻とストリーム種別を付ける"""
+        script = (
+            "import sys, time\n"
+            "print('out1', flush=True); time.sleep(0.1)\n"
+            "print('err1', file=sys.stderr, flush=True); time.sleep(0.1)\n"
+            "print('out2', flush=True)\n"
+        )
+        process = subprocess.Popen(
+            [sys.executable, "-c", script],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+
+        records = list(ActStream(process).records())
+
+        assert [(r.stream, r.text) for r in records] == [
+            (STDOUT, "out1"),
+            (STDERR, "err1"),
+            (STDOUT, "out2"),
+        ]
+        assert records[0].time <= records[1].time <= records[2].time
+
+    def test_step_timings_from_marker_arrival(self) -> None:
+        """ステップ開始/終了マーカーの到着時刻から実時間を計測する"""
+        script = (
+            "import time\n"
+            "print('[CI/test] ⭐ Run Main pytest', flush=True); time.sleep(0.3)\n"
+            "print('[CI/test]   ❌  Failure - Main pytest [0.01s]', flush=True)\n"
+        )
+        process = subprocess.Popen(
+            [sys.executable, "-c", script],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            env={**os.environ, "PYTHONIOENCODING": "utf-8"},
+        )
+        stream = ActStream(process)
+
+        list(stream)
+
+        assert list(stream.step_timings) == [("CI/test", "Main pytest")]
+        timing = stream.step_timings[("CI/test", "Main pytest")]
+        assert (timing.job, timing.step, timing.failed) == ("CI/test", "Main pytest", True)
+        assert timing.seconds >= 0.25
+        assert stream.step_seconds("CI/test", "Main pytest") == timing.seconds
+        assert stream.step_seconds("CI/lint", "Main pytest") is None
+
+    def test_step_timings_per_step(self) -> None:
+        """同じジョブで複数のステップが失敗しても、ステップごとに実時間を記録する"""
+        script = (
+            "import time\n"
+            "print('[CI/test] ⭐ Run Main pytest', flush=True); time.sleep(0.3)\n"
+            "print('[CI/test]   ❌  Failure - Main pytest [0.01s]', flush=True)\n"
+            "print('[CI/test] ⭐ Run Post upload-report', flush=True)\n"
+            "print('[CI/test]   ❌  Failure - Post upload-report [0.01s]', flush=True)\n"
+        )
+        process = subprocess.Popen(
+            [sys.executable, "-c", script],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            env={**os.environ, "PYTHONIOENCODING": "utf-8"},
+        )
+        stream = ActStream(process)
+
+        list(stream)
+
+        pytest_seconds = stream.step_seconds("CI/test", "Main pytest")
+        upload_seconds = stream.step_seconds("CI/test", "Post upload-report")
+        assert pytest_seconds is not None and pytest_seconds >= 0.25
+        assert upload_seconds is not None and upload_seconds < pytest_seconds
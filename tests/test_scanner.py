@@ -0,0 +1,95 @@
+"""scanner.pyのテスト"""
+
+import pytest
+
+from act_lens.parser import LogParser
+from act_lens.scanner import MAX_TRACE_LINES, LogScanner
+
+LOG = [
+    "[CI/test] ⭐ Run Main pytest",
+    "Traceback (most recent call last):",
+    '  File "tests/test_app.py", line 42, in test_add',
+    "    assert add(2, 3) == 6",
+    "AssertionError: assert 5 == 6",
+    "[CI/test]   ❌  Failure - Main pytest [1.5s]",
+    "[CI/lint] ⭐ Run Main ruff",
+    "[CI/lint]   | All checks passed!",
+]
+
+
+def _scan(text_blocks: list[str]) -> LogScanner:
+    parser = LogParser()
+    scanner = LogScanner(
+        parser.classifier, parser.success_classifier, parser.exit_failure_classifier
+    )
+    for block in text_blocks:
+        scanner.feed(block)
+    return scanner
+
+
+def _fields(scanner: LogScanner) -> tuple[object, ...]:
+    return (
+        scanner.error_type,
+        scanner.workflow,
+        scanner.message,
+        scanner.file_path,
+        scanner.line_number,
+        scanner.stack_trace,
+        scanner.job,
+        scanner.step,
+        scanner.duration,
+        scanner.running_step,
+    )
+
+
+class TestLogScanner:
+    """LogScannerのテスト"""
+
+    def test_collects_all_fields_in_one_pass(self) -> None:
+        """1回の走査で全フィールドを集める"""
+        scanner = _scan(["\n".join(LOG)])
+
+        assert scanner.error_type == "ASSERTION"
+        assert scanner.workflow == "CI"
+        assert scanner.message == "[CI/test]   ❌  Failure - Main pytest [1.5s]"
+        assert (scanner.file_path, scanner.line_number) == ("tests/test_app.py", 42)
+        assert scanner.stack_trace is not None
+        assert scanner.stack_trace.endswith("AssertionError: assert 5 == 6")
+        assert (scanner.job, scanner.step) == ("CI/lint", "| All checks passed!")
+        assert scanner.duration == 1.5
+        assert scanner.running_step == ("CI/lint", "Main ruff")
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 5])
+    def test_block_size_does_not_change_result(self, size: int) -> None:
+        """行をまとめる単位によらず結果は同じ"""
+        blocks = ["\n".join(LOG[i : i + size]) for i in range(0, len(LOG), size)]
+
+        assert _fields(_scan(blocks)) == _fields(_scan(["\n".join(LOG)]))
+
+    def test_patterns_do_not_span_lines(self) -> None:
+        """行をまたぐ文字列はマッチしない"""
+        scanner = _scan(["[CI\n/test] x", 'File "a\n", line 3'])
+
+        assert scanner.workflow is None
+        assert scanner.file_path is None
+
+    def test_first_traceback_wins(self) -> None:
+        """最初に完結したスタックトレースを採用する"""
+        scanner = _scan(
+            ["Traceback (most recent call last):", "  x()", "ValueError: first"]
+            + ["Traceback (most recent call last):", "  y()", "KeyError: second"]
+        )
+
+        assert scanner.stack_trace == "Traceback (most recent call last):\n  x()\nValueError: first"
+
+    def test_stack_trace_is_bounded(self) -> None:
+        """長いスタックトレースは先頭行と直近の行だけを保持する"""
+        frames = [f"  frame {i}" for i in range(MAX_TRACE_LINES + 10)]
+        scanner = _scan(["Traceback (most recent call last):", *frames, "ValueError: deep"])
+
+        assert len(scanner.trace_lines) == MAX_TRACE_LINES
+        assert scanner.stack_trace is not None
+        head, omitted, *_ = scanner.stack_trace.split("\n")
+        assert head == "Traceback (most recent call last):"
+        assert omitted == "  ...（12行省略）"
+        assert scanner.stack_trace.endswith("ValueError: deep")
@@ -0,0 +1,205 @@
+"""segments.pyのテスト"""
+
+import pytest
+
+from act_lens.parser import LogParser
+from act_lens.scanner import LogScanner
+from act_lens.segments import (
+    STEP_FAILURE,
+    STEP_START,
+    STEP_SUCCESS,
+    JobSegments,
+    LogIndex,
+    step_marker,
+)
+
+LOG = "\n".join(
+    [
+        "INFO[0000] Using docker host",
+        "[CI/a] ⭐ Run Main pytest",
+        "[CI/b] ⭐ Run Main build",
+        "[CI/b]   | compiling",
+        "[CI/a]   | AssertionError: a",
+        "[CI/a]   ❌  Failure - Main pytest [1.5s]",
+        "[CI/b]   ✅  Success - Main build [0.5s]",
+    ]
+)
+
+
+@pytest.fixture
+def segments() -> JobSegments:
+    parser = LogParser()
+    return JobSegments(parser._new_scanner)  # pyright: ignore[reportPrivateUsage]
+
+
+def _result(state: JobSegments) -> tuple[LogScanner, str | None]:
+    found = state.result()
+    assert found is not None
+    return found
+
+
+class TestStepMarker:
+    """step_markerのテスト"""
+
+    @pytest.mark.parametrize(
+        ("line", "expected"),
+        [
+            ("[CI/a] ⭐ Run Main pytest", (STEP_START, "Main pytest")),
+            ("[CI/a]   ✅  Success - Main pytest [1s]", (STEP_SUCCESS, "")),
+            ("[CI/a]   ❌  Failure - Main pytest [1s]", (STEP_FAILURE, "")),
+            ("[CI/a]   | ❌ 3 failed", None),
+            ("[CI/a]   | compiling", None),
+        ],
+    )
+    def test_step_marker(self, line: str, expected: tuple[int, str] | None) -> None:
+        """ステップの開始/終了マーカーだけを判定する"""
+        assert step_marker(line) == expected
+
+
+class TestLogIndex:
+    """LogIndexのテスト"""
+
+    def test_build_records_jobs_and_markers(self) -> None:
+        """ジョブの最初の出現位置とマーカー行の位置をオフセットで記録する"""
+        index = LogIndex.build(LOG)
+
+        assert index.jobs == ["", "CI/a", "CI/b"]
+        assert [LOG[start : start + 6] for start in index.job_starts] == [
+            "INFO[0",
+            "[CI/a]",
+            "[CI/b]",
+        ]
+        assert list(index.marker_kinds) == [STEP_START, STEP_START, STEP_FAILURE, STEP_SUCCESS]
+        assert list(index.marker_jobs) == [1, 2, 1, 2]
+        assert index.step_names[:2] == ["Main pytest", "Main build"]
+        start, end = index.marker_starts[2], index.marker_ends[2]
+        assert LOG[start:end] == "[CI/a]   ❌  Failure - Main pytest [1.5s]"
+
+    def test_segments_split_jobs_by_step(self) -> None:
+        """ジョブごとに、ステップとステップの間の行を区間に分ける"""
+        index = LogIndex.build(LOG)
+
+        def lines(job: int) -> list[tuple[str | None, int | None, str]]:
+            return [
+                (seg.step, seg.status, "\n".join(index.pieces(seg, 1024)))
+                for seg in index.segments[job]
+            ]
+
+        assert lines(0) == [(None, None, "INFO[0000] Using docker host")]
+        assert lines(1) == [
+            (None, None, ""),
+            (
+                "Main pytest",
+                STEP_FAILURE,
+                "[CI/a] ⭐ Run Main pytest\n[CI/a]   | AssertionError: a\n"
+                "[CI/a]   ❌  Failure - Main pytest [1.5s]",
+            ),
+            (None, None, ""),
+        ]
+        assert [(step, status) for step, status, _ in lines(2)] == [
+            (None, None),
+            ("Main build", STEP_SUCCESS),
+            (None, None),
+        ]
+        assert index.running_step(1) is None
+
+    def test_build_bytes_matches_text(self) -> None:
+        """bytesから作ったインデックスは、オフセットがバイト単位になる以外は同じ"""
+        by_text, by_bytes = LogIndex.build(LOG), LogIndex.build(LOG.encode())
+
+        assert by_bytes.jobs == by_text.jobs
+        assert list(by_bytes.marker_kinds) == list(by_text.marker_kinds)
+        assert by_bytes.step_names == by_text.step_names
+        assert [
+            [list(by_bytes.pieces(seg, 1024)) for seg in segments] for segments in by_bytes.segments
+        ] == [
+            [list(by_text.pieces(seg, 1024)) for seg in segments] for segments in by_text.segments
+        ]
+
+    def test_pieces_split_long_ranges(self) -> None:
+        """上限を超える範囲は改行で区切り、改行のない行は上限の長さで区切る"""
+        text = "[CI/a] " + "x" * 10 + "\nshort\n" + "y" * 25
+        index = LogIndex.build(text)
+
+        assert list(index.pieces(index.segments[0][0], 12)) == [
+            "[CI/a] xxxxx",
+            "xxxxx\nshort",
+            "y" * 12,
+            "y" * 12,
+            "y",
+        ]
+
+    def test_empty_text(self) -> None:
+        """空のログでも先頭のジョブ "" だけを持つ"""
+        index = LogIndex.build("")
+
+        assert index.jobs == [""]
+        assert [list(index.pieces(seg, 1024)) for seg in index.segments[0]] == [[""]]
+        assert len(index.marker_starts) == 0
+
+    def test_pieces_follow_interleaved_jobs(self) -> None:
+        """別のジョブの行を飛ばし、接頭辞のない継続行は直前のジョブに含める"""
+        text = "\n".join(
+            [
+                "[CI/a (3.11, x+y)] ⭐ Run Main pytest",
+                "[CI/ab] noise",
+                "[CI/a (3.11, x+y)]   | Traceback (most recent call last):",
+                '  File "a.py", line 1',
+                "[CI/ab]   | more noise",
+                "    continued noise",
+                "[CI/a (3.11, x+y)]   ❌  Failure - Main pytest",
+                "  after failure",
+            ]
+        )
+        index = LogIndex.build(text)
+        step, after = index.segments[0][1:]
+
+        assert index.jobs == ["CI/a (3.11, x+y)", "CI/ab"]
+        assert list(index.pieces(step, 1024)) == [
+            "[CI/a (3.11, x+y)] ⭐ Run Main pytest",
+            '[CI/a (3.11, x+y)]   | Traceback (most recent call last):\n  File "a.py", line 1',
+            "[CI/a (3.11, x+y)]   ❌  Failure - Main pytest",
+        ]
+        assert list(index.pieces(after, 1024)) == ["  after failure"]
+
+
+class TestJobSegments:
+    """JobSegmentsのテスト"""
+
+    def test_first_failed_step_wins(self, segments: JobSegments) -> None:
+        """❌で終わった最初のステップを採用し、以降の行は解析しない"""
+        segments.start_step("one", "[CI/a] ⭐ Run one")
+        segments.feed("ValueError: first")
+        segments.end_step(True, "[CI/a]   ❌  Failure - one")
+        segments.start_step("two", "[CI/a] ⭐ Run two")
+        segments.feed("AssertionError: second")
+        segments.end_step(True, "[CI/a]   ❌  Failure - two")
+
+        scanner, step = _result(segments)
+        assert (scanner.error_type, step) == ("VALUE", "one")
+
+    def test_successful_step_is_ignored(self, segments: JobSegments) -> None:
+        """✅で終わったステップのエラー文字列は採用しない"""
+        segments.start_step("one", "[CI/a] ⭐ Run one")
+        segments.feed("AssertionError: expected")
+        segments.end_step(False, "[CI/a]   ✅  Success - one")
+
+        assert segments.result() is None
+
+    def test_falls_back_to_first_errored_segment(self, segments: JobSegments) -> None:
+        """失敗ステップがなければ、✅で終わっていない最初のエラー区間を採用する"""
+        segments.feed("Error: docker pull failed")
+        segments.start_step("one", "[CI/a] ⭐ Run one")
+        segments.feed("TypeError: later")
+
+        scanner, step = _result(segments)
+        assert (scanner.error_type, step) == ("UNKNOWN", None)
+        assert segments.running_step == "one"
+
+    def test_open_step_with_error(self, segments: JobSegments) -> None:
+        """実行中のステップのエラーはステップ名付きで採用する"""
+        segments.start_step("one", "[CI/a] ⭐ Run one")
+        segments.feed("TypeError: bad")
+
+        scanner, step = _result(segments)
+        assert (scanner.error_type, step) == ("TYPE", "one")
@@ -0,0 +1,111 @@
+"""sources.pyのテスト"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from act_lens import sources
+from act_lens.sources import modified_since, read_lines, resolve_source, workspace_path
+
+
+@pytest.fixture
+def source(tmp_path: Path) -> Path:
+    path = tmp_path / "src" / "app.py"
+    path.parent.mkdir()
+    path.write_text("".join(f"line {n}\n" for n in range(1, 101)), encoding="utf-8")
+    return path
+
+
+class TestResolveSource:
+    """resolve_sourceのテスト"""
+
+    def test_container_workspace_maps_to_root(self, tmp_path: Path, source: Path) -> None:
+        """コンテナ内のワークスペース以下のパスをリポジトリのルートからのパスにする"""
+        assert resolve_source("/github/workspace/src/app.py", tmp_path) == source
+
+    def test_relative_and_host_paths(self, tmp_path: Path, source: Path) -> None:
+        """相対パスはルートから探し、ルート以下の絶対パスはそのまま使う"""
+        assert resolve_source("src/app.py", tmp_path) == source
+        assert resolve_source("./src/app.py", tmp_path) == source
+        assert resolve_source(str(source), tmp_path) == source
+
+    def test_workspace_path(self) -> None:
+        """コンテナ内のワークスペースの接頭辞だけを除き、それ以外のパスはそのまま"""
+        assert workspace_path("/github/workspace/src/app.py") == "src/app.py"
+        assert workspace_path("/github/workspace2/app.py") == "/github/workspace2/app.py"
+        assert workspace_path("/usr/lib/python3.12/json/decoder.py") == (
+            "/usr/lib/python3.12/json/decoder.py"
+        )
+        assert workspace_path("src/app.py") == "src/app.py"
+
+    def test_outside_root_or_missing(self, tmp_path: Path, source: Path) -> None:
+        """ルートの外のファイルや存在しないファイルはNone"""
+        outside = tmp_path.parent / "outside.py"
+        outside.write_text("secret\n", encoding="utf-8")
+
+        assert resolve_source(str(outside), source.parent) is None
+        assert resolve_source("../outside.py", source.parent) is None
+        assert resolve_source("/github/workspace/src/missing.py", tmp_path) is None
+
+
+class TestReadLines:
+    """read_linesのテスト"""
+
+    def test_window(self, source: Path) -> None:
+        """指定した範囲の行だけを返す"""
+        assert read_lines(source, 41, 43) == ["line 41", "line 42", "line 43"]
+        assert read_lines(source, 1, 2) == ["line 1", "line 2"]
+
+    def test_window_past_end(self, source: Path) -> None:
+        """ファイル末尾を超える範囲は、存在する行だけを返す"""
+        assert read_lines(source, 99, 103) == ["line 99", "line 100"]
+        assert read_lines(source, 101, 103) == []
+
+    @pytest.mark.parametrize("first", [1, 2, 7, 50, 98])
+    def test_window_across_blocks(
+        self, source: Path, monkeypatch: pytest.MonkeyPatch, first: int
+    ) -> None:
+        """行インデックスのブロックの境界をまたぐ範囲も正しく読む"""
+        monkeypatch.setattr(sources, "INDEX_BLOCK_BYTES", 16)
+
+        expected = [f"line {n}" for n in range(first, min(first + 4, 100) + 1)]
+        assert read_lines(source, first, first + 4) == expected
+
+    def test_crlf_and_missing_trailing_newline(self, tmp_path: Path) -> None:
+        """CRLFの行末を除き、末尾に改行のない最終行も読む"""
+        path = tmp_path / "a.py"
+        path.write_bytes(b"one\r\ntwo\r\nthree")
+
+        assert read_lines(path, 2, 5) == ["two", "three"]
+
+    def test_index_is_cached_until_modified(self, source: Path) -> None:
+        """行インデックスは更新されるまで使い回し、更新後は作り直す"""
+        read_lines(source, 1, 1)
+        before = sources._line_index.cache_info()  # pyright: ignore[reportPrivateUsage]
+        read_lines(source, 50, 52)
+        after = sources._line_index.cache_info()  # pyright: ignore[reportPrivateUsage]
+        assert (after.hits, after.misses) == (before.hits + 1, before.misses)
+
+        source.write_text("changed\n", encoding="utf-8")
+        os.utime(source, ns=(0, 0))
+        assert read_lines(source, 1, 3) == ["changed"]
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        """読めないファイルは空のリスト"""
+        assert read_lines(tmp_path / "missing.py", 1, 3) == []
+
+
+class TestModifiedSince:
+    """modified_sinceのテスト"""
+
+    def test_compares_mtime(self, source: Path) -> None:
+        """指定した時刻より後に更新されたファイルだけが真"""
+        mtime_ns = source.stat().st_mtime_ns
+
+        assert not modified_since(source, mtime_ns)
+        assert modified_since(source, mtime_ns - 1)
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        """更新時刻を取得できないファイルは更新されたものとみなす"""
+        assert modified_since(tmp_path / "missing.py", 0)
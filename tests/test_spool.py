@@ -0,0 +1,78 @@
+"""spool.pyのテスト"""
+
+import gzip
+from pathlib import Path
+
+from act_lens.spool import MAX_SPOOL_FILES, LogSpool, prune_spools
+
+
+class TestLogSpool:
+    """LogSpoolクラスのテスト"""
+
+    def test_tee_writes_compressed_log(self, tmp_path: Path) -> None:
+        """teeした行はgzipファイルに保存され、後段にもそのまま流れる"""
+        spool = LogSpool.create("ci.yml", output_dir=tmp_path)
+
+        passed = list(spool.tee(["line1", "line2", "line3"]))
+        spool.close()
+
+        assert passed == ["line1", "line2", "line3"]
+        assert spool.path.name.endswith(".log.gz")
+        assert gzip.decompress(spool.path.read_bytes()).decode() == "line1\nline2\nline3\n"
+
+    def test_memory_window_keeps_recent_lines(self, tmp_path: Path) -> None:
+        """メモリには直近の行だけを保持する"""
+        with LogSpool.create("ci.yml", output_dir=tmp_path, window=2) as spool:
+            for i in range(100):
+                spool.write(f"line{i}")
+
+        assert list(spool.tail) == ["line98", "line99"]
+        assert spool.line_count == 100
+
+    def test_read_lines_reads_back_everything(self, tmp_path: Path) -> None:
+        """read_lines()はスプールから全行を読み戻す"""
+        with LogSpool.create("ci.yml", output_dir=tmp_path, window=1) as spool:
+            for i in range(10):
+                spool.write(f"line{i}")
+
+        assert list(spool.read_lines()) == [f"line{i}" for i in range(10)]
+
+    def test_same_label_gets_unique_file(self, tmp_path: Path) -> None:
+        """同じ名前で同時に作成しても別ファイルになる"""
+        with (
+            LogSpool.create("ci.yml", output_dir=tmp_path) as a,
+            LogSpool.create("ci.yml", output_dir=tmp_path) as b,
+        ):
+            assert a.path != b.path
+
+    def test_old_spools_are_pruned(self, tmp_path: Path) -> None:
+        """古いスプールファイルは、これから作成する分を含めて上限数を超えないよう削除される"""
+        old = [LogSpool.create(f"wf{i}", output_dir=tmp_path) for i in range(MAX_SPOOL_FILES + 5)]
+        for spool in old:
+            spool.close()
+
+        prune_spools(tmp_path, reserve=3)
+        new = [LogSpool.create(f"new{i}", output_dir=tmp_path) for i in range(3)]
+
+        assert len(list(tmp_path.glob("log_*.log.gz"))) == MAX_SPOOL_FILES
+        assert all(spool.path.exists() for spool in new)
+
+    def test_spools_of_current_run_kept(self, tmp_path: Path) -> None:
+        """上限を超える数を作成しても、実行中に作成したスプールは削除しない"""
+        LogSpool.create("old", output_dir=tmp_path).close()
+
+        prune_spools(tmp_path, reserve=MAX_SPOOL_FILES + 5)
+        spools = [
+            LogSpool.create(f"wf{i}", output_dir=tmp_path) for i in range(MAX_SPOOL_FILES + 5)
+        ]
+        for spool in spools:
+            spool.close()
+
+        assert all(spool.path.exists() for spool in spools)
+        assert len(list(tmp_path.glob("log_*.log.gz"))) == MAX_SPOOL_FILES + 5
+
+    def test_label_is_sanitized(self, tmp_path: Path) -> None:
+        """ファイル名に使えない文字は置き換える"""
+        with LogSpool.create("ci.yml / test job", output_dir=tmp_path) as spool:
+            assert spool.path.parent == tmp_path
+            assert "/" not in spool.path.name.removeprefix("log_")
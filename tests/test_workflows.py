@@ -0,0 +1,218 @@
+"""workflows.pyのテスト"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+import act_lens.workflows as workflows
+from act_lens.models import WorkflowInfo
+from act_lens.workflows import WorkflowIndex, load_yaml
+
+CI_YAML = """\
+name: CI  # コメント
+
+on:
+  push:
+    branches: [main]
+    paths:
+      - "src/**"
+      - 'pyproject.toml'
+    paths-ignore: ["docs/**"]
+  workflow_dispatch:
+
+jobs:
+  lint:
+    runs-on: ubuntu-latest
+    steps:
+      - uses: actions/checkout@v6
+      - name: Lint
+        run: |
+          uv run ruff check .
+          echo "done # not a comment"
+  test:
+    name: Test (${{ matrix.python-version }})
+    needs: lint
+    strategy:
+      matrix:
+        python-version: ["3.11", "3.12"]
+        os:
+          - ubuntu-latest
+          - windows-latest
+        include:
+          - os: macos-latest
+            python-version: "3.12"
+    steps:
+      - run: uv run pytest
+  release:
+    needs: [lint, test]
+    runs-on: ubuntu-latest
+"""
+
+
+class TestLoadYaml:
+    """簡易YAMLリーダーのテスト"""
+
+    def test_block_mapping_and_sequence(self) -> None:
+        """ブロック形式のマッピングとシーケンスを読み込む"""
+        data = load_yaml(CI_YAML)
+        assert data["name"] == "CI"
+        assert data["on"]["push"]["paths"] == ["src/**", "pyproject.toml"]
+        assert data["on"]["workflow_dispatch"] is None
+        assert data["jobs"]["test"]["strategy"]["matrix"]["os"] == [
+            "ubuntu-latest",
+            "windows-latest",
+        ]
+
+    def test_flow_collections(self) -> None:
+        """フロー形式のリスト・マッピングを読み込む"""
+        data = load_yaml("a: [x, 'y', {k: v, l: [1, 2]}]\nb: {c: d}\n")
+        assert data == {"a": ["x", "y", {"k": "v", "l": ["1", "2"]}], "b": {"c": "d"}}
+
+    def test_block_scalar_keeps_hash(self) -> None:
+        """ブロックスカラー内の # はコメント扱いしない"""
+        data = load_yaml(CI_YAML)
+        run = data["jobs"]["lint"]["steps"][1]["run"]
+        assert run == 'uv run ruff check .\necho "done # not a comment"'
+
+    def test_sequence_of_mappings(self) -> None:
+        """ "- key: value" 形式の要素をマッピングとして読む"""
+        data = load_yaml(CI_YAML)
+        include = data["jobs"]["test"]["strategy"]["matrix"]["include"]
+        assert include == [{"os": "macos-latest", "python-version": "3.12"}]
+
+    def test_anchors_and_aliases(self) -> None:
+        """アンカー（&name）・エイリアス（*name）・マージキー（<<）を読み込む"""
+        data = load_yaml(
+            "on:\n"
+            "  push:\n"
+            "    paths: &src\n"
+            "      - 'src/**'\n"
+            "  pull_request:\n"
+            "    paths: *src\n"
+            "defaults: &job\n"
+            "  runs-on: ubuntu-latest\n"
+            "  timeout-minutes: 5\n"
+            "jobs:\n"
+            "  lint:\n"
+            "    <<: *job\n"
+            "    runs-on: windows-latest\n"
+            "    steps:\n"
+            "      - &checkout\n"
+            "        uses: actions/checkout@v6\n"
+            "      - *checkout\n"
+            "  test:\n"
+            "    <<: *job\n"
+        )
+        assert data["on"]["pull_request"]["paths"] == ["src/**"]
+        assert data["jobs"]["lint"]["runs-on"] == "windows-latest"
+        assert data["jobs"]["lint"]["timeout-minutes"] == "5"
+        assert data["jobs"]["lint"]["steps"] == [{"uses": "actions/checkout@v6"}] * 2
+        assert data["jobs"]["test"] == {"runs-on": "ubuntu-latest", "timeout-minutes": "5"}
+
+    def test_multiline_plain_scalar(self) -> None:
+        """インデントの深い続きの行は複数行のスカラーとして読み、後続のキーを落とさない"""
+        data = load_yaml("a: foo\n  bar\nb: baz\n")
+        assert data == {"a": "foo bar", "b": "baz"}
+
+
+class TestWorkflowIndex:
+    """WorkflowIndexのテスト"""
+
+    @pytest.fixture
+    def index(self, tmp_path: Path) -> WorkflowIndex:
+        """ワークフローを1つ置いたインデックス"""
+        workflow_dir = tmp_path / "workflows"
+        workflow_dir.mkdir()
+        (workflow_dir / "ci.yml").write_text(CI_YAML, encoding="utf-8")
+        (workflow_dir / "docs.yaml").write_text(
+            "on: push\njobs:\n  build:\n    runs-on: ubuntu-latest\n", encoding="utf-8"
+        )
+        return WorkflowIndex(workflow_dir, tmp_path / ".act-lens" / "workflows.json")
+
+    def test_load_extracts_jobs(self, index: WorkflowIndex) -> None:
+        """ジョブ・needs・matrix・パスフィルタを抽出"""
+        ci = index.load()["ci.yml"]
+
+        assert ci.name == "CI"
+        assert ci.events == ["push", "workflow_dispatch"]
+        assert ci.path_filters["push"].paths == ["src/**", "pyproject.toml"]
+        assert ci.path_filters["push"].paths_ignore == ["docs/**"]
+        jobs = {job.id: job for job in ci.jobs}
+        assert list(jobs) == ["lint", "test", "release"]
+        assert jobs["test"].needs == ["lint"]
+        assert jobs["test"].matrix == {
+            "python-version": ["3.11", "3.12"],
+            "os": ["ubuntu-latest", "windows-latest"],
+        }
+        assert jobs["release"].needs == ["lint", "test"]
+
+    def test_load_writes_cache(self, index: WorkflowIndex) -> None:
+        """解析結果をキャッシュファイルに保存"""
+        index.load()
+        assert index.cache_path.exists()
+
+    def test_unchanged_files_are_not_reparsed(
+        self, index: WorkflowIndex, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """更新されていないファイルは再解析しない"""
+        index.load()
+
+        def fail(*args: object) -> None:
+            raise AssertionError("再解析された")
+
+        monkeypatch.setattr(workflows, "parse_workflow", fail)
+        assert set(WorkflowIndex(index.workflow_dir, index.cache_path).load()) == {
+            "ci.yml",
+            "docs.yaml",
+        }
+
+    def test_only_changed_file_is_reparsed(
+        self, index: WorkflowIndex, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """内容が変わったファイルだけを再解析する"""
+        index.load()
+        docs = index.workflow_dir / "docs.yaml"
+        docs.write_text("on: push\njobs:\n  deploy:\n    runs-on: x\n", encoding="utf-8")
+        ci = index.workflow_dir / "ci.yml"
+        os.utime(ci, ns=(0, 0))  # touchのみ（内容は同じ）
+
+        parsed: list[str] = []
+        original = workflows.parse_workflow
+
+        def spy(path: Path, data: bytes, mtime_ns: int) -> WorkflowInfo:
+            parsed.append(path.name)
+            return original(path, data, mtime_ns)
+
+        monkeypatch.setattr(workflows, "parse_workflow", spy)
+        result = index.load()
+
+        assert parsed == ["docs.yaml"]
+        assert [job.id for job in result["docs.yaml"].jobs] == ["deploy"]
+        assert result["ci.yml"].mtime_ns == 0
+
+    def test_partial_workflow(self, index: WorkflowIndex) -> None:
+        """解釈できない箇所があったワークフローは complete=False として記録する"""
+        (index.workflow_dir / "odd.yml").write_text(
+            "on: push\njobs:\n    lint:\n      runs-on: x\n  test:\n    runs-on: x\n",
+            encoding="utf-8",
+        )
+        workflows = index.load()
+        assert workflows["ci.yml"].complete
+        assert not workflows["odd.yml"].complete
+
+    def test_workflows_for_job(self, index: WorkflowIndex) -> None:
+        """ジョブIDからワークフローを逆引き"""
+        assert index.workflows_for_job("build") == ["docs.yaml"]
+        assert index.workflows_for_job("missing") == []
+
+    def test_corrupt_cache_is_ignored(self, index: WorkflowIndex) -> None:
+        """壊れたキャッシュは無視して再構築する"""
+        index.cache_path.parent.mkdir(parents=True)
+        index.cache_path.write_text("{not json", encoding="utf-8")
+        assert "ci.yml" in index.load()
+
+    def test_missing_dir(self, tmp_path: Path) -> None:
+        """ワークフローディレクトリがない場合は空"""
+        index = WorkflowIndex(tmp_path / "none", tmp_path / "cache.json")
+        assert index.load() == {}